@@ -10,6 +10,7 @@ reboot logic.
 import sys
 import argparse
 from loop.kernel.init import boot
+from loop.kernel import rootfs
 from loop.kernel.process import Process
 
 
@@ -69,7 +70,8 @@ def main():
             pass
 
         # Create Shell Process
-        shell_proc = Process("shell", shell.run(), uid=shell.current_user)
+        # Interactive: ahead of services under the 'priority' policy
+        shell_proc = Process("shell", shell.run(), uid=shell.current_user, priority=-10)
         scheduler.add(shell_proc)
         supervisor.register(shell_proc)
 
@@ -82,6 +84,14 @@ def main():
         except KeyboardInterrupt:
             print("\n[kernel] Forced shutdown.")
             sys.exit(0)
+        finally:
+            # Persist the virtual filesystem across reboots
+            try:
+                kernel.sys.fs.save_image(rootfs.VFS_IMAGE)
+            except Exception as e:
+                print(f"[kernel] Failed to save filesystem image: {e}")
+            kernel.sys.journal.close()
+            scheduler.offload_pool.shutdown(wait=False)
 
         # Check exit reason
         if hasattr(scheduler, "exit_reason") and scheduler.exit_reason == "SHUTDOWN":
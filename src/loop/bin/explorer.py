@@ -32,12 +32,27 @@ def _resolve_destination(sys, src, dst):
         return dst
 
 
+def _list_details(path, items):
+    """
+    Build the per-item entries of a directory listing.
+
+    Args:
+        path (str): The listed directory.
+        items (list[str]): Names returned by sys_ls.
+
+    Returns:
+        list[dict]: One {'name', 'path'} dict per item.
+    """
+    # sys_ls returns names only; in a real OS we'd stat each entry
+    return [{"name": item, "path": f"{path}/{item}".replace("//", "/")} for item in items]
+
+
 def main(args, sys):
     """
     Explorer entry point.
 
     Supported Commands:
-      - list <path>
+      - list <path> [<path> ...]
       - search <path> <query> (Not implemented)
       - copy <src> <dst>
       - move <src> <dst>
@@ -55,23 +70,26 @@ def main(args, sys):
     cmd = args[0]
 
     if cmd == "list":
-        path = args[1] if len(args) > 1 else "/"
+        paths = args[1:] or ["/"]
+        if len(paths) > 1 and hasattr(sys, "sys_ls_many"):
+            # Several directories: resolve them in one batch
+            listings = []
+            for entry in sys.sys_ls_many(paths):
+                if "error" in entry:
+                    listings.append({"current_path": entry["path"], "error": entry["error"]})
+                else:
+                    listings.append({"current_path": entry["path"],
+                                     "items": _list_details(entry["path"], entry["items"])})
+            return json.dumps({"listings": listings}, indent=2)
+
+        path = paths[0]
         try:
+            if hasattr(sys, "sys_ls_detailed"):
+                # One directory read gives type, size and mtime for each entry
+                listing = sys.sys_ls_detailed(path)
+                return json.dumps({"current_path": path, "items": listing["entries"]}, indent=2)
             items = sys.sys_ls(path)
-            # Enhance with metadata if possible, but sys_ls returns strings
-            # To be DOM compliant, we should maybe return a tree?
-            # Let's return a detailed list.
-            details = []
-            for item in items:
-                # Naive check if directory: try list it?
-                # Or we rely on naming convention?
-                # Actually SyscallHandler.sys_read raises error on dir.
-
-                # Check type via syscall or just return name
-                # In a real OS we'd stat. Here we have limited syscalls.
-                details.append({"name": item, "path": f"{path}/{item}".replace("//", "/")})
-
-            return json.dumps({"current_path": path, "items": details}, indent=2)
+            return json.dumps({"current_path": path, "items": _list_details(path, items)}, indent=2)
         except Exception as e:
             return json.dumps({"error": str(e)})
 
@@ -84,6 +102,10 @@ def main(args, sys):
         src, dst = args[1], args[2]
         try:
             dst = _resolve_destination(sys, src, dst)
+            if hasattr(sys, "sys_copy"):
+                # Server-side copy: data never passes through Python
+                stats = sys.sys_copy(src, dst, recursive=True)
+                return json.dumps({"status": "copied", "src": src, "dst": dst, **stats})
             data = sys.sys_read(src)
             sys.sys_write(dst, data)
             return json.dumps({"status": "copied", "src": src, "dst": dst})
@@ -95,6 +117,10 @@ def main(args, sys):
         src, dst = args[1], args[2]
         try:
             dst = _resolve_destination(sys, src, dst)
+            if hasattr(sys, "sys_move"):
+                # Rename in place when possible, copy + delete across filesystems
+                stats = sys.sys_move(src, dst)
+                return json.dumps({"status": "moved", "src": src, "dst": dst, **stats})
             # 1. Read
             data = sys.sys_read(src)
             # 2. Write
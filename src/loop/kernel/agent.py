@@ -263,7 +263,7 @@ INSTRUCTIONS:
 
 AVAILABLE ACTIONS:
 - list_dir(path)
-- read_file(path)
+- read_file(path, offset=0, length=None) <-- Reads a file; pass a byte offset/length to read part of a large file.
 - write_file(path, content)
 - append_file(path, content)
 - run_process(app_name, args) <-- Use this to run apps: 'browser', 'calc', 'explorer', 'system', 'user'.
@@ -282,6 +282,7 @@ AVAILABLE ACTIONS:
 - sys_k8s_delete(name, namespace="default")
 - sys_k8s_logs(pod_name, namespace="default")
 - launch_app(app_name) <-- Launch a host application by name (e.g., 'Launch Chrome').
+- batch(entries) <-- Run several of the actions above in one turn. Each entry is {{"name": "<action>", "args": [...]}}. Results come back in order. Use it e.g. to read many files at once.
 - done()  <-- Call this when the task is complete.
 {extra_tools_list}
 
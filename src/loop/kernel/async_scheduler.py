@@ -0,0 +1,264 @@
+# kernel/async_scheduler.py
+"""
+Asyncio Scheduler.
+
+`AsyncScheduler` is a `Scheduler` backend that runs on an asyncio event
+loop instead of owning a thread. `run_async()` is a coroutine, so the kernel
+can share a loop with other asyncio code (the FastAPI server in
+`loop.server.main`) rather than needing a thread of its own.
+
+Processes may be generators, scheduled exactly as by `Scheduler` (policies,
+Sleep/Wait timers, Offload and signals all behave the same), or coroutines:
+
+- A coroutine process runs as an asyncio task. Whatever it awaits (I/O, an
+  LLM call, `asyncio.sleep`) parks it without a thread; it is WAITING for
+  as long as the task is alive and is reaped when the task finishes.
+  SIGKILL and SIGTERM cancel the task.
+- A generator process may yield an awaitable. It is parked while the
+  awaitable runs on the loop, and the result (or exception) is delivered at
+  the `yield`, as for `Offload`.
+
+`current_process` is kept in a context variable, so code running inside a
+coroutine process (including work it hands to `to_thread`) sees its own
+process.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+
+from loop.kernel.process import ProcessState
+from loop.kernel.scheduler import IDLE_WAIT_MAX, Scheduler
+
+# Signals that end a coroutine process by cancelling its task
+_FATAL_SIGNALS = ("SIGKILL", "SIGTERM")
+
+
+async def to_thread(func, *args, **kwargs):
+    """
+    Run a blocking function in the loop's default thread pool.
+
+    Same as asyncio.to_thread (Python 3.9+): the call runs in a copy of the
+    caller's context, so it sees the caller's `current_process`.
+
+    Returns:
+        Any: The function's return value.
+    """
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+class AsyncScheduler(Scheduler):
+    """
+    Scheduler driven by an asyncio event loop.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop or None): The loop run_async() was
+                                                  last started on.
+    """
+
+    def __init__(self, policy=None):
+        """
+        Initialize the AsyncScheduler.
+
+        Args:
+            policy (SchedulingPolicy, optional): Run-queue policy. Defaults
+                                                 to round-robin.
+        """
+        self._current = contextvars.ContextVar("current_process", default=None)
+        super().__init__(policy)
+        self.loop = None
+        self._loop_thread = None
+        self._wakeup = None   # asyncio.Event set by _notify(), created by run_async()
+        self._tasks = {}      # coroutine process -> its task
+        self._awaits = {}     # generator process -> task running the awaitable it yielded
+
+    @property
+    def current_process(self):
+        """Process or None: The process running in the current context."""
+        return self._current.get()
+
+    @current_process.setter
+    def current_process(self, proc):
+        self._current.set(proc)
+
+    def _notify(self):
+        """Wake run_async() if it is idle; safe from any thread."""
+        event = self._wakeup
+        if event is None:
+            return
+        if threading.get_ident() == self._loop_thread:
+            event.set()
+            return
+        try:
+            self.loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # loop closed
+
+    def _call_soon(self, callback):
+        """Run a callback on the loop thread."""
+        if threading.get_ident() == self._loop_thread:
+            callback()
+        else:
+            self.loop.call_soon_threadsafe(callback)
+
+    def stop(self):
+        """
+        Stop the scheduling loop.
+        """
+        super().stop()
+        self._notify()
+
+    def wake(self, proc):
+        """
+        Make a process runnable again (see Scheduler.wake).
+
+        A coroutine process is never queued: waking it only delivers a
+        pending SIGKILL/SIGTERM by cancelling its task. A generator process
+        blocked on an awaitable stays parked until the awaitable finishes,
+        unless it has a signal pending.
+
+        Args:
+            proc (Process): The process to wake.
+
+        Returns:
+            bool: True if the process is live, False otherwise.
+        """
+        task = self._tasks.get(proc)
+        if task is not None:
+            if proc.signal in _FATAL_SIGNALS:
+                self._call_soon(task.cancel)
+            return True
+        task = self._awaits.get(proc)
+        if task is not None:
+            if not proc.signal:
+                return True  # woken by _await_done once the result is in
+            self._call_soon(task.cancel)
+        return super().wake(proc)
+
+    def remove(self, process):
+        """
+        Remove a live process (see Scheduler.remove), cancelling its task.
+
+        Args:
+            process (Process): The process to remove.
+
+        Returns:
+            bool: True if the process was live, False otherwise.
+        """
+        for tasks in (self._tasks, self._awaits):
+            task = tasks.get(process)
+            if task is not None:
+                self._call_soon(task.cancel)
+        return super().remove(process)
+
+    def _enqueue(self, proc):
+        super()._enqueue(proc)
+        self._notify()
+
+    def _step(self, proc):
+        """Run a generator step, or start a coroutine process's task."""
+        if not proc.is_coroutine:
+            proc.run_step()
+            return
+        if proc not in self._tasks:
+            self._tasks[proc] = self.loop.create_task(self._drive(proc))
+        proc.state = ProcessState.WAITING
+
+    async def _drive(self, proc):
+        """Task body of a coroutine process: await it, then reap it."""
+        self.current_process = proc
+        try:
+            await proc.target
+            proc.exit_code = 0
+        except asyncio.CancelledError:
+            print(f"[scheduler] {proc.pid} {'killed' if proc.signal == 'SIGKILL' else 'terminated'}")
+            proc.exit_code = 1
+        except Exception as e:
+            print(f"[process {proc.pid}] Error in process: {e}")
+            proc.exit_code = 1
+        finally:
+            self._tasks.pop(proc, None)
+            proc.state = ProcessState.TERMINATED
+            self._reap(proc)
+            self._notify()
+
+    def _park(self, proc):
+        """Park a WAITING process; run the awaitable it yielded, if any."""
+        awaitable = getattr(proc, "awaiting", None)
+        if awaitable is None:
+            super()._park(proc)
+            return
+        proc.awaiting = None
+        try:
+            task = asyncio.ensure_future(awaitable, loop=self.loop)
+        except TypeError as e:
+            proc.resume(False, e)
+            super().wake(proc)
+            return
+        self._awaits[proc] = task
+        task.add_done_callback(lambda t: self._await_done(proc, t))
+
+    def _await_done(self, proc, task):
+        """Done callback of a yielded awaitable: deliver the outcome and wake the process."""
+        self._awaits.pop(proc, None)
+        if task.cancelled():
+            proc.resume(False, asyncio.CancelledError())
+        elif task.exception() is not None:
+            proc.resume(False, task.exception())
+        else:
+            proc.resume(True, task.result())
+        super().wake(proc)
+
+    async def _idle_async(self):
+        """Wait until the next timer deadline, a wake() or stop() without blocking the loop."""
+        timeout = IDLE_WAIT_MAX
+        if self._timers:
+            timeout = min(timeout, max(0.0, self._timers[0][0] - time.monotonic()))
+        event = self._wakeup
+        event.clear()
+        if self._incoming or not self.running:
+            return
+        handle = self.loop.call_later(timeout, event.set)
+        try:
+            await event.wait()
+        finally:
+            handle.cancel()
+
+    def run(self, max_steps=None):
+        """
+        Run the scheduling loop on a new event loop until it stops.
+
+        Args:
+            max_steps (int, optional): Maximum number of passes to run.
+        """
+        asyncio.run(self.run_async(max_steps))
+
+    async def run_async(self, max_steps=None):
+        """
+        Run the scheduling loop on the running event loop.
+
+        Same passes as Scheduler.run(), yielding to the loop between passes
+        so coroutine processes and other tasks run; when nothing is runnable
+        it awaits the next timer deadline or wake-up.
+
+        Args:
+            max_steps (int, optional): Maximum number of passes to run (an
+                                       idle wait counts as one pass).
+        """
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._wakeup = asyncio.Event()
+        self.running = True
+        steps = 0
+        while self.running and self.processes:
+            if max_steps is not None and steps >= max_steps:
+                break
+            steps += 1
+            if self._run_pass():
+                await asyncio.sleep(0)
+            else:
+                await self._idle_async()
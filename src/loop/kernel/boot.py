@@ -10,6 +10,7 @@ import sys
 import traceback
 from typing import Optional
 
+from loop.kernel import rootfs
 from loop.kernel.config import ConfigLoader
 from loop.kernel.kernel import LoopKernel
 from loop.kernel.filesystem import FileSystem
@@ -17,6 +18,8 @@ from loop.kernel.users import UserManager
 from loop.kernel.syscall import SyscallHandler
 from loop.kernel.sandbox import AgentSandbox
 from loop.kernel.scheduler import Scheduler
+from loop.kernel.async_scheduler import AsyncScheduler
+from loop.kernel.sched_policy import policy_from_config
 from loop.kernel.network import NetworkManager, NetworkGuard
 from loop.servicemanager.servicemanager import ServiceManager
 from loop.kernel.plugins.loader import PluginLoader
@@ -73,7 +76,16 @@ def boot() -> LoopKernel:
         # 4. Initialize syscall handler
         # We need Scheduler and NetworkManager for SyscallHandler
         log("Initializing core services (Scheduler, Network)...")
-        scheduler = Scheduler()
+        scheduler_config = config.get("scheduler", {})
+        if scheduler_config.get("backend") == "asyncio":
+            scheduler = AsyncScheduler()
+        else:
+            scheduler = Scheduler()
+        try:
+            scheduler.set_policy(policy_from_config(scheduler_config))
+            scheduler.offload_pool.configure(int(scheduler_config.get("offload_workers", 0)))
+        except ValueError as e:
+            log(f"Invalid scheduler configuration ({e}), using defaults", "WARN")
         network_manager = NetworkManager(user_manager)
 
         # Enforce network config
@@ -85,6 +97,34 @@ def boot() -> LoopKernel:
         log("Initializing SyscallHandler...")
         syscall_handler = SyscallHandler(scheduler, user_manager, network_manager)
 
+        journal_config = config.get("journal", {})
+        try:
+            syscall_handler.journal.configure(
+                durability=journal_config.get("durability"),
+                flush_bytes=int(journal_config.get("flush_bytes", 65536)),
+                flush_interval=float(journal_config.get("flush_interval", 1.0)),
+            )
+        except ValueError as e:
+            log(f"Invalid journal configuration ({e}), using defaults", "WARN")
+
+        tracing_config = config.get("tracing", {})
+        try:
+            syscall_handler.tracer.configure(
+                enabled=tracing_config.get("enabled") == "true",
+                trace_all=tracing_config.get("trace_all") == "true",
+                capacity=int(tracing_config.get("ring_size", 4096)),
+            )
+        except ValueError as e:
+            log(f"Invalid tracing configuration ({e}), using defaults", "WARN")
+
+        # Restore the virtual filesystem persisted by the previous boot
+        if rootfs.VFS_IMAGE.exists():
+            try:
+                syscall_handler.fs.load_image(rootfs.VFS_IMAGE)
+                log("Virtual filesystem image loaded")
+            except Exception as e:
+                log(f"Virtual filesystem image unreadable ({e}), starting fresh", "WARN")
+
         # Apply Network Guard
         log("Engaging NetworkGuard...")
         network_guard = NetworkGuard(network_manager)
@@ -23,6 +23,25 @@ DEFAULT_CONFIG = {
     "security": {
         "rbac_enabled": "true",
     },
+    "journal": {
+        "durability": "buffered",
+        "flush_bytes": "65536",
+        "flush_interval": "1.0",
+    },
+    "scheduler": {
+        "backend": "sync",
+        "policy": "round_robin",
+        "fair_share_weights": "root:2",
+        "mlfq_levels": "3",
+        "mlfq_quantum_ms": "1",
+        "mlfq_boost_interval": "5.0",
+        "offload_workers": "0",
+    },
+    "tracing": {
+        "enabled": "false",
+        "trace_all": "false",
+        "ring_size": "4096",
+    },
 }
 
 class ConfigLoader:
@@ -10,6 +10,7 @@ import time
 from pathlib import Path
 from rich.console import Console
 from rich.prompt import Confirm
+from loop.kernel import syscall_table
 
 class ConfirmationManager:
     """
@@ -47,7 +48,13 @@ class ConfirmationManager:
     def assess_risk(self, action):
         """
         Determine risk level of an action.
+
+        Registered syscalls use the risk class from the syscall table.
         """
+        entry = syscall_table.SYSCALLS.get(action)
+        if entry is not None:
+            return entry.risk
+
         # Explicit checks for specific actions
         if action == "run_process":
             return "HIGH"
@@ -60,14 +67,30 @@ class ConfirmationManager:
 
         return "LOW"
 
-    def request_approval(self, action, args):
+    def assess_batch_risk(self, actions):
+        """
+        Determine the risk level of a batch: the highest of its actions.
+
+        Args:
+            actions (list[str]): Action names in the batch.
+        """
+        levels = ["LOW", "MEDIUM", "HIGH"]
+        return max((self.assess_risk(a) for a in actions), key=levels.index, default="LOW")
+
+    def request_approval(self, action, args, risk=None):
         """
         Request user approval for an action.
 
+        Args:
+            action (str): The action name.
+            args (list): The action arguments (shown to the user).
+            risk (str, optional): Precomputed risk level, e.g. for a batch.
+
         Returns:
             bool: True if approved, False otherwise.
         """
-        risk = self.assess_risk(action)
+        if risk is None:
+            risk = self.assess_risk(action)
 
         # Check whitelist
         if action in self.whitelist["allowed_actions"]:
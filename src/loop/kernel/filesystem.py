@@ -6,20 +6,78 @@ This module implements a simple in-memory filesystem with support for files,
 directories, and basic permissions. It emulates a standard Unix-like hierarchy.
 """
 
+import sys
+import threading
 import time
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from loop.kernel.fsindex import NameIndex, match_path
+
+
+# Permission bits for a single class (owner, group or world).
+PERM_R = 4
+PERM_W = 2
+PERM_X = 1
+
+_CHAR_BITS = {"r": PERM_R, "w": PERM_W, "x": PERM_X}
+_BITS_TO_STR = tuple(
+    ("r" if b & PERM_R else "") + ("w" if b & PERM_W else "") + ("x" if b & PERM_X else "")
+    for b in range(8)
+)
+_STR_TO_BITS = {}
+
+
+def mode_to_bits(mode):
+    """
+    Convert a permission string (e.g. 'rw') to its 3-bit mask.
+
+    Args:
+        mode (str): Permission characters drawn from 'r', 'w' and 'x'.
+
+    Returns:
+        int: The bitmask (0-7).
+    """
+    bits = _STR_TO_BITS.get(mode)
+    if bits is None:
+        bits = 0
+        for ch in mode:
+            bits |= _CHAR_BITS.get(ch, 0)
+        _STR_TO_BITS[mode] = bits
+    return bits
+
+
+def bits_to_mode(bits):
+    """
+    Convert a 3-bit mask back to its permission string.
+
+    Args:
+        bits (int): The bitmask (0-7).
+
+    Returns:
+        str: The permission string (e.g. 'rw').
+    """
+    return _BITS_TO_STR[bits & 7]
 
 
 class Permissions:
     """
     Represents file or directory permissions.
 
+    The three permission classes are packed into a single integer laid out
+    like a Unix mode (owner << 6 | group << 3 | world), and owner/group
+    names are interned so identical names share one string object.
+
     Attributes:
         owner (str): The user who owns the node.
         group (str): The group who owns the node.
         mode (str): Owner permission mode (e.g., 'rw', 'r').
         group_mode (str): Group permission mode.
         world_mode (str): World permission mode.
+        bits (int): The packed permission bitmask.
     """
+    __slots__ = ("_owner", "_group", "bits")
+
     def __init__(self, owner="root", mode="rw", group="root", group_mode="", world_mode=""):
         """
         Initialize Permissions.
@@ -31,22 +89,102 @@ class Permissions:
             group_mode (str, optional): Group permission string. Defaults to "".
             world_mode (str, optional): World permission string. Defaults to "".
         """
-        self.owner = owner
-        self.group = group
-        self.mode = mode  # Owner mode
-        self.group_mode = group_mode
-        self.world_mode = world_mode
+        self._owner = sys.intern(owner)
+        self._group = sys.intern(group)
+        self.bits = (mode_to_bits(mode) << 6) | (mode_to_bits(group_mode) << 3) | mode_to_bits(world_mode)
+
+    @property
+    def owner(self):
+        return self._owner
+
+    @owner.setter
+    def owner(self, value):
+        self._owner = sys.intern(value)
+
+    @property
+    def group(self):
+        return self._group
 
+    @group.setter
+    def group(self, value):
+        self._group = sys.intern(value)
 
-class FileNode:
+    @property
+    def mode(self):
+        return _BITS_TO_STR[(self.bits >> 6) & 7]
+
+    @mode.setter
+    def mode(self, value):
+        self.bits = (self.bits & 0o077) | (mode_to_bits(value) << 6)
+
+    @property
+    def group_mode(self):
+        return _BITS_TO_STR[(self.bits >> 3) & 7]
+
+    @group_mode.setter
+    def group_mode(self, value):
+        self.bits = (self.bits & 0o707) | (mode_to_bits(value) << 3)
+
+    @property
+    def world_mode(self):
+        return _BITS_TO_STR[self.bits & 7]
+
+    @world_mode.setter
+    def world_mode(self, value):
+        self.bits = (self.bits & 0o770) | mode_to_bits(value)
+
+
+class QuotaExceededError(OSError):
+    """Raised when a write would take a user over their size or inode quota."""
+    pass
+
+
+class _Node(Permissions):
+    """
+    Common slotted base for filesystem nodes.
+
+    Nodes carry their permission fields inline instead of pointing at a
+    separate Permissions object; `permissions` returns the node itself so
+    `node.permissions.mode` keeps working.
+
+    `gen` is the FileSystem generation the node was created (or copied) in.
+    Nodes from an older generation may be shared with a snapshot and must be
+    copied before they are modified.
+    """
+    __slots__ = ("name", "gen")
+
+    @property
+    def permissions(self):
+        return self
+
+    def _copy_into(self, clone, gen):
+        clone._owner = self._owner
+        clone._group = self._group
+        clone.bits = self.bits
+        clone.name = self.name
+        clone.gen = gen
+        return clone
+
+
+class FileNode(_Node):
     """
     Represents a file in the filesystem.
 
+    Content is kept as a single string until the first append; after that
+    appended text is stored as a list of chunks with cumulative end offsets,
+    so appends never copy existing content. Reading `data` joins the chunks
+    once and collapses them back into a single string.
+
+    Files loaded from an image hold a `MappedBlob` instead, which is only
+    decoded from the memory-mapped image on first access.
+
     Attributes:
         name (str): The name of the file.
         data (str): The content of the file.
         permissions (Permissions): Access permissions.
     """
+    __slots__ = ("_chunks", "_ends")
+
     def __init__(self, name, data="", owner="root", mode="rw", group="root", group_mode="", world_mode=""):
         """
         Initialize a FileNode.
@@ -60,15 +198,114 @@ class FileNode:
             group_mode (str, optional): Group permission mode. Defaults to "".
             world_mode (str, optional): World permission mode. Defaults to "".
         """
+        Permissions.__init__(self, owner, mode, group, group_mode, world_mode)
         self.name = name
-        self.data = data
-        self.permissions = Permissions(owner, mode, group, group_mode, world_mode)
+        self.gen = 0
+        self._chunks = data  # str, list[str] once appended to, or MappedBlob
+        self._ends = None    # cumulative chunk end offsets when chunked
+
+    def clone(self, gen):
+        """
+        Return a copy for generation `gen` sharing the (immutable) content.
+
+        Args:
+            gen (int): The generation of the copy.
+
+        Returns:
+            FileNode: The copy.
+        """
+        clone = self._copy_into(FileNode.__new__(FileNode), gen)
+        if self._ends is None:
+            clone._chunks = self._chunks
+            clone._ends = None
+        else:
+            clone._chunks = list(self._chunks)
+            clone._ends = list(self._ends)
+        return clone
+
+    @property
+    def data(self):
+        chunks = self._chunks
+        if chunks.__class__ is str:
+            return chunks
+        joined = "".join(chunks) if chunks.__class__ is list else chunks.decode()
+        self._chunks = joined
+        self._ends = None
+        return joined
+
+    @data.setter
+    def data(self, value):
+        self._chunks = value
+        self._ends = None
+
+    @property
+    def size(self):
+        """int: Length of the content in characters."""
+        chunks = self._chunks
+        if chunks.__class__ is str:
+            return len(chunks)
+        if self._ends is not None:
+            return self._ends[-1]
+        return chunks.chars
+
+    def append(self, text):
+        """
+        Append text without copying the existing content.
+
+        Args:
+            text (str): The text to append.
+        """
+        if not text:
+            return
+        chunks = self._chunks
+        if chunks.__class__ is not list:
+            chunks = self.data
+            if not chunks:
+                self._chunks = text
+                return
+            self._chunks = [chunks, text]
+            self._ends = [len(chunks), len(chunks) + len(text)]
+        else:
+            chunks.append(text)
+            self._ends.append(self._ends[-1] + len(text))
+
+    def read(self, offset=0, length=None):
+        """
+        Read a range of the content without joining unrelated chunks.
+
+        Args:
+            offset (int): Start position in characters.
+            length (int, optional): Maximum number of characters. Defaults to
+                                    the rest of the file.
+
+        Returns:
+            str: The requested slice (empty past end of file).
+        """
+        chunks = self._chunks
+        if chunks.__class__ is not list:
+            chunks = self.data
+            return chunks[offset:] if length is None else chunks[offset:offset + length]
+
+        ends = self._ends
+        stop = ends[-1] if length is None else min(ends[-1], offset + length)
+        if offset >= stop:
+            return ""
+
+        # Locate the first chunk containing `offset`, then copy only up to `stop`
+        i = bisect_right(ends, offset)
+        pos = ends[i - 1] if i else 0
+        parts = []
+        while pos < stop:
+            parts.append(chunks[i][max(0, offset - pos):stop - pos])
+            pos = ends[i]
+            i += 1
+        return "".join(parts)
 
     def __repr__(self):
         return f"<File {self.name} perm={self.permissions.mode}>"
 
 
-class DirectoryNode:
+class DirectoryNode(_Node):
     """
     Represents a directory in the filesystem.
 
@@ -76,7 +313,11 @@ class DirectoryNode:
         name (str): The name of the directory.
         children (dict): A dictionary mapping names to child nodes (Files or Directories).
         permissions (Permissions): Access permissions.
+        total_size (int): Combined content size of every file below this directory.
+        total_inodes (int): Number of nodes in this subtree, including itself.
     """
+    __slots__ = ("children", "total_size", "total_inodes")
+
     def __init__(self, name, owner="root", mode="rw", group="root", group_mode="", world_mode=""):
         """
         Initialize a DirectoryNode.
@@ -89,9 +330,28 @@ class DirectoryNode:
             group_mode (str, optional): Group permission mode. Defaults to "".
             world_mode (str, optional): World permission mode. Defaults to "".
         """
+        Permissions.__init__(self, owner, mode, group, group_mode, world_mode)
         self.name = name
+        self.gen = 0
         self.children = {}
-        self.permissions = Permissions(owner, mode, group, group_mode, world_mode)
+        self.total_size = 0
+        self.total_inodes = 1
+
+    def clone(self, gen):
+        """
+        Return a shallow copy for generation `gen`; children are shared.
+
+        Args:
+            gen (int): The generation of the copy.
+
+        Returns:
+            DirectoryNode: The copy.
+        """
+        clone = self._copy_into(DirectoryNode.__new__(DirectoryNode), gen)
+        clone.children = dict(self.children)
+        clone.total_size = self.total_size
+        clone.total_inodes = self.total_inodes
+        return clone
 
     def __repr__(self):
         return f"<Dir {self.name}>"
@@ -105,10 +365,43 @@ class FileSystem:
     Provides methods for common filesystem operations like reading, writing,
     listing, and creating directories, with basic permission checks.
 
+    Path lookups go through a dentry cache that maps normalized paths to
+    their (parent, node) pair, so repeated access to deep paths does not
+    re-walk the tree from the root.
+
+    Snapshots are copy-on-write: `snapshot()` only records the current root
+    and starts a new generation. Nodes from older generations are shared
+    with snapshots and are copied (together with their ancestors) the first
+    time they are modified.
+
+    A name/owner index (see `loop.kernel.fsindex`) is updated on every
+    create, delete and rename so `find()` and `glob()` do not walk the tree.
+
+    Every DirectoryNode carries the total size and inode count of its
+    subtree, and per-owner usage is kept alongside. Both are updated in
+    O(depth) on each write, append, delete and rename, so `du()` and the
+    quota check in the write paths never walk the tree.
+
+    The filesystem is safe to share between threads. Each operation locks
+    the stripe (one of `LOCK_STRIPES` mutexes) of the directory whose
+    entries it reads or changes, so operations in different directories
+    run concurrently while appends to one file are serialized. Whole-tree
+    operations (snapshot, restore, rename, image load/save, removing a
+    directory) take every stripe.
+
     Attributes:
         root (DirectoryNode): The root directory of the filesystem.
+        dcache_hits (int): Number of lookups answered by the dentry cache
+                           (approximate under concurrent use).
+        dcache_misses (int): Number of lookups that had to walk the tree.
     """
 
+    # Upper bound on cached dentries before the cache is flushed.
+    DCACHE_MAX_ENTRIES = 65536
+
+    # Number of path locks; operations on different directories rarely collide.
+    LOCK_STRIPES = 64
+
     def __init__(self):
         """
         Initialize the FileSystem with a default directory structure.
@@ -116,6 +409,34 @@ class FileSystem:
         """
         self.root = DirectoryNode("/")
 
+        # Lock stripes keyed on the parent directory path, plus short-held
+        # locks for copy-on-write, usage accounting and the name index
+        self._stripes = tuple(threading.Lock() for _ in range(self.LOCK_STRIPES))
+        self._cow_lock = threading.Lock()
+        self._acct_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._lock_cache = {}  # path -> stripe
+
+        # Dentry cache: normalized path -> (parent DirectoryNode, node)
+        self._dcache = {"/": (None, self.root)}
+        self.dcache_hits = 0
+        self.dcache_misses = 0
+
+        # Per-owner usage (owner -> [size, inodes]) and quotas
+        # (owner -> (max_size, max_inodes)); the root directory counts as root's
+        self._usage = {"root": [0, 1]}
+        self._quotas = {}
+
+        # Secondary name/owner index; rebuilt lazily after restore/load
+        self._index = NameIndex()
+        self._index_dirty = False
+
+        # Copy-on-write snapshots
+        self._generation = 0
+        self._snapshots = {}  # id -> {"root", "generation", "created_at", "overhead_bytes"}
+        self._next_snapshot_id = 1
+        self._cow_owner = None  # snapshot charged for copies in this generation
+
         # boot FS structure
         self.mkdir("/usr", "root")
         self.mkdir("/etc", "root")
@@ -143,27 +464,16 @@ class FileSystem:
         if uid == "root":
             return True
 
-        groups = groups or []
-        perm_str = ""
-
-        # 1. Owner check
-        if node.permissions.owner == uid:
-            perm_str = node.permissions.mode
-        # 2. Group check
-        elif node.permissions.group in groups:
-            perm_str = node.permissions.group_mode
-        # 3. World check
+        # Select the owner, group or world triplet and test the op bits
+        if node._owner == uid:
+            bits = node.bits >> 6
+        elif groups and node._group in groups:
+            bits = (node.bits >> 3) & 7
         else:
-            perm_str = node.permissions.world_mode
+            bits = node.bits & 7
 
-        # Check operation in resolved permission string
-        if op in perm_str:
-            return True
-        # Also handle 'rw' containing 'r' and 'w'
-        if 'rw' in perm_str:
-            return True
-
-        return False
+        need = mode_to_bits(op)
+        return bool(need) and (bits & need) == need
 
     def get_node_type(self, path):
         """
@@ -176,15 +486,16 @@ class FileSystem:
         Returns:
             str | None: 'file' or 'dir', or None if not found.
         """
-        try:
-            node = self._resolve(path)
-            if isinstance(node, DirectoryNode):
-                return 'dir'
-            elif isinstance(node, FileNode):
-                return 'file'
-        except KeyError:
-            pass
-        return None
+        with self._lock_for(path):
+            try:
+                node = self._resolve(path)
+                if isinstance(node, DirectoryNode):
+                    return 'dir'
+                elif isinstance(node, FileNode):
+                    return 'file'
+            except KeyError:
+                pass
+            return None
 
     def list_dir(self, path="/", uid="root", groups=None):
         """
@@ -202,35 +513,45 @@ class FileSystem:
             PermissionError: If access is denied.
             ValueError: If the path is not a directory.
         """
-        node = self._resolve(path)
-        if isinstance(node, DirectoryNode):
-            if self._check_perm(node, uid, 'r', groups):
-                return list(node.children.keys())
-            raise PermissionError(f"Permission denied: {path}")
-        raise ValueError("Not a directory")
+        with self._stripe(self._normalize(path)):
+            node = self._resolve(path)
+            if isinstance(node, DirectoryNode):
+                if self._check_perm(node, uid, 'r', groups):
+                    return list(node.children.keys())
+                raise PermissionError(f"Permission denied: {path}")
+            raise ValueError("Not a directory")
 
-    def read_file(self, path, uid="root", groups=None):
+    def read_file(self, path, uid="root", groups=None, offset=0, length=None):
         """
-        Read the contents of a file.
+        Read the contents of a file, or a range of it.
 
         Args:
             path (str): The file path.
             uid (str): The requesting user ID.
             groups (list[str], optional): The user's groups.
+            offset (int, optional): Start position in characters. Defaults to 0.
+            length (int, optional): Maximum characters to read. Defaults to
+                                    the rest of the file.
 
         Returns:
             str: The file content.
 
         Raises:
             PermissionError: If access is denied.
-            ValueError: If the path is not a file.
+            ValueError: If the path is not a file, or the range is negative.
         """
-        node = self._resolve(path)
-        if isinstance(node, FileNode):
-            if self._check_perm(node, uid, 'r', groups):
-                return node.data
-            raise PermissionError(f"Permission denied: {path}")
-        raise ValueError("Not a file")
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("Offset and length must be non-negative")
+
+        with self._lock_for(path):
+            node = self._resolve(path)
+            if isinstance(node, FileNode):
+                if self._check_perm(node, uid, 'r', groups):
+                    if offset or length is not None:
+                        return node.read(offset, length)
+                    return node.data
+                raise PermissionError(f"Permission denied: {path}")
+            raise ValueError("Not a file")
 
     def write_file(self, path, data, uid="root", groups=None):
         """
@@ -246,25 +567,34 @@ class FileSystem:
             PermissionError: If write access is denied.
             ValueError: If the path is a directory.
         """
-        # Check if file exists to check permissions, or parent to check create permissions
-        try:
-            node = self._resolve(path)
-            # File exists, check write perm
-            if isinstance(node, FileNode):
-                if self._check_perm(node, uid, 'w', groups):
-                    node.data = data
-                    return
-                raise PermissionError(f"Permission denied: {path}")
-            else:
-                 raise ValueError("Path is a directory")
-        except KeyError:
-            # File doesn't exist, check parent write perm to create
-            parent, name = self._split(path)
-            if self._check_perm(parent, uid, 'w', groups):
-                group = groups[0] if groups else "root"
-                parent.children[name] = FileNode(name, data, owner=uid, group=group)
-            else:
-                raise PermissionError(f"Permission denied: {path}")
+        with self._lock_for(path):
+            # Check if file exists to check permissions, or parent to check create permissions
+            try:
+                node = self._resolve(path)
+                # File exists, check write perm
+                if isinstance(node, FileNode):
+                    if self._check_perm(node, uid, 'w', groups):
+                        if node.gen != self._generation:
+                            node = self._lookup_mut(path)[1]
+                        self._charge(path, node._owner, len(data) - node.size, 0)
+                        node.data = data
+                        return
+                    raise PermissionError(f"Permission denied: {path}")
+                else:
+                     raise ValueError("Path is a directory")
+            except KeyError:
+                # File doesn't exist, check parent write perm to create
+                parent, name = self._split(path)
+                if self._check_perm(parent, uid, 'w', groups):
+                    self._charge(path, uid, len(data), 1)
+                    group = groups[0] if groups else "root"
+                    node = FileNode(name, data, owner=uid, group=group)
+                    node.gen = self._generation
+                    parent.children[name] = node
+                    self._dcache_add(path, parent, node)
+                    self._index_add(path, node)
+                else:
+                    raise PermissionError(f"Permission denied: {path}")
 
     def append_file(self, path, text, uid="root", groups=None):
         """
@@ -279,21 +609,30 @@ class FileSystem:
         Raises:
             PermissionError: If write access is denied.
         """
-        try:
-            node = self._resolve(path)
-            if isinstance(node, FileNode):
-                if self._check_perm(node, uid, 'w', groups):
-                    node.data += text + "\n"
-                    return
-                raise PermissionError(f"Permission denied: {path}")
-        except KeyError:
-            # Create new
-            parent, name = self._split(path)
-            if self._check_perm(parent, uid, 'w', groups):
-                group = groups[0] if groups else "root"
-                parent.children[name] = FileNode(name, text + "\n", owner=uid, group=group)
-            else:
-                raise PermissionError(f"Permission denied: {path}")
+        with self._lock_for(path):
+            try:
+                node = self._resolve(path)
+                if isinstance(node, FileNode):
+                    if self._check_perm(node, uid, 'w', groups):
+                        if node.gen != self._generation:
+                            node = self._lookup_mut(path)[1]
+                        self._charge(path, node._owner, len(text) + 1, 0)
+                        node.append(text + "\n")
+                        return
+                    raise PermissionError(f"Permission denied: {path}")
+            except KeyError:
+                # Create new
+                parent, name = self._split(path)
+                if self._check_perm(parent, uid, 'w', groups):
+                    self._charge(path, uid, len(text) + 1, 1)
+                    group = groups[0] if groups else "root"
+                    node = FileNode(name, text + "\n", owner=uid, group=group)
+                    node.gen = self._generation
+                    parent.children[name] = node
+                    self._dcache_add(path, parent, node)
+                    self._index_add(path, node)
+                else:
+                    raise PermissionError(f"Permission denied: {path}")
 
     def mkdir(self, path, uid="root", owner=None, group=None, groups=None):
         """
@@ -310,20 +649,27 @@ class FileSystem:
             PermissionError: If creation is not allowed.
             FileExistsError: If path already exists.
         """
-        try:
-            self._resolve(path)
-            # Already exists
-            raise FileExistsError(f"Directory already exists: {path}")
-        except KeyError:
-            pass
+        with self._lock_for(path):
+            try:
+                self._resolve(path)
+                # Already exists
+                raise FileExistsError(f"Directory already exists: {path}")
+            except KeyError:
+                pass
 
-        parent, name = self._split(path)
-        if self._check_perm(parent, uid, 'w', groups):
-            new_owner = owner if owner else uid
-            new_group = group if group else (groups[0] if groups else "root")
-            parent.children[name] = DirectoryNode(name, owner=new_owner, group=new_group)
-        else:
-            raise PermissionError(f"Permission denied: {path}")
+            parent, name = self._split(path)
+            if self._check_perm(parent, uid, 'w', groups):
+                new_owner = owner if owner else uid
+                new_group = group if group else (groups[0] if groups else "root")
+                self._charge(path, new_owner, 0, 1)
+                node = DirectoryNode(name, owner=new_owner, group=new_group)
+                node.gen = self._generation
+                parent.children[name] = node
+                self._dcache_invalidate(path)
+                self._dcache_add(path, parent, node)
+                self._index_add(path, node)
+            else:
+                raise PermissionError(f"Permission denied: {path}")
 
     def delete_file(self, path, uid="root", groups=None):
         """
@@ -339,6 +685,20 @@ class FileSystem:
             PermissionError: If deletion is not allowed.
             OSError: If attempting to delete a non-empty directory.
         """
+        key = self._normalize(path)
+        with self._lock_paths(self._parent_key(key), key):
+            try:
+                is_dir = isinstance(self._resolve(key), DirectoryNode)
+            except KeyError:
+                is_dir = False
+            if not is_dir:
+                return self._delete(path, uid, groups)
+        # Removing a directory must also exclude walks passing through it
+        with self._lock_all():
+            return self._delete(path, uid, groups)
+
+    def _delete(self, path, uid, groups):
+        """Delete a path; the caller holds the locks covering it."""
         try:
             parent, name = self._split(path)
         except KeyError:
@@ -357,9 +717,89 @@ class FileSystem:
                  raise OSError("Directory not empty")
 
              del parent.children[name]
+             self._dcache_invalidate(path)
+             self._index_remove(path)
+             size, inodes = self._subtree_usage(target)
+             self._charge(path, target._owner, -size, -inodes)
         else:
             raise PermissionError(f"Permission denied: {path}")
 
+    def rename(self, src, dst, uid="root", groups=None):
+        """
+        Rename (move) a file or directory.
+
+        Args:
+            src (str): The existing path.
+            dst (str): The new path. Its parent directory must exist.
+            uid (str): The requesting user ID.
+            groups (list[str], optional): The user's groups.
+
+        Raises:
+            FileNotFoundError: If src or the parent of dst does not exist.
+            FileExistsError: If dst already exists.
+            PermissionError: If write access to either parent is denied.
+            ValueError: If a directory would be moved inside itself.
+        """
+        with self._lock_all():
+            src_key = self._normalize(src)
+            dst_key = self._normalize(dst)
+            if src_key == "/":
+                raise PermissionError("Permission denied: cannot rename /")
+
+            try:
+                src_parent, src_name = self._split(src_key)
+                node = src_parent.children[src_name]
+            except KeyError:
+                raise FileNotFoundError(f"Path not found: {src}")
+            try:
+                dst_parent, dst_name = self._split(dst_key)
+            except KeyError:
+                raise FileNotFoundError(f"Parent path not found: {dst}")
+
+            if dst_name in dst_parent.children:
+                raise FileExistsError(f"Path already exists: {dst}")
+            if dst_key.startswith(src_key + "/"):
+                raise ValueError(f"Cannot move {src} inside itself")
+
+            if not (self._check_perm(src_parent, uid, 'w', groups)
+                    and self._check_perm(dst_parent, uid, 'w', groups)):
+                raise PermissionError(f"Permission denied: {src} -> {dst}")
+
+            del src_parent.children[src_name]
+            if node.gen != self._generation:
+                node = self._cow_clone(node)
+            node.name = dst_name
+            dst_parent.children[dst_name] = node
+
+            # Ownership is unchanged; only the ancestors' aggregates move
+            size, inodes = self._subtree_usage(node)
+            self._account(src_key, -size, -inodes)
+            self._account(dst_key, size, inodes)
+
+            self._dcache_invalidate(src_key, subtree=True)
+            self._dcache_add(dst_key, dst_parent, node)
+
+            with self._index_lock:
+                if not self._index_dirty:
+                    for old, new, moved in self._iter_subtree(node, src_key, dst_key):
+                        self._index.remove(old)
+                        self._index.add(new, moved.name, moved._owner)
+
+    def dcache_stats(self):
+        """
+        Report dentry cache statistics.
+
+        Returns:
+            dict: 'hits', 'misses', 'entries' and 'hit_rate' (0.0 - 1.0).
+        """
+        total = self.dcache_hits + self.dcache_misses
+        return {
+            "hits": self.dcache_hits,
+            "misses": self.dcache_misses,
+            "entries": len(self._dcache),
+            "hit_rate": self.dcache_hits / total if total else 0.0,
+        }
+
     def chmod(self, path, mode=None, group_mode=None, world_mode=None, uid="root", groups=None):
         """
         Change permissions of a file or directory.
@@ -377,22 +817,645 @@ class FileSystem:
             FileNotFoundError: If path not found.
             PermissionError: If user is not owner/root.
         """
-        try:
-            node = self._resolve(path)
-        except KeyError:
-            raise FileNotFoundError(f"Path not found: {path}")
+        with self._lock_for(path):
+            try:
+                node = self._resolve(path)
+            except KeyError:
+                raise FileNotFoundError(f"Path not found: {path}")
+
+            if uid != "root" and node.permissions.owner != uid:
+                raise PermissionError(f"Permission denied: Only owner or root can change permissions for {path}")
+
+            if node.gen != self._generation:
+                node = self._lookup_mut(path)[1]
+
+            if mode is not None:
+                node.permissions.mode = mode
+            if group_mode is not None:
+                node.permissions.group_mode = group_mode
+            if world_mode is not None:
+                node.permissions.world_mode = world_mode
+
+    # ===== Usage & Quotas =====
+    def du(self, path="/", uid="root", groups=None):
+        """
+        Report the size and inode count of a subtree in O(1).
+
+        Args:
+            path (str): The file or directory path. Defaults to "/".
+            uid (str): The requesting user ID.
+            groups (list[str], optional): The user's groups.
+
+        Returns:
+            dict: 'size' (total content length) and 'inodes' (nodes in the
+                  subtree, including the path itself).
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+            PermissionError: If read access is denied.
+        """
+        with self._lock_for(path):
+            try:
+                node = self._resolve(path)
+            except KeyError:
+                raise FileNotFoundError(f"Path not found: {path}")
+            if not self._check_perm(node, uid, 'r', groups):
+                raise PermissionError(f"Permission denied: {path}")
+            with self._acct_lock:
+                size, inodes = self._subtree_usage(node)
+            return {"size": size, "inodes": inodes}
+
+    def set_quota(self, user, max_size=None, max_inodes=None, uid="root"):
+        """
+        Set or clear a user's quota. Only root may change quotas.
+
+        Existing usage above a new limit is not reclaimed; further growth
+        is refused until the user is back under it.
+
+        Args:
+            user (str): The user the quota applies to.
+            max_size (int, optional): Maximum total content size. None means unlimited.
+            max_inodes (int, optional): Maximum number of nodes owned. None means unlimited.
+            uid (str): The requesting user ID.
+
+        Raises:
+            PermissionError: If the requester is not root.
+        """
+        with self._acct_lock:
+            if uid != "root":
+                raise PermissionError("Permission denied: only root can set quotas")
+            if max_size is None and max_inodes is None:
+                self._quotas.pop(user, None)
+            else:
+                self._quotas[user] = (max_size, max_inodes)
+
+    def get_usage(self, user):
+        """
+        Report a user's current usage and quota.
+
+        Args:
+            user (str): The user to report on.
+
+        Returns:
+            dict: 'size', 'inodes', 'max_size' and 'max_inodes' (None if unlimited).
+        """
+        with self._acct_lock:
+            size, inodes = self._usage.get(user, (0, 0))
+            max_size, max_inodes = self._quotas.get(user, (None, None))
+            return {"size": size, "inodes": inodes, "max_size": max_size, "max_inodes": max_inodes}
+
+    # ===== Search =====
+    def find(self, pattern=None, owner=None, uid="root", groups=None):
+        """
+        Find paths by basename pattern and/or owner using the name index.
+
+        Args:
+            pattern (str, optional): Shell-style basename pattern (e.g. '*.log').
+                                     None matches every name.
+            owner (str, optional): Only return nodes owned by this user.
+            uid (str): The requesting user ID.
+            groups (list[str], optional): The user's groups.
+
+        Returns:
+            list[str]: Matching paths, sorted. Entries in directories the
+                       user cannot list are omitted.
+        """
+        self._index_refresh()
+        with self._index_lock:
+            found = self._index.find(pattern, owner)
+        return self._visible(found, uid, groups)
+
+    def glob(self, pattern, uid="root", groups=None):
+        """
+        Match full paths against a glob pattern.
+
+        '*', '?' and '[...]' match within one path component and '**'
+        matches any number of components, e.g. '/home/*/notes*.txt' or
+        '/var/**/*.log'.
+
+        Args:
+            pattern (str): The glob pattern. Relative patterns start at '/'.
+            uid (str): The requesting user ID.
+            groups (list[str], optional): The user's groups.
+
+        Returns:
+            list[str]: Matching paths, sorted.
+        """
+        pattern_parts = [p for p in pattern.split("/") if p]
+        if not pattern_parts:
+            return ["/"]
+
+        self._index_refresh()
+        last = pattern_parts[-1]
+        name_pattern = None if last == "**" else last
+
+        matches = []
+        with self._index_lock:
+            for path in self._index.candidates(name_pattern):
+                if match_path(path.split("/")[1:], pattern_parts):
+                    matches.append(path)
+        matches.sort()
+        return self._visible(matches, uid, groups)
+
+    def _visible(self, paths, uid, groups):
+        """Filter out paths whose parent directory the user cannot read."""
+        if uid == "root":
+            return paths
+        visible = []
+        for path in paths:
+            parent_key = self._parent_key(path)
+            with self._lock_for(parent_key):
+                try:
+                    parent = self._resolve(parent_key)
+                except KeyError:
+                    continue  # removed since the index was queried
+                if self._check_perm(parent, uid, 'r', groups):
+                    visible.append(path)
+        return visible
+
+    # ===== Snapshots =====
+    def snapshot(self):
+        """
+        Take an O(1) copy-on-write snapshot of the whole tree.
+
+        The current tree becomes read-only shared state; subsequent writes
+        copy only the nodes on the modified paths.
+
+        Returns:
+            int: The snapshot ID.
+        """
+        with self._lock_all(), self._cow_lock:
+            snap_id = self._next_snapshot_id
+            self._next_snapshot_id += 1
+            self._snapshots[snap_id] = {
+                "root": self.root,
+                "generation": self._generation,
+                "created_at": time.time(),
+                "overhead_bytes": 0,
+                "usage": {owner: list(usage) for owner, usage in self._usage.items()},
+            }
+            self._generation += 1
+            self._cow_owner = snap_id
+            return snap_id
+
+    def restore(self, snapshot_id):
+        """
+        Roll the tree back to a snapshot in O(1).
+
+        The snapshot is kept, so it can be restored again later.
+
+        Args:
+            snapshot_id (int): The ID returned by `snapshot()`.
+
+        Raises:
+            ValueError: If the snapshot does not exist.
+        """
+        with self._lock_all(), self._cow_lock:
+            snap = self._snapshots.get(snapshot_id)
+            if snap is None:
+                raise ValueError(f"Unknown snapshot: {snapshot_id}")
+
+            # Start a new generation so the snapshot's nodes stay frozen
+            self.root = snap["root"]
+            self._usage = {owner: list(usage) for owner, usage in snap["usage"].items()}
+            self._generation += 1
+            self._cow_owner = snapshot_id
+            self._dcache = {"/": (None, self.root)}
+            self._index_invalidate()
+
+    def drop_snapshot(self, snapshot_id):
+        """
+        Release a snapshot. Nodes only it referenced become garbage.
+
+        Args:
+            snapshot_id (int): The snapshot to drop.
 
-        if uid != "root" and node.permissions.owner != uid:
-            raise PermissionError(f"Permission denied: Only owner or root can change permissions for {path}")
+        Raises:
+            ValueError: If the snapshot does not exist.
+        """
+        with self._cow_lock:
+            if self._snapshots.pop(snapshot_id, None) is None:
+                raise ValueError(f"Unknown snapshot: {snapshot_id}")
+            if self._cow_owner == snapshot_id:
+                self._cow_owner = None
+
+    def list_snapshots(self):
+        """
+        List snapshots with their copy-on-write memory overhead.
+
+        `overhead_bytes` is the size of the node copies made because the
+        snapshot still shared the original nodes (file content is shared
+        and not counted).
 
-        if mode is not None:
-            node.permissions.mode = mode
-        if group_mode is not None:
-            node.permissions.group_mode = group_mode
-        if world_mode is not None:
-            node.permissions.world_mode = world_mode
+        Returns:
+            list[dict]: One entry per snapshot, oldest first.
+        """
+        with self._cow_lock:
+            return [
+                {
+                    "id": snap_id,
+                    "generation": snap["generation"],
+                    "created_at": snap["created_at"],
+                    "overhead_bytes": snap["overhead_bytes"],
+                }
+                for snap_id, snap in sorted(self._snapshots.items())
+            ]
+
+    # ===== Persistence =====
+    def save_image(self, path):
+        """
+        Persist the current tree to a binary image file.
+
+        Snapshots are not saved. See `loop.kernel.fsimage` for the format.
+
+        Args:
+            path (str | Path): Destination image path.
+
+        Returns:
+            dict: 'nodes' and 'data_bytes' written.
+        """
+        with self._lock_all():
+            from loop.kernel import fsimage
+            return fsimage.save_image(self.root, path)
+
+    def load_image(self, path):
+        """
+        Replace the current tree with the contents of an image file.
+
+        File contents stay in the memory-mapped image until first read.
+        Existing snapshots are discarded.
+
+        Args:
+            path (str | Path): The image path.
+
+        Raises:
+            FileNotFoundError: If the image does not exist.
+            ImageFormatError: If the image is corrupt.
+        """
+        from loop.kernel import fsimage
+        root = fsimage.load_image(path)
+
+        with self._lock_all():
+            self.root = root
+            self._generation = 0
+            self._snapshots = {}
+            self._cow_owner = None
+            self._dcache = {"/": (None, self.root)}
+            self._index_invalidate()
+            self._recount_usage()
 
     # ===== Helpers =====
+    @staticmethod
+    def _parent_key(path):
+        """Return the normalized path of the directory containing `path`."""
+        return FileSystem._normalize(path).rsplit("/", 1)[0] or "/"
+
+    def _stripe(self, key):
+        """Return the lock stripe for a normalized directory path."""
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _lock_for(self, path):
+        """
+        Return the lock guarding `path`: the stripe of its parent directory.
+
+        The path -> stripe mapping never changes, so it is memoized on the
+        raw path string to keep normalization off the hot path.
+        """
+        lock = self._lock_cache.get(path)
+        if lock is None:
+            if len(self._lock_cache) >= self.DCACHE_MAX_ENTRIES:
+                self._lock_cache = {}
+            lock = self._lock_cache[path] = self._stripe(self._parent_key(path))
+        return lock
+
+    @contextmanager
+    def _lock_paths(self, *keys):
+        """
+        Hold the stripes of several normalized paths.
+
+        Stripes are taken in index order so concurrent callers cannot deadlock.
+        """
+        stripes = [self._stripes[i] for i in sorted({hash(k) % len(self._stripes) for k in keys})]
+        for lock in stripes:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(stripes):
+                lock.release()
+
+    @contextmanager
+    def _lock_all(self):
+        """Hold every stripe, excluding all other path operations."""
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
+
+    @staticmethod
+    def _normalize(path):
+        """
+        Normalize a path to the canonical '/a/b' form used as dentry key.
+
+        Empty components (duplicate or trailing slashes) are dropped and
+        relative paths are treated as relative to the root.
+
+        Args:
+            path (str): The path to normalize.
+
+        Returns:
+            str: The normalized path.
+        """
+        if path.startswith("/") and "//" not in path and (len(path) == 1 or not path.endswith("/")):
+            return path
+        return "/" + "/".join(p for p in path.split("/") if p)
+
+    def _lookup(self, path):
+        """
+        Resolve a path to its (parent, node) pair via the dentry cache.
+
+        On a miss the tree is walked from the deepest cached ancestor and
+        every directory visited is added to the cache.
+
+        Args:
+            path (str): The path to resolve.
+
+        Returns:
+            tuple: (DirectoryNode parent or None for root, node).
+
+        Raises:
+            KeyError: If the path does not exist.
+        """
+        entry = self._dcache.get(path)
+        if entry is None:
+            key = self._normalize(path)
+            entry = self._dcache.get(key)
+            if entry is None:
+                self.dcache_misses += 1
+                return self._walk(key, path)
+        self.dcache_hits += 1
+        return entry
+
+    def _walk(self, key, path):
+        """
+        Walk the tree for a normalized key, populating the dentry cache.
+
+        Args:
+            key (str): The normalized path.
+            path (str): The original path (for error messages).
+
+        Returns:
+            tuple: (DirectoryNode parent, node).
+
+        Raises:
+            KeyError: If the path does not exist.
+        """
+        # Start from the deepest cached ancestor
+        base = key
+        while True:
+            base = base.rsplit("/", 1)[0] or "/"
+            entry = self._dcache.get(base)
+            if entry is not None:
+                break
+
+        parent, node = entry
+        prefix = "" if base == "/" else base
+        parts = key[len(prefix) + 1:].split("/")
+        last = len(parts) - 1
+        for i, p in enumerate(parts):
+            child = node.children.get(p) if isinstance(node, DirectoryNode) else None
+            # Only cache a file when it is the target. A walk through a file
+            # fails anyway, and must not re-add the dentry of a file that is
+            # being deleted under a lock this walk does not hold.
+            if child is None or (i < last and not isinstance(child, DirectoryNode)):
+                raise KeyError(f"Path not found: {path}")
+            parent, node = node, child
+            prefix = prefix + "/" + p
+            self._dcache_add(prefix, parent, node)
+        return parent, node
+
+    def _dcache_add(self, path, parent, node):
+        """
+        Insert a dentry, flushing the cache if it grows beyond its bound.
+
+        Args:
+            path (str): The path of the node.
+            parent (DirectoryNode): The node's parent directory.
+            node (FileNode or DirectoryNode): The node.
+        """
+        if len(self._dcache) >= self.DCACHE_MAX_ENTRIES:
+            self._dcache = {"/": (None, self.root)}
+        self._dcache[self._normalize(path)] = (parent, node)
+
+    def _dcache_invalidate(self, path, subtree=False):
+        """
+        Drop the dentry for a path and, optionally, every dentry below it.
+
+        Args:
+            path (str): The path whose dentry is stale.
+            subtree (bool): Also drop descendants (used when a directory moves).
+        """
+        key = self._normalize(path)
+        self._dcache.pop(key, None)
+        if subtree:
+            prefix = key + "/"
+            for stale in [k for k in self._dcache if k.startswith(prefix)]:
+                del self._dcache[stale]
+
+    def _lookup_mut(self, path):
+        """
+        Resolve a path to a (parent, node) pair that may be modified.
+
+        If the node is shared with a snapshot, it and every shared ancestor
+        are copied into the current generation first.
+
+        Args:
+            path (str): The path to resolve.
+
+        Returns:
+            tuple: (DirectoryNode parent or None for root, node).
+
+        Raises:
+            KeyError: If the path does not exist.
+        """
+        parent, node = self._lookup(path)
+        if node.gen == self._generation:
+            # Current-generation nodes only ever hang off current-generation parents
+            return parent, node
+
+        # Copies touch shared ancestors, so only one thread may copy at a time
+        with self._cow_lock:
+            gen = self._generation
+            node = self.root
+            if node.gen != gen:
+                node = self.root = self._cow_clone(node)
+                self._dcache["/"] = (None, node)
+            parent = None
+            key = self._normalize(path)
+            prefix = ""
+            for p in key.split("/")[1:] if key != "/" else ():
+                child = node.children[p]
+                if child.gen != gen:
+                    child = self._cow_clone(child)
+                    node.children[p] = child
+                parent, node = node, child
+                prefix = prefix + "/" + p
+                self._dcache_add(prefix, parent, node)
+            return parent, node
+
+    def _cow_clone(self, node):
+        """
+        Copy a shared node into the current generation, charging the copy
+        to the snapshot that caused it.
+
+        Args:
+            node (FileNode or DirectoryNode): The shared node.
+
+        Returns:
+            FileNode or DirectoryNode: The writable copy.
+        """
+        clone = node.clone(self._generation)
+        snap = self._snapshots.get(self._cow_owner)
+        if snap is not None:
+            size = sys.getsizeof(clone)
+            if isinstance(clone, DirectoryNode):
+                size += sys.getsizeof(clone.children)
+            snap["overhead_bytes"] += size
+        return clone
+
+    def _charge(self, path, owner, size, inodes):
+        """
+        Charge a change in usage to `owner` and to every ancestor of `path`.
+
+        Growth is checked against the owner's quota and recorded under one
+        lock, so concurrent writers cannot both slip under the limit. Callers
+        charge before mutating, so a refused write leaves the tree untouched.
+
+        Args:
+            path (str): The path being created, resized or removed.
+            owner (str): The user the change is charged to.
+            size (int): Change in content size.
+            inodes (int): Change in node count.
+
+        Raises:
+            QuotaExceededError: If growth would exceed the owner's quota.
+        """
+        with self._acct_lock:
+            usage = self._usage.get(owner)
+            if usage is None:
+                usage = self._usage[owner] = [0, 0]
+            quota = self._quotas.get(owner)
+            if quota is not None:
+                max_size, max_inodes = quota
+                if size > 0 and max_size is not None and usage[0] + size > max_size:
+                    raise QuotaExceededError(f"Disk quota exceeded for {owner}: size limit {max_size}")
+                if inodes > 0 and max_inodes is not None and usage[1] + inodes > max_inodes:
+                    raise QuotaExceededError(f"Disk quota exceeded for {owner}: inode limit {max_inodes}")
+            usage[0] += size
+            usage[1] += inodes
+            self._account(self._normalize(path), size, inodes)
+
+    def _account(self, key, size, inodes):
+        """
+        Add to the subtree aggregates of every ancestor of `key`.
+
+        The ancestors must already be in the current generation, which holds
+        whenever the node at `key` (or its parent, for creates) is writable.
+
+        Args:
+            key (str): The normalized path whose ancestors are updated.
+            size (int): Change in content size.
+            inodes (int): Change in node count.
+        """
+        node = self.root
+        parts = key.split("/")[1:-1]
+        if inodes:
+            node.total_size += size
+            node.total_inodes += inodes
+            for p in parts:
+                node = node.children[p]
+                node.total_size += size
+                node.total_inodes += inodes
+        elif size:
+            # Plain writes and appends only change sizes
+            node.total_size += size
+            for p in parts:
+                node = node.children[p]
+                node.total_size += size
+
+    @staticmethod
+    def _subtree_usage(node):
+        """Return (size, inodes) for a node and everything below it."""
+        if isinstance(node, DirectoryNode):
+            return node.total_size, node.total_inodes
+        return node.size, 1
+
+    def _recount_usage(self):
+        """Rebuild per-owner usage from the tree (after loading an image)."""
+        usage = {}
+        for _, _, node in self._iter_subtree(self.root, "/", "/"):
+            entry = usage.get(node._owner)
+            if entry is None:
+                entry = usage[node._owner] = [0, 0]
+            if isinstance(node, FileNode):
+                entry[0] += node.size
+            entry[1] += 1
+        self._usage = usage
+
+    def _index_add(self, path, node):
+        """Register a newly created node in the name index."""
+        with self._index_lock:
+            if not self._index_dirty:
+                self._index.add(self._normalize(path), node.name, node._owner)
+
+    def _index_remove(self, path):
+        """Drop a deleted path from the name index."""
+        with self._index_lock:
+            if not self._index_dirty:
+                self._index.remove(self._normalize(path))
+
+    def _index_invalidate(self):
+        """Drop the name index after the whole tree was swapped out."""
+        with self._index_lock:
+            self._index.clear()
+            self._index_dirty = True
+
+    def _index_refresh(self):
+        """Rebuild the name index if the tree was swapped out since it was built."""
+        if not self._index_dirty:
+            return
+        # The rebuild walks the whole tree, so writers must be held off
+        with self._lock_all(), self._index_lock:
+            if not self._index_dirty:
+                return
+            for _, path, node in self._iter_subtree(self.root, "/", "/"):
+                if node is not self.root:
+                    self._index.add(path, node.name, node._owner)
+            self._index_dirty = False
+
+    @staticmethod
+    def _iter_subtree(node, old_key, new_key):
+        """
+        Yield (old_path, new_path, node) for a node and all its descendants.
+
+        Args:
+            node (FileNode or DirectoryNode): The subtree root.
+            old_key (str): The subtree root's previous path.
+            new_key (str): The subtree root's current path.
+        """
+        stack = [(node, old_key, new_key)]
+        while stack:
+            node, old, new = stack.pop()
+            yield old, new, node
+            if isinstance(node, DirectoryNode):
+                old_prefix = "" if old == "/" else old
+                new_prefix = "" if new == "/" else new
+                for name, child in node.children.items():
+                    stack.append((child, f"{old_prefix}/{name}", f"{new_prefix}/{name}"))
+
     def _resolve(self, path):
         """
         Resolve a path string to a node in the filesystem tree.
@@ -406,20 +1469,15 @@ class FileSystem:
         Raises:
             KeyError: If the path does not exist.
         """
-        if path == "/": return self.root
-        parts = [p for p in path.split("/") if p]
-        node = self.root
-        for p in parts:
-            if isinstance(node, DirectoryNode) and p in node.children:
-                node = node.children[p]
-            else:
-                raise KeyError(f"Path not found: {path}")
-        return node
+        return self._lookup(path)[1]
 
     def _split(self, path):
         """
         Split a path into its parent node and the leaf name.
 
+        The parent is returned writable (copied out of any snapshot), since
+        callers use it to add or remove children.
+
         Args:
             path (str): The path to split.
 
@@ -429,17 +1487,19 @@ class FileSystem:
         Raises:
             KeyError: If the parent path does not exist.
         """
-        parts = [p for p in path.split("/") if p]
-        if not parts:
+        key = self._normalize(path)
+        if key == "/":
             return self.root, "" # Should not happen for valid paths with name
-        parent_parts = parts[:-1]
-        name = parts[-1]
+        parent_key, name = key.rsplit("/", 1)
 
-        node = self.root
-        for p in parent_parts:
-             if isinstance(node, DirectoryNode) and p in node.children:
-                node = node.children[p]
-             else:
-                raise KeyError(f"Parent path not found: {path}")
+        parent_key = parent_key or "/"
+        try:
+            node = self._lookup(parent_key)[1]
+        except KeyError:
+            raise KeyError(f"Parent path not found: {path}")
+        if not isinstance(node, DirectoryNode):
+            raise KeyError(f"Parent path not found: {path}")
+        if node.gen != self._generation:
+            node = self._lookup_mut(parent_key)[1]
 
         return node, name
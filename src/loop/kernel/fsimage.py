@@ -0,0 +1,263 @@
+# kernel/fsimage.py
+"""
+FileSystem Image Format.
+
+This module serializes the in-memory FileSystem tree to a compact binary
+image so it survives reboots, and loads it back. The image layout is:
+
+    header | data blobs | string table | node table
+
+The header records the offsets of each region. Names, owners and groups are
+stored once in the string table and referenced by index from fixed-size
+node records. On load only the header, string table and node table are
+read; the data region is memory-mapped and each file keeps a `MappedBlob`
+reference that is decoded on first read, so boot time depends on the number
+of nodes rather than on the amount of content.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from loop.kernel.filesystem import FileNode, DirectoryNode
+
+MAGIC = b"LOOPFS\x00\x01"
+VERSION = 1
+
+# magic, version, node_count, data_off, strtab_off, strtab_len, nodetab_off
+_HEADER = struct.Struct("<8sIIQQQQ")
+# type, bits, name, owner, group, parent, data_off, data_len, char_len
+_NODE = struct.Struct("<BHIIIIQQQ")
+_STRLEN = struct.Struct("<I")
+
+_TYPE_DIR = 0
+_TYPE_FILE = 1
+_NO_PARENT = 0xFFFFFFFF
+_COPY_BLOCK = 1 << 20
+
+
+class ImageFormatError(Exception):
+    """Raised when an image file is truncated, corrupt or of an unknown version."""
+    pass
+
+
+class MappedBlob:
+    """
+    Lazily decoded file content backed by a memory-mapped image.
+
+    Attributes:
+        mm (mmap.mmap): The mapping of the whole image file.
+        offset (int): Byte offset of the content in the mapping.
+        length (int): Length of the content in bytes.
+        chars (int): Length of the content in characters.
+    """
+    __slots__ = ("mm", "offset", "length", "chars")
+
+    def __init__(self, mm, offset, length, chars):
+        self.mm = mm
+        self.offset = offset
+        self.length = length
+        self.chars = chars
+
+    def decode(self):
+        """
+        Page in and decode the content.
+
+        Returns:
+            str: The file content.
+        """
+        return self.mm[self.offset:self.offset + self.length].decode("utf-8")
+
+
+def save_image(root, path):
+    """
+    Write the tree under `root` to an image file.
+
+    The image is written to a temporary file and atomically renamed into
+    place, so an image that is currently memory-mapped stays valid.
+
+    Args:
+        root (DirectoryNode): The root directory to serialize.
+        path (str | Path): Destination image path.
+
+    Returns:
+        dict: 'nodes' and 'data_bytes' written.
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    strings = {}
+    string_list = []
+
+    def intern(value):
+        idx = strings.get(value)
+        if idx is None:
+            idx = strings[value] = len(string_list)
+            string_list.append(value)
+        return idx
+
+    records = []
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".vfs-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * _HEADER.size)
+            data_off = f.tell()
+
+            # Pre-order walk; parents are always written before children
+            stack = [(root, _NO_PARENT)]
+            while stack:
+                node, parent = stack.pop()
+                index = len(records)
+                name = intern(node.name)
+                owner = intern(node._owner)
+                group = intern(node._group)
+
+                if isinstance(node, DirectoryNode):
+                    records.append((_TYPE_DIR, node.bits, name, owner, group, parent, 0, 0, 0))
+                    for child in reversed(list(node.children.values())):
+                        stack.append((child, index))
+                    continue
+
+                blob_off = f.tell() - data_off
+                chunks = node._chunks
+                if isinstance(chunks, MappedBlob):
+                    # Untouched since load: copy the raw bytes without decoding
+                    start, end = chunks.offset, chunks.offset + chunks.length
+                    for pos in range(start, end, _COPY_BLOCK):
+                        f.write(chunks.mm[pos:min(pos + _COPY_BLOCK, end)])
+                    blob_len, chars = chunks.length, chunks.chars
+                else:
+                    text = node.data
+                    blob_len = f.write(text.encode("utf-8"))
+                    chars = len(text)
+                records.append((_TYPE_FILE, node.bits, name, owner, group, parent,
+                                blob_off, blob_len, chars))
+
+            data_len = f.tell() - data_off
+
+            strtab_off = f.tell()
+            f.write(_STRLEN.pack(len(string_list)))
+            for value in string_list:
+                encoded = value.encode("utf-8")
+                f.write(_STRLEN.pack(len(encoded)))
+                f.write(encoded)
+            strtab_len = f.tell() - strtab_off
+
+            nodetab_off = f.tell()
+            f.write(b"".join(_NODE.pack(*rec) for rec in records))
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, len(records), data_off,
+                                 strtab_off, strtab_len, nodetab_off))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return {"nodes": len(records), "data_bytes": data_len}
+
+
+def load_image(path):
+    """
+    Load an image file and rebuild its tree.
+
+    File contents are not read; each FileNode references its blob in a
+    read-only memory mapping of the image.
+
+    Args:
+        path (str | Path): The image path.
+
+    Returns:
+        DirectoryNode: The root of the loaded tree.
+
+    Raises:
+        FileNotFoundError: If the image does not exist.
+        ImageFormatError: If the image is corrupt or of an unknown version.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ImageFormatError(f"Truncated image header: {path}")
+        magic, version, count, data_off, strtab_off, strtab_len, nodetab_off = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ImageFormatError(f"Not a LooP filesystem image (v{VERSION}): {path}")
+
+        f.seek(strtab_off)
+        strtab = f.read(strtab_len)
+        f.seek(nodetab_off)
+        nodetab = f.read(count * _NODE.size)
+        if len(strtab) != strtab_len or len(nodetab) != count * _NODE.size or count == 0:
+            raise ImageFormatError(f"Truncated image tables: {path}")
+
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if strtab_off > data_off else None
+
+    strings = _parse_strings(strtab, path)
+
+    nodes = []
+    parents = []
+    try:
+        for rec in _NODE.iter_unpack(nodetab):
+            kind, bits, name, owner, group, parent, blob_off, blob_len, chars = rec
+            if kind == _TYPE_DIR:
+                node = DirectoryNode.__new__(DirectoryNode)
+                node.children = {}
+                node.total_size = 0
+                node.total_inodes = 1
+            else:
+                node = FileNode.__new__(FileNode)
+                node._ends = None
+                node._chunks = MappedBlob(mm, data_off + blob_off, blob_len, chars) if blob_len else ""
+            node.name = strings[name]
+            node._owner = strings[owner]
+            node._group = strings[group]
+            node.bits = bits
+            node.gen = 0
+            if parent != _NO_PARENT:
+                nodes[parent].children[node.name] = node
+            nodes.append(node)
+            parents.append(parent)
+    except (IndexError, AttributeError):
+        raise ImageFormatError(f"Corrupt node table: {path}")
+
+    root = nodes[0]
+    if not isinstance(root, DirectoryNode):
+        raise ImageFormatError(f"Image root is not a directory: {path}")
+
+    # Children always follow their parent, so a reverse pass sees every
+    # subtree total before it is added to the parent's
+    for i in range(len(nodes) - 1, 0, -1):
+        if parents[i] == _NO_PARENT:
+            continue
+        node = nodes[i]
+        parent = nodes[parents[i]]
+        if isinstance(node, DirectoryNode):
+            parent.total_size += node.total_size
+            parent.total_inodes += node.total_inodes
+        else:
+            parent.total_size += node.size
+            parent.total_inodes += 1
+    return root
+
+
+def _parse_strings(strtab, path):
+    """Decode the length-prefixed string table into interned strings."""
+    (count,) = _STRLEN.unpack_from(strtab, 0)
+    pos = _STRLEN.size
+    strings = []
+    try:
+        for _ in range(count):
+            (length,) = _STRLEN.unpack_from(strtab, pos)
+            pos += _STRLEN.size
+            strings.append(sys.intern(strtab[pos:pos + length].decode("utf-8")))
+            pos += length
+    except (struct.error, UnicodeDecodeError):
+        raise ImageFormatError(f"Corrupt string table: {path}")
+    return strings
@@ -0,0 +1,206 @@
+# kernel/fsindex.py
+"""
+FileSystem Name Index.
+
+This module implements the secondary indexes behind `FileSystem.find` and
+`FileSystem.glob`. Every indexed path is registered under the trigrams of
+its (boundary-padded) basename and under its owner, so a shell-style name
+pattern only has to be checked against paths that share all of the
+pattern's literal trigrams instead of every node in the tree.
+"""
+
+from fnmatch import fnmatchcase
+
+# Marks the start and end of a name so anchored patterns such as 'log*' or
+# '*.c' still yield trigrams.
+_BOUNDARY = "\0"
+
+
+def _trigrams(text):
+    """Return the set of 3-character substrings of `text`."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _literal_runs(pattern):
+    """
+    Split a shell-style pattern into the literal runs between wildcards.
+
+    Runs that touch the start or end of the pattern are padded with the
+    boundary marker, mirroring how names are indexed.
+
+    Args:
+        pattern (str): A pattern using '*', '?' and '[...]'.
+
+    Returns:
+        list[str]: The literal runs.
+    """
+    runs = []
+    current = _BOUNDARY
+    i = 0
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch in "*?[":
+            if current:
+                runs.append(current)
+            current = ""
+            if ch == "[":
+                # Skip the bracket expression (']' right after '[' or '[!' is literal)
+                j = i + 1
+                if j < n and pattern[j] == "!":
+                    j += 1
+                if j < n and pattern[j] == "]":
+                    j += 1
+                while j < n and pattern[j] != "]":
+                    j += 1
+                if j >= n:
+                    # Unterminated bracket: fnmatch treats '[' literally
+                    current = "["
+                else:
+                    i = j
+        else:
+            current += ch
+        i += 1
+    runs.append(current + _BOUNDARY)
+    return runs
+
+
+class NameIndex:
+    """
+    Incrementally maintained trigram and owner index over filesystem paths.
+
+    Attributes:
+        trigrams (dict): Trigram -> set of paths whose padded basename contains it.
+        owners (dict): Owner -> set of paths owned by that user.
+        entries (dict): Path -> (basename, owner) for every indexed path.
+    """
+
+    def __init__(self):
+        self.trigrams = {}
+        self.owners = {}
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """Drop every entry."""
+        self.trigrams.clear()
+        self.owners.clear()
+        self.entries.clear()
+
+    def add(self, path, name, owner):
+        """
+        Index a path.
+
+        Args:
+            path (str): The normalized path.
+            name (str): The basename.
+            owner (str): The owner's username.
+        """
+        if path in self.entries:
+            self.remove(path)
+        self.entries[path] = (name, owner)
+        for tri in _trigrams(_BOUNDARY + name + _BOUNDARY):
+            self.trigrams.setdefault(tri, set()).add(path)
+        self.owners.setdefault(owner, set()).add(path)
+
+    def remove(self, path):
+        """
+        Remove a path from the index (no-op if it is not indexed).
+
+        Args:
+            path (str): The normalized path.
+        """
+        entry = self.entries.pop(path, None)
+        if entry is None:
+            return
+        name, owner = entry
+        for tri in _trigrams(_BOUNDARY + name + _BOUNDARY):
+            bucket = self.trigrams.get(tri)
+            if bucket is not None:
+                bucket.discard(path)
+                if not bucket:
+                    del self.trigrams[tri]
+        bucket = self.owners.get(owner)
+        if bucket is not None:
+            bucket.discard(path)
+            if not bucket:
+                del self.owners[owner]
+
+    def candidates(self, pattern=None, owner=None):
+        """
+        Return a superset of the paths whose basename matches `pattern`.
+
+        Args:
+            pattern (str, optional): Shell-style basename pattern.
+            owner (str, optional): Restrict to paths owned by this user.
+
+        Returns:
+            set | dict keys: Candidate paths (still to be checked with `match`).
+        """
+        sets = []
+        if owner is not None:
+            sets.append(self.owners.get(owner, set()))
+        if pattern is not None:
+            for run in _literal_runs(pattern):
+                for tri in _trigrams(run):
+                    sets.append(self.trigrams.get(tri, set()))
+
+        if not sets:
+            return self.entries.keys()
+
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def find(self, pattern=None, owner=None):
+        """
+        Return the paths whose basename matches `pattern` and owner matches.
+
+        Args:
+            pattern (str, optional): Shell-style basename pattern (None matches all).
+            owner (str, optional): Restrict to paths owned by this user.
+
+        Returns:
+            list[str]: Matching paths, sorted.
+        """
+        entries = self.entries
+        found = []
+        for path in self.candidates(pattern, owner):
+            name, node_owner = entries[path]
+            if owner is not None and node_owner != owner:
+                continue
+            if pattern is None or fnmatchcase(name, pattern):
+                found.append(path)
+        found.sort()
+        return found
+
+
+def match_path(parts, pattern_parts):
+    """
+    Match path components against glob components.
+
+    '**' matches zero or more whole components; other components are
+    matched with `fnmatchcase`.
+
+    Args:
+        parts (list[str]): Path components.
+        pattern_parts (list[str]): Glob components.
+
+    Returns:
+        bool: True if the path matches.
+    """
+    if not pattern_parts:
+        return not parts
+    head = pattern_parts[0]
+    if head == "**":
+        rest = pattern_parts[1:]
+        return any(match_path(parts[i:], rest) for i in range(len(parts) + 1))
+    if not parts or not fnmatchcase(parts[0], head):
+        return False
+    return match_path(parts[1:], pattern_parts[1:])
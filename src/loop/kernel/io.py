@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 import queue
 import asyncio
+from loop.kernel.async_scheduler import to_thread
 
 class IOAdapter(ABC):
     """
@@ -17,6 +18,10 @@ class IOAdapter(ABC):
         """Read input from the user (blocking or via event)."""
         pass
 
+    async def read_async(self, prompt: str = "", password: bool = False) -> str:
+        """Read input without blocking the event loop (runs read() in a thread by default)."""
+        return await to_thread(self.read, prompt, password)
+
     @abstractmethod
     def flush(self):
         """Flush the output stream."""
@@ -66,6 +71,7 @@ class APIAdapter(IOAdapter):
         self.input_queue = queue.Queue()
         self.signal_queue = queue.Queue()
         self._buffer = []
+        self._input_waiter = None  # (loop, asyncio.Event) of a pending read_async()
 
     def write(self, text: str):
         # We might want to stream lines or chunks
@@ -82,6 +88,23 @@ class APIAdapter(IOAdapter):
         # Note: This blocks the thread. The Shell must run in a separate thread.
         return self.input_queue.get()
 
+    async def read_async(self, prompt: str = "", password: bool = False) -> str:
+        """Wait for input from the API on the event loop, without a thread."""
+        if prompt:
+            self.write(prompt)
+
+        event = asyncio.Event()
+        self._input_waiter = (asyncio.get_running_loop(), event)
+        try:
+            while True:
+                try:
+                    return self.input_queue.get_nowait()
+                except queue.Empty:
+                    await event.wait()
+                    event.clear()
+        finally:
+            self._input_waiter = None
+
     def flush(self):
         pass
 
@@ -92,6 +115,13 @@ class APIAdapter(IOAdapter):
     def input(self, text: str):
         """External method to inject input from the API."""
         self.input_queue.put(text)
+        waiter = self._input_waiter
+        if waiter is not None:
+            loop, event = waiter
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop closed
 
     def get_output(self, block=False, timeout=None):
         """External method to retrieve output."""
@@ -0,0 +1,206 @@
+# kernel/journal.py
+"""
+Kernel Journal.
+
+Buffered writer behind `SyscallHandler.sys_log`. Records are collected in
+an in-memory buffer and written to a long-lived file handle in groups
+("group commit"), once the buffer holds `flush_bytes` bytes or
+`flush_interval` seconds have passed since the first pending record.
+
+Durability levels:
+    buffered  Group commit; data reaches the OS page cache on each commit.
+    fsync     Group commit followed by os.fsync().
+    sync      Every record is written and fsynced before sys_log returns.
+"""
+
+import atexit
+import os
+import threading
+from collections import deque
+
+DURABILITY_LEVELS = ("buffered", "fsync", "sync")
+
+
+class Journal:
+    """
+    Append-only, group-committed log file.
+
+    Attributes:
+        path (Path): The log file on the host.
+        durability (str): One of DURABILITY_LEVELS.
+        flush_bytes (int): Pending bytes that trigger a commit.
+        flush_interval (float): Maximum seconds a record stays pending.
+        recent (deque): The last `capacity` committed records (ring buffer).
+        commits (int): Number of group commits performed.
+        records (int): Number of records written.
+    """
+
+    def __init__(self, path, durability="buffered", flush_bytes=64 * 1024,
+                 flush_interval=1.0, capacity=1024):
+        """
+        Initialize the Journal. The file is opened on the first commit.
+
+        Args:
+            path (Path): The log file on the host.
+            durability (str, optional): One of DURABILITY_LEVELS.
+            flush_bytes (int, optional): Size threshold for a group commit.
+            flush_interval (float, optional): Time threshold for a group commit.
+            capacity (int, optional): Number of recent records kept in memory.
+
+        Raises:
+            ValueError: If durability is not a known level.
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        self.path = path
+        self.durability = durability
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.recent = deque(maxlen=capacity)
+        self.commits = 0
+        self.records = 0
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_bytes = 0
+        self._file = None
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def write(self, line):
+        """
+        Append a record to the journal.
+
+        Args:
+            line (str): The record, without a trailing newline.
+        """
+        record = line + "\n"
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append(record)
+            self._pending_bytes += len(record)
+            if self.durability == "sync" or self._pending_bytes >= self.flush_bytes:
+                self._commit()
+            elif len(self._pending) == 1:
+                # First pending record: start the flush_interval countdown
+                if self._flusher is None:
+                    self._start_flusher()
+                self._wakeup.set()
+
+    def configure(self, durability=None, flush_bytes=None, flush_interval=None):
+        """
+        Change journal settings; pending records are committed first.
+
+        Args:
+            durability (str, optional): One of DURABILITY_LEVELS.
+            flush_bytes (int, optional): Size threshold for a group commit.
+            flush_interval (float, optional): Time threshold for a group commit.
+
+        Raises:
+            ValueError: If durability is not a known level.
+        """
+        if durability is not None and durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        with self._lock:
+            self._commit()
+            if durability is not None:
+                self.durability = durability
+            if flush_bytes is not None:
+                self.flush_bytes = flush_bytes
+            if flush_interval is not None:
+                self.flush_interval = flush_interval
+
+    def flush(self):
+        """Commit all pending records now."""
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        """Commit pending records, stop the flusher and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._commit()
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._stop.set()
+        self._wakeup.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=1.0)
+
+    def tail(self, n=50):
+        """
+        Return the most recent records, including uncommitted ones.
+
+        Args:
+            n (int, optional): Maximum number of records.
+
+        Returns:
+            list[str]: Records without trailing newlines, oldest first.
+        """
+        with self._lock:
+            lines = list(self.recent) + [r.rstrip("\n") for r in self._pending]
+        return lines[-n:]
+
+    def stats(self):
+        """
+        Report journal statistics.
+
+        Returns:
+            dict: 'records', 'commits', 'pending' and 'durability'.
+        """
+        with self._lock:
+            return {
+                "records": self.records,
+                "commits": self.commits,
+                "pending": len(self._pending),
+                "durability": self.durability,
+            }
+
+    def _commit(self):
+        """
+        Write pending records in one call. Caller must hold `_lock`.
+        """
+        if not self._pending:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(self._pending))
+        self._file.flush()
+        if self.durability != "buffered":
+            os.fsync(self._file.fileno())
+
+        self.recent.extend(r.rstrip("\n") for r in self._pending)
+        self.records += len(self._pending)
+        self.commits += 1
+        self._pending = []
+        self._pending_bytes = 0
+
+    def _start_flusher(self):
+        """Start the background thread enforcing flush_interval."""
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self):
+        """Commit pending records at most flush_interval after they arrive."""
+        while True:
+            # Sleep until there is something pending
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stop.wait(self.flush_interval):
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                try:
+                    self._commit()
+                except OSError:
+                    # Keep records pending; the next commit retries
+                    pass
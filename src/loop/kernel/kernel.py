@@ -10,9 +10,11 @@ from typing import Optional
 from .io import IOAdapter, CLIAdapter
 from .syscall import SyscallHandler
 from .scheduler import Scheduler
+from .process import Process
 from .users import UserManager
 from .network import NetworkManager, NetworkGuard
 from .sandbox import AgentSandbox
+from loop.kernel import rootfs
 from loop.servicemanager.servicemanager import ServiceManager
 from loop.kernel.plugins.loader import PluginLoader
 from loop.kernel.senses.listener import BackgroundListener
@@ -138,6 +140,35 @@ class LoopKernel:
         finally:
             self.shutdown()
 
+    async def start_async(self):
+        """
+        Start the LoopKernel on the running asyncio event loop.
+
+        The shell runs as a coroutine process and the scheduler as a
+        coroutine, so the kernel shares the caller's loop (e.g. the FastAPI
+        server's) instead of blocking a thread. Returns once the scheduler
+        stops.
+
+        Raises:
+            TypeError: If the scheduler is not an AsyncScheduler.
+        """
+        if not hasattr(self.scheduler, "run_async"):
+            raise TypeError("start_async() needs an AsyncScheduler")
+
+        # Start the background listener
+        self.listener.start()
+
+        from loop.shell.shell import Shell
+
+        shell = self.shell if self.shell else Shell(self.sys, self.service_manager, self.io)
+        # Interactive: ahead of services under the 'priority' policy
+        self.scheduler.add(Process("shell", shell.run_async(), uid=shell.current_user or "root", priority=-10))
+
+        try:
+            await self.scheduler.run_async()
+        finally:
+            self.shutdown()
+
     def shutdown(self):
         """
         Gracefully shut down the kernel and its subsystems.
@@ -168,11 +199,26 @@ class LoopKernel:
             # We pass the rest of the grace period logic to service manager
             self.service_manager.shutdown(timeout=10.0, grace_period=0) # We already warned plugins
 
-        # 5. Disable Network Guard (Release patches)
+        # No process is left to collect Offload results; stop the workers
+        if self.scheduler and getattr(self.scheduler, "offload_pool", None):
+            self.scheduler.offload_pool.shutdown(wait=False)
+
+        # 5. Persist the virtual filesystem
+        if self.sys and getattr(self.sys, "fs", None):
+            try:
+                self.sys.fs.save_image(rootfs.VFS_IMAGE)
+            except Exception as e:
+                self.io.write(f"[Kernel] Failed to save filesystem image: {e}\n")
+
+        # 6. Flush and close the kernel journal
+        if self.sys and getattr(self.sys, "journal", None):
+            self.sys.journal.close()
+
+        # 7. Disable Network Guard (Release patches)
         if self.network_guard:
             self.network_guard.disable()
 
-        # 6. Stop Listener
+        # 8. Stop Listener
         if self.listener:
             self.listener.stop()
 
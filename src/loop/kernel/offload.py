@@ -0,0 +1,137 @@
+# kernel/offload.py
+"""
+Offload Pool.
+
+Runs the functions processes hand over with `yield Offload(...)` on a
+`ProcessPoolExecutor`, so CPU-bound work uses every core instead of
+stalling the single scheduler thread. The pool is started on first use,
+with the 'spawn' start method so workers do not inherit the kernel's
+threads and open handles.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _run_offloaded(func, args, kwargs):
+    """
+    Worker entry point: call the function and measure its CPU time.
+
+    Returns:
+        tuple: (ok, value, cpu_seconds); value is the exception if not ok.
+    """
+    start = time.process_time()
+    try:
+        value = func(*args, **kwargs)
+        ok = True
+    except Exception as e:
+        value = e
+        ok = False
+    return ok, value, time.process_time() - start
+
+
+class OffloadPool:
+    """
+    Lazily started pool of worker processes.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+        submitted (int): Calls submitted.
+        completed (int): Calls finished (successfully or not).
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        Initialize the pool. No worker is started until the first submit().
+
+        Args:
+            max_workers (int, optional): Worker processes; defaults to the
+                                         number of CPUs.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.submitted = 0
+        self.completed = 0
+        self._executor = None
+        self._pending = set()  # futures not yet finished, cancelled by shutdown()
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers=None):
+        """
+        Change the pool size; takes effect when the pool is next started.
+
+        Args:
+            max_workers (int, optional): Worker processes (0 or None: CPU count).
+        """
+        with self._lock:
+            self.max_workers = max_workers or os.cpu_count() or 1
+
+    def submit(self, request, callback):
+        """
+        Run an Offload request in a worker.
+
+        Args:
+            request (Offload): The call to run.
+            callback (callable): Called as callback(ok, value, cpu_seconds)
+                                 from a pool thread when the call finishes,
+                                 or immediately if it cannot be submitted.
+        """
+        try:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                future = self._executor.submit(_run_offloaded, request.func, request.args, request.kwargs)
+                self._pending.add(future)
+                self.submitted += 1
+        except Exception as e:
+            # Pool broken or shut down
+            callback(False, e, 0.0)
+            return
+
+        def done(f):
+            try:
+                ok, value, cpu = f.result()
+            except BaseException as e:
+                # Pickling failure, crashed worker or cancellation
+                ok, value, cpu = False, e, 0.0
+            with self._lock:
+                self._pending.discard(f)
+            self.completed += 1
+            callback(ok, value, cpu)
+
+        future.add_done_callback(done)
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker processes; pending calls are cancelled.
+
+        Args:
+            wait (bool, optional): Wait for running calls to finish.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pending, self._pending = self._pending, set()
+        # By hand rather than shutdown(cancel_futures=True), which needs Python 3.9
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self):
+        """
+        Report pool statistics.
+
+        Returns:
+            dict: 'workers', 'running', 'submitted' and 'completed'.
+        """
+        return {
+            "workers": self.max_workers,
+            "running": self._executor is not None,
+            "submitted": self.submitted,
+            "completed": self.completed,
+        }
@@ -4,13 +4,20 @@ Process Management.
 
 This module defines the `Process` class and `ProcessState` enum, which represent
 running programs in the system. Processes are implemented as Python generators
-to allow for cooperative multitasking.
+to allow for cooperative multitasking; under the asyncio scheduler
+(`loop.kernel.async_scheduler`) they may also be coroutines.
 """
 
+import inspect
+import threading
 import time
+import weakref
 from collections import deque
 from enum import Enum, auto
 
+# Largest PID handed out before the allocator wraps around.
+PID_MAX = 999999
+
 
 class ProcessState(Enum):
     """
@@ -23,52 +30,224 @@ class ProcessState(Enum):
     TERMINATED = auto()
 
 
+class Wait:
+    """
+    Yielded by a process to block until it is woken (see Scheduler.wake).
+
+    Attributes:
+        timeout (float or None): Seconds after which the process is woken
+                                 anyway; None waits indefinitely.
+    """
+
+    __slots__ = ("timeout",)
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+
+
+class Sleep(Wait):
+    """
+    Yielded by a process to sleep without blocking the scheduler.
+
+    Example:
+        while True:
+            do_work()
+            yield Sleep(3)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, seconds):
+        super().__init__(seconds)
+
+
+class Receive(Wait):
+    """
+    Yielded by a process to block until an IPC message arrives.
+
+    The message is the result of the `yield`; None if the timeout expires
+    first. A message already in the inbox is delivered without blocking.
+
+    Example:
+        msg = yield Receive(timeout=5)
+    """
+
+    __slots__ = ()
+
+
+class Offload:
+    """
+    Yielded by a process to run a CPU-bound function in a worker process.
+
+    The scheduler parks the process until the call finishes. The value
+    returned by the function is the result of the `yield`; an exception it
+    raises is raised at the `yield` instead. `func` and its arguments must
+    be picklable (e.g. a module-level function).
+
+    Example:
+        digest = yield Offload(hash_file_contents, data)
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+
+class PidAllocator:
+    """
+    Hands out process IDs that are unique among live processes.
+
+    PIDs come from a counter running 1..pid_max. Once the counter has wrapped,
+    PIDs are reused from a FIFO free list, so a freed PID is reused as late as
+    possible. Both allocate() and release() are O(1).
+
+    Attributes:
+        pid_max (int): Largest PID handed out.
+    """
+
+    def __init__(self, pid_max=PID_MAX):
+        """
+        Initialize the allocator.
+
+        Args:
+            pid_max (int, optional): Largest PID handed out.
+        """
+        self.pid_max = pid_max
+        self._lock = threading.Lock()
+        self._next = 1
+        self._free = deque()
+        self._live = 0
+
+    def allocate(self):
+        """
+        Allocate a PID.
+
+        Returns:
+            int: A PID not held by any live process.
+
+        Raises:
+            RuntimeError: If every PID is in use.
+        """
+        with self._lock:
+            if self._next <= self.pid_max:
+                pid = self._next
+                self._next += 1
+            elif self._free:
+                pid = self._free.popleft()
+            else:
+                raise RuntimeError(f"PID space exhausted ({self.pid_max} live processes)")
+            self._live += 1
+            return pid
+
+    def release(self, pid):
+        """
+        Return a PID to the allocator. Each allocated PID must be released once.
+
+        Args:
+            pid (int): The PID to release.
+        """
+        with self._lock:
+            self._free.append(pid)
+            self._live -= 1
+
+    def stats(self):
+        """
+        Report allocator statistics.
+
+        Returns:
+            dict: 'live', 'free', 'next' and 'pid_max'.
+        """
+        with self._lock:
+            return {
+                "live": self._live,
+                "free": len(self._free),
+                "next": self._next,
+                "pid_max": self.pid_max,
+            }
+
+
+PIDS = PidAllocator()
+
+
+def _release_pid(cell):
+    """Release the PID held in `cell` once; shared by reaping and GC."""
+    pid = cell[0]
+    if pid is not None:
+        cell[0] = None
+        PIDS.release(pid)
+
+
 class Process:
     """
     Represents a process in the OS.
 
     Attributes:
         name (str): The name of the process.
-        target (generator): The generator function representing the process execution.
+        target (generator or coroutine): The generator (or, under the asyncio
+                                         scheduler, coroutine) the process runs.
         state (ProcessState): The current state of the process.
         pid (int): The process ID.
         created_at (float): Timestamp when the process was created.
         uid (str): User ID of the process owner.
         args (list): Arguments passed to the process.
         env (dict): Environment variables for the process.
-        inbox (list): Queue for incoming IPC messages.
+        priority (int): Nice-style scheduling priority (lower runs first).
+        inbox (deque): Queue for incoming IPC messages.
+        inbox_limit (int or None): Most messages the inbox holds; None is unbounded.
         signal (str): Last received signal.
         exit_code (int): Exit code of the process.
         tokens_used (int): Simulated compute usage (AI tokens).
         context_window (list): Simulated RAM for AI agents.
-        cpu_time (float): Total wall clock time consumed by the process.
+        cpu_time (float): Total wall clock time consumed by the process, plus
+                          CPU time spent in workers on its behalf (Offload).
+        wake_at (float or None): time.monotonic() deadline while the process
+                                 is blocked on a Sleep/Wait with a timeout.
+        offload (Offload or None): Request yielded by the last step, waiting
+                                   to be handed to a worker by the scheduler.
+        receiving (bool): True while the process is blocked in a Receive.
+        awaiting (awaitable or None): Awaitable yielded by the last step,
+                                      waiting to be run by the asyncio scheduler.
     """
 
-    def __init__(self, name, target, uid="root", args=None, env=None):
+    def __init__(self, name, target, uid="root", args=None, env=None, priority=0, inbox_limit=None):
         """
         Initialize a new Process.
 
         Args:
             name (str): Name of the process.
-            target (generator): The generator object to run.
+            target (generator or coroutine): The generator or coroutine object to run.
             uid (str, optional): User ID. Defaults to "root".
             args (list, optional): Process arguments.
             env (dict, optional): Process environment variables.
+            priority (int, optional): Nice-style priority; lower runs first
+                                      under the 'priority' policy. Defaults to 0.
+            inbox_limit (int, optional): Bound on queued IPC messages; send()
+                                         fails once it is reached. Defaults to
+                                         unbounded.
         """
         self.name = name
         self.target = target # Generator
+        self._table = None   # ProcessTable holding this process, if any
         self.state = ProcessState.READY
 
-        # PID generation (Time based is fine for v0.1)
-        self.pid = int(time.time() * 1000) % 1000000
+        # PID stays allocated until the scheduler reaps the process or it is
+        # garbage collected, whichever comes first
+        self.pid = PIDS.allocate()
+        self._pid_cell = [self.pid]
+        weakref.finalize(self, _release_pid, self._pid_cell)
 
         self.created_at = time.time()
         self.uid = uid
         self.args = args or []
         self.env = env or {}
+        self.priority = priority
 
         # === IPC & Signals (From your code) ===
-        self.inbox = []
+        self.inbox = deque()
+        self.inbox_limit = inbox_limit
         self.signal = None
         self.exit_code = None
 
@@ -77,6 +256,50 @@ class Process:
         self.tokens_used = 0      # "Compute usage"
         self.context_window = []  # "RAM" for agents
         self.cpu_time = 0         # Wall clock time
+        self.wake_at = None
+        self.offload = None
+        self.receiving = False
+        self.awaiting = None
+        self._offloading = False  # an Offload is running in a worker
+        self._resume = None       # (ok, value) sent into the generator next step
+
+    @property
+    def state(self):
+        """ProcessState: The current state of the process."""
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        old = getattr(self, "_state", None)
+        self._state = value
+        if self._table is not None and old is not value:
+            self._table._restate(self, old, value)
+
+    def resume(self, ok, value, cpu_time=0.0):
+        """
+        Record the outcome of an Offload; it is delivered at the next step.
+
+        Args:
+            ok (bool): True if the function returned, False if it raised.
+            value (any): The return value or the exception.
+            cpu_time (float, optional): CPU seconds the worker spent, added
+                                        to `cpu_time`.
+        """
+        self.cpu_time += cpu_time
+        self._resume = (ok, value)
+
+    @property
+    def is_coroutine(self):
+        """bool: True if the target is a coroutine (driven by asyncio, not run_step)."""
+        return inspect.iscoroutine(self.target)
+
+    def release_pid(self):
+        """
+        Give this process's PID back to the allocator.
+
+        Called when the scheduler reaps the process; further calls do nothing.
+        """
+        _release_pid(self._pid_cell)
 
     def send(self, msg):
         """
@@ -84,8 +307,14 @@ class Process:
 
         Args:
             msg (any): The message to send.
+
+        Returns:
+            bool: True if queued, False if the inbox is full.
         """
+        if self.inbox_limit is not None and len(self.inbox) >= self.inbox_limit:
+            return False
         self.inbox.append(msg)
+        return True
 
     def receive(self):
         """
@@ -94,7 +323,10 @@ class Process:
         Returns:
             any: The message, or None if inbox is empty.
         """
-        return self.inbox.pop(0) if self.inbox else None
+        try:
+            return self.inbox.popleft()
+        except IndexError:
+            return None
 
     def deliver_signal(self, sig):
         """
@@ -116,21 +348,59 @@ class Process:
         Run a single execution step.
 
         Since processes are generators, this calls `next()` on the generator.
-        It manages state transitions (RUNNING -> READY or TERMINATED) and
-        catches exceptions.
+        It manages state transitions (RUNNING -> READY, WAITING or TERMINATED)
+        and catches exceptions. Yielding a `Wait`, `Sleep`, `Receive` (with an
+        empty inbox), `Offload` or an awaitable moves the process to WAITING.
         """
         if self.state == ProcessState.TERMINATED:
             return
+        if self.is_coroutine:
+            print(f"[process {self.pid}] Coroutine processes need the asyncio scheduler")
+            self.target.close()
+            self.state = ProcessState.TERMINATED
+            self.exit_code = 1
+            return
 
         start_time = time.time()
         self.state = ProcessState.RUNNING
 
         try:
+            if self.receiving:
+                # Woken from a Receive: deliver the message, None on timeout
+                self.receiving = False
+                self.wake_at = None
+                self._resume = (True, self.receive())
+
             # Execute until the process yields control
-            next(self.target)
+            resume = self._resume
+            if resume is not None:
+                # Deliver the outcome of an Offload at the yield that requested it
+                self._resume = None
+                ok, value = resume
+                request = self.target.send(value) if ok else self.target.throw(value)
+            else:
+                request = next(self.target)
 
             # If we get here, the process yielded successfully
-            if self.state == ProcessState.RUNNING:
+            if isinstance(request, Receive) and self.inbox:
+                # Message already queued: deliver it next step without parking
+                self._resume = (True, self.receive())
+                self.state = ProcessState.READY
+            elif isinstance(request, Wait):
+                # Blocking request: the scheduler parks us until woken
+                if request.timeout is not None:
+                    self.wake_at = time.monotonic() + request.timeout
+                # Set before WAITING so a concurrent send() sees it (see Scheduler._park)
+                self.receiving = isinstance(request, Receive)
+                self.state = ProcessState.WAITING
+            elif isinstance(request, Offload):
+                self.offload = request
+                self.state = ProcessState.WAITING
+            elif inspect.isawaitable(request):
+                # Its result is delivered at this yield, like an Offload
+                self.awaiting = request
+                self.state = ProcessState.WAITING
+            elif self.state == ProcessState.RUNNING:
                 self.state = ProcessState.READY
 
         except StopIteration:
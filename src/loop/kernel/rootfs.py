@@ -3,10 +3,12 @@
 Virtual Root Filesystem.
 """
 
+import errno
 import os
+import stat
+import threading
 import platformdirs
 from pathlib import Path
-from functools import lru_cache
 
 # XDG Base Directory Specification
 # Data: ~/.local/share/loop
@@ -14,9 +16,35 @@ from functools import lru_cache
 LOOP_ROOT = Path(platformdirs.user_data_dir("loop", "loop-os"))
 LOOP_CONFIG_DIR = Path(platformdirs.user_config_dir("loop", "loop-os"))
 
+# Persistent image of the in-memory FileSystem (see kernel/fsimage.py)
+VFS_IMAGE = LOOP_ROOT / "var" / "vfs.img"
+
+# Kernel journal written by sys_log (see kernel/journal.py)
+KERNEL_LOG = LOOP_ROOT / "var" / "logs" / "kernel.log"
+
 # Cache the resolved root path to avoid repeated syscalls
 _RESOLVED_ROOT = None
 
+# Upper bound on cached directory prefixes before the cache is flushed.
+PREFIX_CACHE_MAX_ENTRIES = 4096
+
+# Maximum number of symlinks followed while resolving a single path.
+MAX_SYMLINKS = 40
+
+# Component-wise resolution needs openat()-style calls (POSIX only).
+_DIR_FD_SUPPORTED = os.open in os.supports_dir_fd and os.stat in os.supports_dir_fd
+_O_DIR = getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+_O_DIR |= getattr(os, "O_PATH", os.O_RDONLY)
+
+# Prefix cache: virtual directory ("home/notes") -> (host path, st_dev, st_ino).
+# Only symlink-free prefixes are cached; the (dev, ino) pair is re-checked
+# with fstat() on every hit, so a directory swapped behind our back is a miss.
+_prefix_cache = {}
+_cache_lock = threading.Lock()
+_root_fd = None
+_root_fd_path = None
+_stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0}
+
 
 class SecurityError(Exception):
     """Raised when a path traversal attempt is detected."""
@@ -56,22 +84,20 @@ def get_resolved_root() -> Path:
     return _RESOLVED_ROOT
 
 
-@lru_cache(maxsize=1024)
 def resolve(virtual_path: str) -> Path:
     """
     Resolves a virtual path to a safe absolute path within LOOP_ROOT.
 
-    PERFORMANCE: This function is cached to avoid repeated disk hits (stat/readlink)
-    for path resolution.
+    PERFORMANCE: Resolved directory prefixes are cached, so a lookup opens
+    the deepest cached ancestor and only walks the remaining components.
 
     SECURITY NOTE:
-    Caching 'resolve' implies we assume the symlink topology of the resolved path
-    does not change frequently. In a single-agent environment where the agent
-    cannot create symlinks (no sys_symlink), this is generally safe.
-    However, if an external process modifies symlinks inside ~/.loop while
-    the agent is running, this cache might return a path that was safe
-    but is now unsafe (TOCTOU). Given the threat model (Agent inside sandbox),
-    this optimization is acceptable.
+    The remaining components are walked one at a time relative to a held
+    directory fd (openat with O_NOFOLLOW). Symlinks are read and expanded
+    explicitly, and every step is checked against LOOP_ROOT, so a symlink
+    swapped in while we resolve cannot redirect us outside the root.
+    Cached prefixes are verified by (st_dev, st_ino) before use. The
+    syscall layer calls `invalidate()` after deleting paths.
 
     Args:
         virtual_path (str): The virtual path (e.g., "/home/notes.txt").
@@ -79,6 +105,114 @@ def resolve(virtual_path: str) -> Path:
     Returns:
         Path: The absolute path on the host system.
 
+    Raises:
+        SecurityError: If the resolved path is outside LOOP_ROOT.
+        OSError: If too many symlinks are encountered (ELOOP).
+    """
+    root_abs = get_resolved_root()
+    if not _DIR_FD_SUPPORTED:
+        return _resolve_fallback(virtual_path, root_abs)
+
+    components = [p for p in virtual_path.split("/") if p]
+    with _cache_lock:
+        root_fd = _get_root_fd(root_abs)
+        fd, parts, rest = _open_cached_prefix(components)
+    if fd is None:
+        fd = os.dup(root_fd)
+
+    parts, fd = _walk(fd, parts, rest, virtual_path)
+    if fd is not None:
+        os.close(fd)
+    return root_abs.joinpath(*parts)
+
+
+def resolve_many(virtual_paths):
+    """
+    Resolve a batch of virtual paths, sharing work between them.
+
+    Each distinct parent directory is walked once per batch and its fd is
+    reused for every entry below it, so listing or reading the children
+    of one directory costs one stat per child instead of a full walk.
+
+    Args:
+        virtual_paths (list[str]): The virtual paths to resolve.
+
+    Returns:
+        list: One entry per input, in order: the resolved Path, or the
+              exception (SecurityError or OSError) raised for that path.
+    """
+    root_abs = get_resolved_root()
+    if not _DIR_FD_SUPPORTED:
+        return [_capture(_resolve_fallback, p, root_abs) for p in virtual_paths]
+
+    parents = {}  # parent key -> (parts, fd) or exception
+    results = []
+    try:
+        for virtual_path in virtual_paths:
+            components = [p for p in virtual_path.split("/") if p]
+            if not components or components[-1] in (".", ".."):
+                results.append(_capture(resolve, virtual_path))
+                continue
+
+            key = "/".join(components[:-1])
+            parent = parents.get(key)
+            if parent is None:
+                parent = _capture(_open_dir, components[:-1], virtual_path, root_abs)
+                parents[key] = parent
+            if isinstance(parent, Exception):
+                results.append(parent)
+                continue
+
+            parts, fd = parent
+            try:
+                child_fd = os.dup(fd) if fd is not None else None
+                child_parts, child_fd = _walk(child_fd, list(parts), components[-1:], virtual_path)
+                if child_fd is not None:
+                    os.close(child_fd)
+                results.append(root_abs.joinpath(*child_parts))
+            except (SecurityError, OSError) as e:
+                results.append(e)
+    finally:
+        for parent in parents.values():
+            if isinstance(parent, tuple) and parent[1] is not None:
+                os.close(parent[1])
+    return results
+
+
+def _open_dir(components, virtual_path, root_abs):
+    """
+    Walk `components` and keep the final directory open.
+
+    Returns:
+        tuple: (resolved parts, fd or None if the walk became lexical).
+    """
+    with _cache_lock:
+        root_fd = _get_root_fd(root_abs)
+        fd, parts, rest = _open_cached_prefix(components)
+    if fd is None:
+        fd = os.dup(root_fd)
+    return _walk(fd, parts, rest, virtual_path)
+
+
+def _capture(func, *args):
+    """Call `func`, returning a SecurityError/OSError instead of raising it."""
+    try:
+        return func(*args)
+    except (SecurityError, OSError) as e:
+        return e
+
+
+def _resolve_fallback(virtual_path, root_abs):
+    """
+    Resolve via Path.resolve() on platforms without dir_fd support.
+
+    Args:
+        virtual_path (str): The virtual path.
+        root_abs (Path): The resolved LOOP_ROOT.
+
+    Returns:
+        Path: The absolute path on the host system.
+
     Raises:
         SecurityError: If the resolved path is outside LOOP_ROOT.
     """
@@ -86,10 +220,6 @@ def resolve(virtual_path: str) -> Path:
     # If path starts with /, strictly speaking path.join with absolute path ignores previous part.
     # So we must strip leading /
     clean_path = virtual_path.lstrip("/")
-
-    # Resolve absolute path
-    # We use get_resolved_root() as base to ensure we are working with the resolved path
-    root_abs = get_resolved_root()
     target_path = (root_abs / clean_path).resolve()
 
     # Security Check: Ensure containment
@@ -102,3 +232,223 @@ def resolve(virtual_path: str) -> Path:
         raise SecurityError(f"Path traversal detected (drive mismatch): {virtual_path}")
 
     return target_path
+
+
+def _get_root_fd(root_abs):
+    """
+    Return the held directory fd for LOOP_ROOT, (re)opening it if needed.
+
+    Caller must hold `_cache_lock`.
+    """
+    global _root_fd, _root_fd_path
+    if _root_fd is None or _root_fd_path != root_abs:
+        if _root_fd is not None:
+            os.close(_root_fd)
+            _prefix_cache.clear()
+        _root_fd = os.open(root_abs, _O_DIR)
+        _root_fd_path = root_abs
+    return _root_fd
+
+
+def _open_cached_prefix(components):
+    """
+    Open the deepest cached, still valid directory prefix of `components`.
+
+    Caller must hold `_cache_lock`.
+
+    Args:
+        components (list[str]): The virtual path split on "/".
+
+    Returns:
+        tuple: (fd or None, resolved parts of the prefix, remaining components).
+    """
+    # Only leading plain names can be served from the cache
+    plain = 0
+    for name in components:
+        if name in (".", ".."):
+            break
+        plain += 1
+
+    for i in range(plain, 0, -1):
+        key = "/".join(components[:i])
+        entry = _prefix_cache.get(key)
+        if entry is None:
+            continue
+        host, dev, ino = entry
+        try:
+            fd = os.open(host, _O_DIR)
+        except OSError:
+            fd = None
+        if fd is not None:
+            st = os.fstat(fd)
+            if st.st_dev == dev and st.st_ino == ino:
+                _stats["hits"] += 1
+                return fd, list(components[:i]), components[i:]
+            os.close(fd)
+        # Directory was removed or replaced: drop it and everything below
+        _stats["stale"] += 1
+        _drop_prefix(key)
+
+    _stats["misses"] += 1
+    return None, [], components
+
+
+def _walk(fd, parts, rest, virtual_path):
+    """
+    Walk `rest` component by component starting at directory `fd`.
+
+    Takes ownership of `fd`. Symlinks are expanded by hand; a missing
+    component ends the fd walk and the tail is joined lexically, matching
+    Path.resolve(strict=False).
+
+    Args:
+        fd (int): Open directory fd corresponding to `parts`.
+        parts (list[str]): Resolved components (relative to LOOP_ROOT).
+        rest (list[str]): Components still to resolve.
+        virtual_path (str): The original path (for error messages).
+
+    Returns:
+        tuple: (resolved components relative to LOOP_ROOT, fd of the final
+               directory or None if it is a file or missing). The caller
+               closes the returned fd.
+
+    Raises:
+        SecurityError: If resolution escapes LOOP_ROOT.
+        OSError: If too many symlinks are encountered (ELOOP).
+    """
+    pending = list(reversed(rest))
+    # Stays True while parts maps 1:1 onto the virtual path (cacheable)
+    plain = True
+    links = 0
+    try:
+        while pending:
+            name = pending.pop()
+            if name == "." or not name:
+                continue
+            if name == "..":
+                if not parts:
+                    raise SecurityError(f"Path traversal detected: {virtual_path}")
+                parts.pop()
+                plain = False
+                new_fd = os.open("..", _O_DIR, dir_fd=fd) if fd is not None else None
+                if fd is not None:
+                    os.close(fd)
+                fd = new_fd
+                continue
+            if fd is None:
+                # Below a missing component or a file: purely lexical
+                parts.append(name)
+                continue
+
+            try:
+                st = os.stat(name, dir_fd=fd, follow_symlinks=False)
+            except (FileNotFoundError, NotADirectoryError):
+                st = None
+
+            if st is None or not (stat.S_ISDIR(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+                # Missing entry or a regular file: the rest is lexical
+                parts.append(name)
+                os.close(fd)
+                fd = None
+                continue
+
+            if stat.S_ISLNK(st.st_mode):
+                links += 1
+                if links > MAX_SYMLINKS:
+                    raise OSError(errno.ELOOP, "Too many levels of symbolic links", virtual_path)
+                target = os.readlink(name, dir_fd=fd)
+                plain = False
+                if os.path.isabs(target):
+                    parts = _relative_to_root(target, virtual_path)
+                    os.close(fd)
+                    fd = os.dup(_root_fd)
+                    # Re-walk the absolute target from the root
+                    pending.extend(reversed([p for p in parts if p]))
+                    parts = []
+                else:
+                    pending.extend(reversed(target.split("/")))
+                continue
+
+            new_fd = os.open(name, _O_DIR, dir_fd=fd)
+            os.close(fd)
+            fd = new_fd
+            parts.append(name)
+            if plain:
+                # Re-check the entry we actually opened before caching it
+                st = os.fstat(fd)
+                _cache_prefix(parts, st)
+        return parts, fd
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        raise
+
+
+def _relative_to_root(target, virtual_path):
+    """
+    Split an absolute symlink target into components below LOOP_ROOT.
+
+    Raises:
+        SecurityError: If the target is not inside LOOP_ROOT.
+    """
+    root = str(_root_fd_path)
+    target = os.path.normpath(target)
+    if target != root and not target.startswith(root.rstrip(os.sep) + os.sep):
+        raise SecurityError(f"Path traversal detected: {virtual_path} -> {target}")
+    return target[len(root):].split(os.sep)
+
+
+def _cache_prefix(parts, st):
+    """Record a symlink-free directory prefix in the cache."""
+    key = "/".join(parts)
+    with _cache_lock:
+        if len(_prefix_cache) >= PREFIX_CACHE_MAX_ENTRIES:
+            _prefix_cache.clear()
+        _prefix_cache[key] = (os.path.join(str(_root_fd_path), *parts), st.st_dev, st.st_ino)
+
+
+def _drop_prefix(key):
+    """
+    Remove a cached prefix and every cached prefix below it.
+
+    Caller must hold `_cache_lock`.
+    """
+    if not key:
+        _prefix_cache.clear()
+        return
+    below = key + "/"
+    for k in [k for k in _prefix_cache if k == key or k.startswith(below)]:
+        del _prefix_cache[k]
+
+
+def invalidate(virtual_path=None):
+    """
+    Drop cached resolutions for a virtual path and everything below it.
+
+    Called by the syscall layer after operations that remove or replace
+    directories. With no argument the whole cache is cleared.
+
+    Args:
+        virtual_path (str, optional): The virtual path that changed.
+    """
+    key = "" if virtual_path is None else "/".join(p for p in virtual_path.split("/") if p)
+    with _cache_lock:
+        _stats["invalidations"] += 1
+        _drop_prefix(key)
+
+
+def resolve_cache_stats():
+    """
+    Report prefix cache statistics for `resolve()`.
+
+    Returns:
+        dict: 'hits', 'misses', 'stale', 'invalidations', 'entries' and
+              'hit_rate' (0.0 - 1.0).
+    """
+    with _cache_lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries": len(_prefix_cache),
+            "hit_rate": _stats["hits"] / total if total else 0.0,
+        }
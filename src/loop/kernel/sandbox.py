@@ -10,6 +10,7 @@ process isolation, ensuring the agent cannot break out of its designated workspa
 import sys
 import os
 from pathlib import Path
+from loop.kernel import syscall_table
 from loop.kernel.confirmation import ConfirmationManager
 
 # Add core path to sys.path
@@ -114,10 +115,42 @@ class AgentSandbox:
 
         return str(target)
 
+    def resolve_many(self, paths):
+        """
+        Resolve a batch of paths safely within the sandbox.
+
+        With the C++ core the whole batch is resolved in a single call.
+
+        Args:
+            paths (list[str]): The relative paths to resolve.
+
+        Returns:
+            list: One entry per input, in order: the absolute host path (str),
+                  or a PermissionError if that path escapes the sandbox.
+        """
+        if self.core and hasattr(self.core, "resolve_many"):
+            try:
+                pairs = self.core.resolve_many(list(paths))
+            except Exception as e:
+                return [PermissionError(f"Sandbox Violation: {e}") for _ in paths]
+            return [value if ok else PermissionError(f"Sandbox Violation: {value}")
+                    for ok, value in pairs]
+
+        results = []
+        for path in paths:
+            try:
+                results.append(self._resolve(path))
+            except PermissionError as e:
+                results.append(e)
+        return results
+
     def execute(self, action, args):
         """
         Execute a sandboxed action.
 
+        Actions are looked up in `ACTIONS`; the ones backed by a syscall go
+        through the syscall table (`loop.kernel.syscall_table.dispatch`).
+
         Args:
             action (str): The action name (e.g., 'read_file', 'run_process').
             args (list): List of arguments for the action.
@@ -125,128 +158,201 @@ class AgentSandbox:
         Returns:
             str or dict: The result of the action or an error message.
         """
+        if action == "batch":
+            return self._batch(args)
+
         # Security Confirmation
         if not self.confirmation.request_approval(action, args):
             return "Action Denied by User"
 
-        if action == "read_file":
-            path = args[0]
-            try:
-                real_path = self._resolve(path)
-                # Pass resolved=False to trust the sandbox-validated absolute path
-                return self.sys.sys_read(real_path, resolve=False)
-            except Exception as e:
-                return f"Error: {e}"
+        handler = self.ACTIONS.get(action)
+        if handler is None:
+            return f"Unknown or disallowed action: {action}"
+        return handler(self, args)
 
-        elif action == "write_file":
-            path = args[0]
-            content = args[1]
-            try:
-                real_path = self._resolve(path)
-                self.sys.sys_write(real_path, content, resolve=False)
-                return f"Successfully wrote to {path}"
-            except Exception as e:
-                return f"Error: {e}"
+    def _syscall(self, name, args=(), kwargs=None):
+        """Invoke a syscall on the kernel through the syscall table."""
+        return syscall_table.dispatch(self.sys, name, args, kwargs)
 
-        elif action == "append_file":
-            path = args[0]
-            content = args[1]
-            try:
-                real_path = self._resolve(path)
-                self.sys.sys_append(real_path, content, resolve=False)
-                return f"Successfully appended to {path}"
-            except Exception as e:
-                return f"Error: {e}"
+    def _read_file(self, args):
+        """read_file <path> [offset] [length]: read a file (or byte range) inside the sandbox."""
+        path = args[0]
+        try:
+            real_path = self._resolve(path)
+            # Pass resolved=False to trust the sandbox-validated absolute path
+            if len(args) > 1:
+                offset = int(args[1])
+                length = int(args[2]) if len(args) > 2 and args[2] is not None else None
+                return self._syscall("sys_read", [real_path],
+                                     {"resolve": False, "offset": offset, "length": length})
+            return self._syscall("sys_read", [real_path], {"resolve": False})
+        except Exception as e:
+            return f"Error: {e}"
+
+    def _write_file(self, args):
+        """write_file <path> <content>: overwrite a file inside the sandbox."""
+        path = args[0]
+        content = args[1]
+        try:
+            real_path = self._resolve(path)
+            self._syscall("sys_write", [real_path, content], {"resolve": False})
+            return f"Successfully wrote to {path}"
+        except Exception as e:
+            return f"Error: {e}"
+
+    def _append_file(self, args):
+        """append_file <path> <content>: append to a file inside the sandbox."""
+        path = args[0]
+        content = args[1]
+        try:
+            real_path = self._resolve(path)
+            self._syscall("sys_append", [real_path, content], {"resolve": False})
+            return f"Successfully appended to {path}"
+        except Exception as e:
+            return f"Error: {e}"
+
+    def _list_dir(self, args):
+        """list_dir [path]: list a directory inside the sandbox."""
+        path = args[0] if args else "/"
+        try:
+            real_path = self._resolve(path)
+            files = self._syscall("sys_ls", [real_path], {"resolve": False})
+            return "\n".join(files)
+        except Exception as e:
+            return f"Error: {e}"
 
-        elif action == "list_dir":
-            path = args[0] if args else "/"
-            try:
-                real_path = self._resolve(path)
-                files = self.sys.sys_ls(real_path, resolve=False)
-                return "\n".join(files)
-            except Exception as e:
-                return f"Error: {e}"
-
-        elif action == "run_process":
-            # Whitelisted apps for Agent
-            allowed_apps = ["browser", "calc", "explorer", "system", "user"]
-
-            prog = args[0]
-            prog_args = args[1:] if len(args) > 1 else []
-
-            if prog in allowed_apps:
-                try:
-                    # Built-in apps run in Python
-                    from importlib import import_module
-                    mod = import_module(f"loop.bin.{prog}")
-                    if hasattr(mod, "main"):
-                        return mod.main(prog_args, self.sys)
-                    else:
-                        return f"Error: {prog} has no main()"
-                except ImportError:
-                    # Not a built-in, maybe a real binary?
-                    # Try executing via C++ Sandbox
-                    if self.core:
-                         try:
-                             # We use empty env for strict isolation
-                             # But we might need PATH?
-                             # Let's map PATH to a safe bin dir if we had one.
-                             res = self.core.execute(prog, prog_args, {})
-                             # Return structured output if possible, or just stdout
-                             if res["return_code"] == 0:
-                                 return res["stdout"]
-                             else:
-                                 return f"Error (RC {res['return_code']}): {res['stderr']}"
-                         except Exception as e:
-                             return f"Execution Error: {e}"
-                    return f"Error: App {prog} not found."
-                except Exception as e:
-                    return f"Error running {prog}: {e}"
-            else:
-                return f"Permission Denied: Agent cannot run '{prog}'. Allowed: {allowed_apps}"
+    def _run_process(self, args):
+        """run_process <prog> [args]: run a whitelisted app."""
+        # Whitelisted apps for Agent
+        allowed_apps = ["browser", "calc", "explorer", "system", "user"]
 
-        elif action == "read_screen":
+        prog = args[0]
+        prog_args = args[1:] if len(args) > 1 else []
+
+        if prog in allowed_apps:
             try:
-                # Maps to sys_ui_scan
-                return self.sys.sys_ui_scan()
+                # Built-in apps run in Python
+                from importlib import import_module
+                mod = import_module(f"loop.bin.{prog}")
+                if hasattr(mod, "main"):
+                    return mod.main(prog_args, self.sys)
+                else:
+                    return f"Error: {prog} has no main()"
+            except ImportError:
+                # Not a built-in, maybe a real binary?
+                # Try executing via C++ Sandbox
+                if self.core:
+                     try:
+                         # We use empty env for strict isolation
+                         # But we might need PATH?
+                         # Let's map PATH to a safe bin dir if we had one.
+                         res = self.core.execute(prog, prog_args, {})
+                         # Return structured output if possible, or just stdout
+                         if res["return_code"] == 0:
+                             return res["stdout"]
+                         else:
+                             return f"Error (RC {res['return_code']}): {res['stderr']}"
+                     except Exception as e:
+                         return f"Execution Error: {e}"
+                return f"Error: App {prog} not found."
             except Exception as e:
-                return f"Error scanning screen: {e}"
+                return f"Error running {prog}: {e}"
+        else:
+            return f"Permission Denied: Agent cannot run '{prog}'. Allowed: {allowed_apps}"
+
+    def _read_screen(self, args):
+        """read_screen: scan the active window."""
+        try:
+            # Maps to sys_ui_scan
+            return self._syscall("sys_ui_scan")
+        except Exception as e:
+            return f"Error scanning screen: {e}"
+
+    def _interact(self, args):
+        """interact <uid> <action> [payload]: act on a UI element."""
+        # Maps to sys_ui_act
+        # args: [uid, action, payload=None]
+        if len(args) < 2:
+            return "Error: interact requires uid and action type (e.g., 'click')"
+
+        uid = args[0]
+        act_type = args[1]
+        payload = args[2] if len(args) > 2 else None
 
-        elif action == "interact":
-            # Maps to sys_ui_act
-            # args: [uid, action, payload=None]
-            if len(args) < 2:
-                return "Error: interact requires uid and action type (e.g., 'click')"
+        try:
+            return self._syscall("sys_ui_act", [uid, act_type, payload])
+        except Exception as e:
+            return f"Error interacting: {e}"
 
-            uid = args[0]
-            act_type = args[1]
-            payload = args[2] if len(args) > 2 else None
+    def _run_nasm(self, args):
+        """run_nasm <source> [name]: compile and run NASM code in the core."""
+        # args[0] = source code
+        # args[1] = optional output name (default: "nasm_prog")
+        source = args[0]
+        name = args[1] if len(args) > 1 else "nasm_prog"
 
+        if self.core:
             try:
-                return self.sys.sys_ui_act(uid, act_type, payload)
-            except Exception as e:
-                return f"Error interacting: {e}"
-
-        elif action == "run_nasm":
-            # args[0] = source code
-            # args[1] = optional output name (default: "nasm_prog")
-            source = args[0]
-            name = args[1] if len(args) > 1 else "nasm_prog"
-
-            if self.core:
-                try:
-                    result = self.core.compile_and_run_nasm(source, name)
-                    return result # Dict with stdout, stderr, return_code
-                except Exception as e:
-                    return {"error": str(e)}
-            return {"error": "Sandbox Core not available"}
-
-        elif action == "launch_app":
-            app_name = args[0]
-            try:
-                # Map to sys_app_launch
-                return self.sys.sys_app_launch(app_name)
+                result = self.core.compile_and_run_nasm(source, name)
+                return result # Dict with stdout, stderr, return_code
             except Exception as e:
-                return f"Error launching app: {e}"
+                return {"error": str(e)}
+        return {"error": "Sandbox Core not available"}
+
+    def _launch_app(self, args):
+        """launch_app <name>: launch a host application."""
+        app_name = args[0]
+        try:
+            # Map to sys_app_launch
+            return self._syscall("sys_app_launch", [app_name])
+        except Exception as e:
+            return f"Error launching app: {e}"
+
+    def _batch(self, entries):
+        """
+        batch <entries>: run several actions with a single approval.
+
+        Each entry is {"name": action, "args": [...]} or [action, arg1, ...].
+        The batch is approved once at the risk of its riskiest action.
+        Consecutive read-only actions run concurrently.
+
+        Returns:
+            list[dict]: One {'action', 'result'} dict per entry, in order.
+        """
+        parsed = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                parsed.append((entry.get("name"), list(entry.get("args", []))))
+            else:
+                parsed.append((entry[0], list(entry[1:])))
+
+        unknown = [name for name, _ in parsed if name not in self.ACTIONS]
+        if unknown:
+            return f"Unknown or disallowed action in batch: {', '.join(map(str, unknown))}"
+
+        risk = self.confirmation.assess_batch_risk([name for name, _ in parsed])
+        if not self.confirmation.request_approval("batch", entries, risk=risk):
+            return "Action Denied by User"
 
-        return f"Unknown or disallowed action: {action}"
+        calls = [(lambda n=name, a=args: self.ACTIONS[n](self, a), name in self.READ_ONLY_ACTIONS)
+                 for name, args in parsed]
+        results = []
+        for (name, _), (ok, value) in zip(parsed, syscall_table.run_batch(calls)):
+            results.append({"action": name, "result": value if ok else f"Error: {value}"})
+        return results
+
+    # Actions that change no state and may run concurrently inside a batch
+    READ_ONLY_ACTIONS = frozenset({"read_file", "list_dir"})
+
+    # Action name -> handler; one dict lookup per action
+    ACTIONS = {
+        "read_file": _read_file,
+        "write_file": _write_file,
+        "append_file": _append_file,
+        "list_dir": _list_dir,
+        "run_process": _run_process,
+        "read_screen": _read_screen,
+        "interact": _interact,
+        "run_nasm": _run_nasm,
+        "launch_app": _launch_app,
+    }
@@ -0,0 +1,388 @@
+# kernel/sched_policy.py
+"""
+Scheduling Policies.
+
+A policy owns the scheduler's run queue: the scheduler pushes runnable
+processes, pops the next one to step, and reports how long each step took
+(`charge`), which is the same wall time `Process.run_step` adds to
+`cpu_time`. Policies are only touched from the scheduler thread.
+
+Policies:
+    round_robin  Every runnable process in turn (the default).
+    priority     Lowest `Process.priority` first (nice-style, -20..19);
+                 round-robin within a priority. Lower priorities can starve.
+    fair_share   CPU time split between UIDs in proportion to their weight;
+                 round-robin within a UID.
+    mlfq         Multi-level feedback queue: processes start at the top
+                 level and are demoted once they use up the level's CPU
+                 allotment, so short interactive steps win over CPU-heavy
+                 generators. Everything is boosted back to the top level
+                 periodically.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+
+# FairSharePolicy._current when no UID is between pop() and charge()
+_NONE = object()
+
+
+class SchedulingPolicy:
+    """
+    Base class for run-queue policies.
+
+    Attributes:
+        name (str): Name used in configuration.
+    """
+
+    name = None
+
+    def push(self, proc):
+        """Add a runnable process."""
+        raise NotImplementedError
+
+    def pop(self):
+        """
+        Remove and return the next process to run.
+
+        Returns:
+            Process or None: The process, or None if the queue is empty.
+        """
+        raise NotImplementedError
+
+    def charge(self, proc, elapsed):
+        """
+        Account for a step a process just ran.
+
+        Args:
+            proc (Process): The process.
+            elapsed (float): Seconds the step took.
+        """
+        pass
+
+    def forget(self, proc):
+        """Drop any state kept for a process that has exited."""
+        pass
+
+    def drain(self):
+        """
+        Remove and return every queued process, in pop order.
+
+        Returns:
+            list[Process]: The queued processes.
+        """
+        out = []
+        proc = self.pop()
+        while proc is not None:
+            out.append(proc)
+            proc = self.pop()
+        return out
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def __contains__(self, proc):
+        # O(n); the scheduler tracks membership itself
+        return any(p is proc for p in self)
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """Run every runnable process in turn."""
+
+    name = "round_robin"
+
+    def __init__(self):
+        self._queue = deque()
+
+    def push(self, proc):
+        self._queue.append(proc)
+
+    def pop(self):
+        return self._queue.popleft() if self._queue else None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """
+    Strict priority: always run a process from the best (lowest) priority.
+
+    One FIFO per priority value plus a heap of the non-empty ones, so push
+    and pop are O(log L) for L distinct priorities in use.
+    """
+
+    name = "priority"
+
+    def __init__(self):
+        self._levels = {}    # priority -> deque
+        self._active = []    # heap of priorities whose deque is non-empty
+        self._len = 0
+
+    def push(self, proc):
+        prio = getattr(proc, "priority", 0)
+        q = self._levels.get(prio)
+        if q is None:
+            q = self._levels[prio] = deque()
+        if not q:
+            heapq.heappush(self._active, prio)
+        q.append(proc)
+        self._len += 1
+
+    def pop(self):
+        if not self._active:
+            return None
+        q = self._levels[self._active[0]]
+        proc = q.popleft()
+        if not q:
+            heapq.heappop(self._active)
+        self._len -= 1
+        return proc
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for prio in sorted(self._levels):
+            yield from self._levels[prio]
+
+
+class FairSharePolicy(SchedulingPolicy):
+    """
+    Weighted fair share between UIDs.
+
+    Each UID accumulates virtual runtime (CPU time divided by its weight);
+    the UID with the least virtual runtime runs next. A UID that becomes
+    runnable again starts no lower than the current minimum, so sleeping
+    does not bank credit.
+
+    Attributes:
+        weights (dict): UID -> weight; UIDs not listed weigh 1.
+    """
+
+    name = "fair_share"
+
+    def __init__(self, weights=None):
+        """
+        Initialize the policy.
+
+        Args:
+            weights (dict, optional): UID -> weight.
+
+        Raises:
+            ValueError: If a weight is not positive.
+        """
+        self.weights = dict(weights or {})
+        for uid, weight in self.weights.items():
+            if not weight > 0:
+                raise ValueError(f"Fair-share weight for {uid!r} must be positive, got {weight}")
+        self._queues = {}     # uid -> deque
+        self._vruntime = {}   # uid -> virtual runtime (seconds)
+        self._heap = []       # (vruntime, seq, uid) for scheduled UIDs
+        self._scheduled = set()
+        self._seq = itertools.count()
+        self._current = _NONE  # UID popped last; rescheduled after its charge
+        self._min_vruntime = 0.0
+        self._len = 0
+
+    def _schedule(self, uid):
+        vr = max(self._vruntime.get(uid, 0.0), self._min_vruntime)
+        self._vruntime[uid] = vr
+        heapq.heappush(self._heap, (vr, next(self._seq), uid))
+        self._scheduled.add(uid)
+
+    def push(self, proc):
+        uid = getattr(proc, "uid", None)
+        q = self._queues.get(uid)
+        if q is None:
+            q = self._queues[uid] = deque()
+        q.append(proc)
+        self._len += 1
+        if uid not in self._scheduled and uid != self._current:
+            self._schedule(uid)
+
+    def pop(self):
+        if self._current is not _NONE:
+            uid, self._current = self._current, _NONE
+            if self._queues.get(uid) and uid not in self._scheduled:
+                self._schedule(uid)
+        while self._heap:
+            vr, _, uid = heapq.heappop(self._heap)
+            self._scheduled.discard(uid)
+            q = self._queues.get(uid)
+            if q:
+                self._min_vruntime = vr
+                self._current = uid
+                self._len -= 1
+                return q.popleft()
+        return None
+
+    def charge(self, proc, elapsed):
+        uid = getattr(proc, "uid", None)
+        self._vruntime[uid] = self._vruntime.get(uid, 0.0) + elapsed / self.weights.get(uid, 1.0)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for q in self._queues.values():
+            yield from q
+
+
+class MLFQPolicy(SchedulingPolicy):
+    """
+    Multi-level feedback queue.
+
+    Level i allows `quantum * 2**i` seconds of CPU before the process is
+    demoted to level i + 1. Every `boost_interval` seconds all processes
+    return to level 0.
+
+    Attributes:
+        levels (int): Number of queues.
+        quantum (float): CPU allotment (seconds) at the top level.
+        boost_interval (float): Seconds between priority boosts.
+    """
+
+    name = "mlfq"
+
+    def __init__(self, levels=3, quantum=0.001, boost_interval=5.0):
+        """
+        Initialize the policy.
+
+        Args:
+            levels (int, optional): Number of queues.
+            quantum (float, optional): Top-level CPU allotment in seconds.
+            boost_interval (float, optional): Seconds between boosts.
+
+        Raises:
+            ValueError: If levels is below 1 or quantum is not positive.
+        """
+        if levels < 1:
+            raise ValueError(f"MLFQ needs at least one level, got {levels}")
+        if not quantum > 0:
+            raise ValueError(f"MLFQ quantum must be positive, got {quantum}")
+        self.levels = levels
+        self.quantum = quantum
+        self.boost_interval = boost_interval
+        self._queues = [deque() for _ in range(levels)]
+        self._level = {}   # proc -> level
+        self._used = {}    # proc -> CPU used at the current level
+        self._last_boost = time.monotonic()
+        self._len = 0
+
+    def level_of(self, proc):
+        """Return the queue level of a process (0 is the top)."""
+        return self._level.get(proc, 0)
+
+    def push(self, proc):
+        self._queues[self._level.get(proc, 0)].append(proc)
+        self._len += 1
+
+    def pop(self):
+        if self.boost_interval and time.monotonic() - self._last_boost >= self.boost_interval:
+            self._boost()
+        for q in self._queues:
+            if q:
+                self._len -= 1
+                return q.popleft()
+        return None
+
+    def charge(self, proc, elapsed):
+        level = self._level.get(proc, 0)
+        used = self._used.get(proc, 0.0) + elapsed
+        if level < self.levels - 1 and used >= self.quantum * (2 ** level):
+            self._level[proc] = level + 1
+            used = 0.0
+        self._used[proc] = used
+
+    def forget(self, proc):
+        self._level.pop(proc, None)
+        self._used.pop(proc, None)
+
+    def _boost(self):
+        """Move every process back to the top level."""
+        top = self._queues[0]
+        for q in self._queues[1:]:
+            top.extend(q)
+            q.clear()
+        self._level.clear()
+        self._used.clear()
+        self._last_boost = time.monotonic()
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for q in self._queues:
+            yield from q
+
+
+POLICIES = {
+    RoundRobinPolicy.name: RoundRobinPolicy,
+    PriorityPolicy.name: PriorityPolicy,
+    FairSharePolicy.name: FairSharePolicy,
+    MLFQPolicy.name: MLFQPolicy,
+}
+
+
+def create_policy(name, **options):
+    """
+    Build a policy by name.
+
+    Args:
+        name (str): One of POLICIES.
+        **options: Passed to the policy's constructor.
+
+    Returns:
+        SchedulingPolicy: The policy.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    cls = POLICIES.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown scheduling policy: {name}")
+    return cls(**options)
+
+
+def policy_from_config(section):
+    """
+    Build the policy described by the [scheduler] config section.
+
+    Args:
+        section (dict): Config values (strings), e.g. {'policy': 'mlfq'}.
+
+    Returns:
+        SchedulingPolicy: The policy.
+
+    Raises:
+        ValueError: If the policy name or one of its options is invalid.
+    """
+    name = section.get("policy", RoundRobinPolicy.name)
+    options = {}
+    if name == FairSharePolicy.name:
+        weights = {}
+        for item in section.get("fair_share_weights", "").split(","):
+            if item.strip():
+                uid, _, weight = item.partition(":")
+                try:
+                    value = float(weight)
+                except ValueError:
+                    raise ValueError(f"Invalid fair_share_weights entry: {item.strip()!r}") from None
+                if not value > 0:
+                    raise ValueError(f"fair_share_weights entry {item.strip()!r}: weight must be positive")
+                weights[uid.strip()] = value
+        options["weights"] = weights
+    elif name == MLFQPolicy.name:
+        options["levels"] = int(section.get("mlfq_levels", 3))
+        options["quantum"] = float(section.get("mlfq_quantum_ms", 1)) / 1000
+        options["boost_interval"] = float(section.get("mlfq_boost_interval", 5.0))
+    return create_policy(name, **options)
@@ -3,9 +3,246 @@
 Process Scheduler.
 
 This module implements a simple round-robin scheduler for managing process execution.
+Live processes are kept in a `ProcessTable`, which indexes them by PID, UID and
+state so lookups from syscalls do not scan every process.
+
+Only runnable processes sit in the run queue, which is owned by a pluggable
+`SchedulingPolicy` (round-robin by default, see `loop.kernel.sched_policy`). A process that yields `Sleep`
+or `Wait` is parked (state WAITING) and, if it has a deadline, put on a timer
+heap; when nothing is runnable the scheduler sleeps until the next deadline
+or until `wake()` is called. A process that yields `Offload` is parked while
+its function runs on the `OffloadPool` and is woken when the result is in.
+A process blocked in `Receive` is woken by `sys_send` when a message arrives.
 """
 
+import heapq
+import inspect
+import itertools
+import threading
+import time
+from collections import deque
+
+from loop.kernel.offload import OffloadPool
 from loop.kernel.process import ProcessState
+from loop.kernel.sched_policy import RoundRobinPolicy
+
+# States whose processes are kept in the run queue
+RUNNABLE_STATES = frozenset({ProcessState.READY, ProcessState.RUNNING, ProcessState.THINKING})
+
+# Longest idle wait between checks of the scheduler's stop flag (seconds).
+IDLE_WAIT_MAX = 1.0
+
+
+class ProcessTable(list):
+    """
+    The scheduler's list of live processes, indexed by PID, UID and state.
+
+    It is still a list (iteration order, indexing and `len()` behave as
+    before), but membership tests, `remove()` and PID lookups are O(1).
+    `remove()` moves the last process into the freed slot instead of
+    shifting the tail, so the order of the remaining processes may change.
+
+    Processes that support it (see `Process.state`) report state changes
+    back to the table, keeping the state index current.
+    """
+
+    def __init__(self, processes=(), on_add=None, on_state=None):
+        """
+        Initialize the table.
+
+        Args:
+            processes (iterable, optional): Initial processes.
+            on_add (callable, optional): Called as on_add(proc) after a
+                                         process is added.
+            on_state (callable, optional): Called as on_state(proc, old, new)
+                                           after a member changes state.
+        """
+        super().__init__()
+        self._on_add = on_add
+        self._on_state = on_state
+        self._lock = threading.RLock()
+        self._slots = {}      # id(proc) -> index in the list
+        self._by_pid = {}     # pid -> proc
+        self._by_uid = {}     # uid -> {proc: None} (insertion ordered)
+        self._by_state = {}   # state -> {proc: None}
+        self.extend(processes)
+
+    # --- Index maintenance ---
+
+    def _index(self, proc):
+        """Add a process to the PID, UID and state indexes."""
+        self._by_pid.setdefault(getattr(proc, "pid", None), proc)
+        self._by_uid.setdefault(getattr(proc, "uid", None), {})[proc] = None
+        self._by_state.setdefault(getattr(proc, "state", None), {})[proc] = None
+        try:
+            proc._table = self
+        except AttributeError:
+            pass
+
+    def _unindex(self, proc):
+        """Drop a process from the PID, UID and state indexes."""
+        pid = getattr(proc, "pid", None)
+        if self._by_pid.get(pid) is proc:
+            del self._by_pid[pid]
+        for index, key in ((self._by_uid, getattr(proc, "uid", None)),
+                           (self._by_state, getattr(proc, "state", None))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(proc, None)
+                if not bucket:
+                    del index[key]
+        if getattr(proc, "_table", None) is self:
+            proc._table = None
+
+    def _restate(self, proc, old, new):
+        """Move a process between state buckets. Called by Process.state."""
+        with self._lock:
+            if id(proc) not in self._slots:
+                return
+            bucket = self._by_state.get(old)
+            if bucket is not None:
+                bucket.pop(proc, None)
+                if not bucket:
+                    del self._by_state[old]
+            self._by_state.setdefault(new, {})[proc] = None
+        if self._on_state is not None:
+            self._on_state(proc, old, new)
+
+    # --- Lookups ---
+
+    def get(self, pid):
+        """
+        Return the live process with the given PID.
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            Process or None: The process, or None if there is none.
+        """
+        return self._by_pid.get(pid)
+
+    def by_uid(self, uid):
+        """
+        Return the live processes owned by a user, in insertion order.
+
+        Args:
+            uid (str): User ID.
+
+        Returns:
+            list[Process]: The user's processes.
+        """
+        with self._lock:
+            return list(self._by_uid.get(uid, ()))
+
+    def by_state(self, state):
+        """
+        Return the live processes in a given state.
+
+        Args:
+            state (ProcessState): The state.
+
+        Returns:
+            list[Process]: Matching processes.
+        """
+        with self._lock:
+            return list(self._by_state.get(state, ()))
+
+    def count_by_state(self):
+        """
+        Count live processes per state.
+
+        Returns:
+            dict: State name -> number of processes.
+        """
+        with self._lock:
+            return {getattr(s, "name", s): len(b) for s, b in self._by_state.items()}
+
+    # --- list API ---
+
+    def __contains__(self, proc):
+        return id(proc) in self._slots
+
+    def append(self, proc):
+        with self._lock:
+            if id(proc) in self._slots:
+                return
+            self._slots[id(proc)] = len(self)
+            super().append(proc)
+            self._index(proc)
+        if self._on_add is not None:
+            self._on_add(proc)
+
+    def extend(self, procs):
+        for proc in procs:
+            self.append(proc)
+
+    def remove(self, proc):
+        with self._lock:
+            slot = self._slots.pop(id(proc), None)
+            if slot is None:
+                raise ValueError("ProcessTable.remove(x): x not in table")
+            last = super().pop()
+            if last is not proc:
+                super().__setitem__(slot, last)
+                self._slots[id(last)] = slot
+            self._unindex(proc)
+
+    def discard(self, proc):
+        """Remove a process if present; return True if it was removed."""
+        try:
+            self.remove(proc)
+            return True
+        except ValueError:
+            return False
+
+    def pop(self, index=-1):
+        with self._lock:
+            proc = self[index]
+            self.remove(proc)
+            return proc
+
+    def clear(self):
+        with self._lock:
+            for proc in list.__iter__(self):
+                self._unindex(proc)
+            super().clear()
+            self._slots.clear()
+
+    def insert(self, index, proc):
+        with self._lock:
+            if id(proc) in self._slots:
+                return
+            super().insert(index, proc)
+            self._slots = {id(p): i for i, p in enumerate(list.__iter__(self))}
+            self._index(proc)
+        if self._on_add is not None:
+            self._on_add(proc)
+
+    def __setitem__(self, index, value):
+        with self._lock:
+            for proc in list.__iter__(self):
+                self._unindex(proc)
+            super().__setitem__(index, value)
+            self._rebuild()
+
+    def __delitem__(self, index):
+        with self._lock:
+            for proc in list.__iter__(self):
+                self._unindex(proc)
+            super().__delitem__(index)
+            self._rebuild()
+
+    def _rebuild(self):
+        """Rebuild every index from the list contents."""
+        self._slots = {id(p): i for i, p in enumerate(list.__iter__(self))}
+        self._by_pid, self._by_uid, self._by_state = {}, {}, {}
+        for proc in list.__iter__(self):
+            self._index(proc)
+
+    def __iadd__(self, procs):
+        self.extend(procs)
+        return self
 
 
 class Scheduler:
@@ -13,21 +250,54 @@ class Scheduler:
     Manages and schedules processes.
 
     Attributes:
-        processes (list): List of active Process objects.
+        processes (ProcessTable): Active Process objects, indexed by PID, UID and state.
+        policy (SchedulingPolicy): Owns the run queue and picks the next process.
+        run_queue (SchedulingPolicy): Alias of `policy`.
+        offload_pool (OffloadPool): Worker processes for `Offload` requests.
         current_process (Process): The currently executing process.
         running (bool): Flag indicating if the scheduler loop is active.
         exit_reason (str): Reason for stopping the scheduler (e.g., 'REBOOT', 'SHUTDOWN').
     """
-    def __init__(self):
+    def __init__(self, policy=None):
         """
         Initialize the Scheduler.
+
+        Args:
+            policy (SchedulingPolicy, optional): Run-queue policy. Defaults
+                                                 to round-robin.
         """
-        self.processes = []
+        self.processes = ProcessTable(on_add=self._enqueue, on_state=self._on_state)
+        self.policy = policy if policy is not None else RoundRobinPolicy()
+        self._queued = set()      # processes in the policy or _incoming (others are stale)
+        self._incoming = deque()  # enqueued from any thread, moved to the policy by run()
+        self._timers = []         # heap of (deadline, seq, proc)
+        self._timer_seq = itertools.count()
+        self._cond = threading.Condition()
+        self.offload_pool = OffloadPool()
         self.current_process = None
         self.running = True # Control flag for the loop
         self.accepting_new = True # Flag to control if new processes can be added
         self.exit_reason = "REBOOT" # Default to reboot if stopped, unless specified
 
+    @property
+    def run_queue(self):
+        """SchedulingPolicy: The run queue (the current policy)."""
+        return self.policy
+
+    def set_policy(self, policy):
+        """
+        Switch scheduling policy, carrying queued processes over.
+
+        Must not be called while run() is stepping a process from another
+        thread.
+
+        Args:
+            policy (SchedulingPolicy): The new policy.
+        """
+        for proc in self.policy.drain():
+            policy.push(proc)
+        self.policy = policy
+
     def shutdown(self):
         """
         Initiate scheduler shutdown phase.
@@ -41,6 +311,8 @@ class Scheduler:
         Stop the scheduler loop.
         """
         self.running = False
+        with self._cond:
+            self._cond.notify_all()
 
     def is_running(self):
         """
@@ -64,15 +336,175 @@ class Scheduler:
 
         self.processes.append(process)
 
+    def remove(self, process):
+        """
+        Remove a live process without running it again and free its PID.
+
+        Use this instead of removing from `processes` directly, which would
+        keep the PID allocated and leave policy state behind.
+
+        Args:
+            process (Process): The process to remove.
+
+        Returns:
+            bool: True if the process was live, False otherwise.
+        """
+        if process not in self.processes:
+            return False
+        self._reap(process)
+        return True
+
+    def get_process(self, pid):
+        """
+        Look up a live process by PID.
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            Process or None: The process, or None if no live process has that PID.
+        """
+        return self.processes.get(pid)
+
+    def processes_for(self, uid):
+        """
+        List the live processes owned by a user.
+
+        Args:
+            uid (str): User ID.
+
+        Returns:
+            list[Process]: The user's processes.
+        """
+        return self.processes.by_uid(uid)
+
+    def wake(self, proc):
+        """
+        Make a process runnable again, cancelling any Sleep/Wait timer.
+
+        Safe to call from any thread, and for processes that are not blocked.
+
+        Args:
+            proc (Process): The process to wake.
+
+        Returns:
+            bool: True if the process is live, False otherwise.
+        """
+        if proc not in self.processes:
+            return False
+        if getattr(proc, "_offloading", False) and not proc.signal:
+            return True  # woken by _offload_done once the result is in
+        proc.wake_at = None
+        proc._timer_seq = None
+        if proc.state == ProcessState.WAITING:
+            proc.state = ProcessState.READY
+        self._enqueue(proc)
+        return True
+
+    def _enqueue(self, proc):
+        """Queue a process (once) from any thread and wake an idle loop."""
+        if proc in self._queued:
+            return
+        self._queued.add(proc)
+        with self._cond:
+            self._incoming.append(proc)
+            self._cond.notify()
+
+    def _drain_incoming(self):
+        """Hand processes enqueued since the last call to the policy."""
+        incoming = self._incoming
+        push = self.policy.push
+        while incoming:
+            push(incoming.popleft())
+
+    def _on_state(self, proc, old, new):
+        """ProcessTable callback: requeue a process leaving WAITING."""
+        if old is ProcessState.WAITING and new in RUNNABLE_STATES:
+            self._enqueue(proc)
+
+    def _park(self, proc):
+        """Keep a WAITING process off the run queue; arm its timer or submit its Offload."""
+        awaitable = getattr(proc, "awaiting", None)
+        if awaitable is not None:
+            # Only the asyncio scheduler has a loop to run it on
+            proc.awaiting = None
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            proc.resume(False, RuntimeError("Awaiting needs the asyncio scheduler"))
+            self.wake(proc)
+            return
+        if getattr(proc, "receiving", False) and proc.inbox:
+            # A message arrived while the process was blocking
+            self.wake(proc)
+            return
+        request = getattr(proc, "offload", None)
+        if request is not None:
+            proc.offload = None
+            proc._offloading = True
+            self.offload_pool.submit(request, lambda ok, value, cpu: self._offload_done(proc, ok, value, cpu))
+            return
+        deadline = getattr(proc, "wake_at", None)
+        if deadline is not None:
+            seq = next(self._timer_seq)
+            proc._timer_seq = seq
+            heapq.heappush(self._timers, (deadline, seq, proc))
+
+    def _offload_done(self, proc, ok, value, cpu):
+        """OffloadPool callback (pool thread): hand the outcome over and wake the process."""
+        proc.resume(ok, value, cpu)
+        proc._offloading = False
+        self.wake(proc)
+
+    def _fire_timers(self):
+        """Wake every parked process whose deadline has passed."""
+        timers = self._timers
+        now = time.monotonic()
+        while timers and timers[0][0] <= now:
+            _, seq, proc = heapq.heappop(timers)
+            # Skip timers cancelled by wake() or replaced by a newer wait
+            if getattr(proc, "_timer_seq", None) == seq:
+                self.wake(proc)
+
+    def _idle(self):
+        """Sleep until the next timer deadline, a wake() or stop()."""
+        timeout = IDLE_WAIT_MAX
+        if self._timers:
+            timeout = min(timeout, max(0.0, self._timers[0][0] - time.monotonic()))
+        with self._cond:
+            if not self._incoming and self.running:
+                self._cond.wait(timeout)
+
+    def _reap(self, proc):
+        """
+        Remove a finished process and free its PID.
+
+        Args:
+            proc (Process): The terminated process.
+        """
+        self.processes.discard(proc)
+        self.policy.forget(proc)
+        release = getattr(proc, "release_pid", None)
+        if release is not None:
+            release()
+
+    def _step(self, proc):
+        """Run one step of a runnable process."""
+        proc.run_step()
+
     def run(self, max_steps=None):
         """
         Start the scheduling loop.
 
-        Iterates through the list of processes and calls `run_step()` on each
-        active process. Handles process termination and signals (SIGKILL, SIGTERM).
+        Each pass fires due timers and then pops as many processes from the
+        policy as were queued at the start of the pass, giving each one
+        `run_step()` (with round-robin, every queued process runs once). Handles
+        process termination and signals (SIGKILL, SIGTERM). Processes that
+        block are parked; if nothing is runnable the loop sleeps until the
+        next timer deadline or wake-up instead of spinning.
 
         Args:
-            max_steps (int, optional): Maximum number of loop iterations to run.
+            max_steps (int, optional): Maximum number of passes to run (an
+                                       idle wait counts as one pass).
                                        Useful for testing or limited execution.
         """
         self.running = True
@@ -81,36 +513,71 @@ class Scheduler:
             if max_steps is not None and steps >= max_steps:
                 break
             steps += 1
+            if not self._run_pass():
+                self._idle()
+
+    def _run_pass(self):
+        """
+        Run one scheduling pass (see run()).
+
+        Returns:
+            bool: False if nothing was runnable, so the caller should idle.
+        """
+        if self._timers:
+            self._fire_timers()
+        self._drain_incoming()
+        policy = self.policy
+        if not len(policy):
+            return False
+
+        queued = self._queued
+        for _ in range(len(policy)):
+            if self._incoming:
+                self._drain_incoming()
+            proc = policy.pop()
+            if proc is None:
+                break
+            if proc not in queued:
+                continue  # duplicate entry, already handled this pass
+            queued.discard(proc)
+            if proc not in self.processes:
+                continue  # removed externally (e.g. by the service manager)
+
+            self.current_process = proc
 
-            # Create a copy to allow modification during iteration (e.g. kill)
-            for proc in list(self.processes):
-                self.current_process = proc
-
-                # handle signals
-                if proc.signal == "SIGKILL":
-                    proc.state = ProcessState.TERMINATED
-                    print(f"[scheduler] {proc.pid} killed")
-                    self.processes.remove(proc)
-                    continue
-
-                if proc.signal == "SIGTERM":
-                    proc.state = ProcessState.TERMINATED
-                    print(f"[scheduler] {proc.pid} terminated")
-                    self.processes.remove(proc)
-                    continue
-
-                # If process is not ready/running, skip (unless we have wait logic)
-                # ProcessState.READY or ProcessState.RUNNING are actionable
-                if proc.state not in [ProcessState.READY, ProcessState.RUNNING, ProcessState.THINKING]:
-                    if proc.state == ProcessState.TERMINATED:
-                         self.processes.remove(proc)
-                    continue
-
-                # Run a step
-                proc.run_step()
+            # handle signals
+            if proc.signal == "SIGKILL":
+                proc.state = ProcessState.TERMINATED
+                print(f"[scheduler] {proc.pid} killed")
+                self._reap(proc)
+                continue
 
+            if proc.signal == "SIGTERM":
+                proc.state = ProcessState.TERMINATED
+                print(f"[scheduler] {proc.pid} terminated")
+                self._reap(proc)
+                continue
+
+            if proc.state not in RUNNABLE_STATES:
                 if proc.state == ProcessState.TERMINATED:
-                    self.processes.remove(proc)
-                    # print(f"[scheduler] {proc.pid} exited")
+                    self._reap(proc)
+                elif proc.state == ProcessState.WAITING:
+                    self._park(proc)
+                continue
+
+            # Run a step
+            start = time.perf_counter()
+            self._step(proc)
+            policy.charge(proc, time.perf_counter() - start)
+
+            if proc.state == ProcessState.TERMINATED:
+                self._reap(proc)
+                # print(f"[scheduler] {proc.pid} exited")
+            elif proc.state == ProcessState.WAITING:
+                self._park(proc)
+            elif proc not in queued:
+                queued.add(proc)
+                policy.push(proc)
 
-                self.current_process = None
+            self.current_process = None
+        return True
@@ -10,8 +10,20 @@ It handles permission checking and dispatches requests to the appropriate subsys
 import time
 import json
 import os
+import mmap
+import codecs
+import tempfile
+import errno
+import shutil
+import stat
+import sys
 import psutil
 from loop.kernel import rootfs
+from loop.kernel import syscall_table
+from loop.kernel.filesystem import FileSystem
+from loop.kernel.journal import Journal
+from loop.kernel.process import Receive
+from loop.kernel.scheduler import ProcessTable
 from loop.kernel.users import UserManager
 from loop.kernel.network import NetworkManager
 from loop.kernel.cloud.docker_interface import DockerInterface
@@ -33,9 +45,21 @@ class SyscallHandler:
         scheduler (Scheduler): The process scheduler.
         user_manager (UserManager): User management system.
         network_manager (NetworkManager): Network management system.
+        fs (FileSystem): The in-memory virtual filesystem.
+        journal (Journal): Buffered writer for the kernel log.
+        tracer (SyscallTracer): Syscall statistics and trace records.
         sandbox (AgentSandbox): The sandbox instance (optional).
     """
 
+    # Ranged reads of files at least this large go through mmap.
+    READ_MMAP_THRESHOLD = 1024 * 1024
+
+    # Upper bound on remembered parent directories before the set is flushed.
+    KNOWN_DIRS_MAX_ENTRIES = 4096
+
+    # Bytes moved per copy_file_range/sendfile call (one progress report each).
+    COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
     def __init__(self, scheduler=None, user_manager=None, network_manager=None):
         """
         Initialize the SyscallHandler.
@@ -48,6 +72,9 @@ class SyscallHandler:
         self.scheduler = scheduler
         self.user_manager = user_manager or UserManager()
         self.network_manager = network_manager or NetworkManager(self.user_manager)
+        self.fs = FileSystem()
+        self.journal = Journal(rootfs.KERNEL_LOG)
+        self.tracer = syscall_table.TRACER
         self.docker_interface = DockerInterface()
         self.k8s_interface = KubernetesInterface()
         self.memory_manager = MemoryManager()
@@ -67,6 +94,9 @@ class SyscallHandler:
 
         self.sandbox = None
 
+        # Host directories already known to exist (skips mkdir on writes)
+        self._known_dirs = set()
+
     def set_scheduler(self, scheduler):
         """
         Set the scheduler instance.
@@ -85,6 +115,67 @@ class SyscallHandler:
         """
         self.sandbox = sandbox
 
+    def dispatch(self, name, args=(), kwargs=None):
+        """
+        Invoke a syscall through the syscall table.
+
+        This is the single entry point used by the shell and the agent
+        sandbox; see `loop.kernel.syscall_table`.
+
+        Args:
+            name (str or int): Syscall name (e.g. 'sys_read') or number.
+            args (list or tuple, optional): Positional arguments.
+            kwargs (dict, optional): Keyword arguments.
+
+        Returns:
+            Any: The syscall's return value.
+        """
+        return syscall_table.dispatch(self, name, args, kwargs)
+
+    def sys_batch(self, entries, max_workers=syscall_table.BATCH_MAX_WORKERS):
+        """
+        Submit several syscalls at once.
+
+        Entries are dispatched in order through the syscall table.
+        Consecutive read-only entries (e.g. sys_read, sys_ls) run
+        concurrently. Any other entry waits for everything before it. A
+        failing entry does not stop the batch.
+
+        Args:
+            entries (list): Each entry is a dict {'syscall', 'args', 'kwargs'}
+                            or a list [syscall, arg1, arg2, ...].
+            max_workers (int, optional): Maximum concurrent read-only entries.
+
+        Returns:
+            list[dict]: Completions in submission order, each with 'index',
+                        'syscall' and either 'result' or 'error'.
+        """
+        names = []
+        calls = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                name, args, kwargs = entry.get("syscall"), entry.get("args", ()), entry.get("kwargs")
+            else:
+                name, args, kwargs = entry[0], list(entry[1:]), None
+            names.append(name)
+            spec = syscall_table.SYSCALLS.get(name)
+            if spec is not None and spec.name == "sys_batch":
+                calls.append((self._nested_batch, False))
+                continue
+            calls.append((lambda n=name, a=args, k=kwargs: self.dispatch(n, a, k),
+                          spec is not None and spec.readonly))
+
+        completions = []
+        for index, (name, (ok, value)) in enumerate(zip(names, syscall_table.run_batch(calls, max_workers))):
+            if ok:
+                completions.append({"index": index, "syscall": name, "result": value})
+            else:
+                completions.append({"index": index, "syscall": name, "error": str(value)})
+        return completions
+
+    def _nested_batch(self):
+        raise ValueError("sys_batch cannot be nested")
+
     # Authentication
     def sys_login(self, user, password):
         """
@@ -180,7 +271,22 @@ class SyscallHandler:
                 # Trust the path (e.g., from Sandbox)
                 from pathlib import Path
                 real_path = Path(path)
+        except Exception as e:
+            raise FileNotFoundError(f"Path not found or error accessing: {path} ({e})")
+        return self._ls_real(path, real_path)
 
+    def _ls_real(self, path, real_path):
+        """
+        List an already resolved host path.
+
+        Args:
+            path (str): The path as given by the caller (for error messages).
+            real_path (Path): The resolved host path.
+
+        Returns:
+            list[str]: List of filenames.
+        """
+        try:
             if not real_path.exists():
                 raise FileNotFoundError(f"Path not found: {path}")
 
@@ -194,16 +300,146 @@ class SyscallHandler:
                 raise e
             raise FileNotFoundError(f"Path not found or error accessing: {path} ({e})")
 
-    def sys_read(self, path, resolve=True):
+    def _resolve_many(self, paths, resolve):
+        """
+        Resolve a batch of paths via rootfs, sharing lookups between them.
+
+        Args:
+            paths (list[str]): Paths to resolve.
+            resolve (bool): If False, paths are trusted as host paths.
+
+        Returns:
+            list: A Path or the exception raised, one per input.
+        """
+        if not resolve:
+            from pathlib import Path
+            return [Path(p) for p in paths]
+        return rootfs.resolve_many(paths)
+
+    def sys_ls_detailed(self, path="/", resolve=True, offset=0, limit=None,
+                        recursive=False, max_depth=None):
+        """
+        List a directory with type, size, mtime and permissions per entry.
+
+        Built on os.scandir: entry types come from the directory read
+        itself, and only entries on the requested page are stat()ed.
+        Entries are sorted by name (depth-first when recursive) so pages
+        are stable.
+
+        Args:
+            path (str): Directory to list.
+            resolve (bool, optional): Whether to resolve the path via rootfs.
+            offset (int, optional): Index of the first entry to return.
+            limit (int, optional): Maximum number of entries to return.
+            recursive (bool, optional): Descend into subdirectories
+                                        (symlinks are not followed).
+            max_depth (int, optional): Maximum depth when recursive
+                                       (1 = direct children only).
+
+        Returns:
+            dict: 'path', 'entries' (list of dicts with 'name', 'path',
+                  'type', 'size', 'mtime', 'mode'), 'total' and
+                  'next_offset' (None on the last page).
+        """
+        try:
+            if resolve:
+                real_path = rootfs.resolve(path)
+            else:
+                from pathlib import Path
+                real_path = Path(path)
+        except Exception as e:
+            raise FileNotFoundError(f"Path not found or error accessing: {path} ({e})")
+        if not real_path.is_dir():
+            raise NotADirectoryError(f"Not a directory: {path}")
+
+        depth_limit = (max_depth if max_depth is not None else float("inf")) if recursive else 1
+        found = []  # (relative name, DirEntry)
+        self._scan_sorted(real_path, "", 1, depth_limit, found)
+
+        page = found[offset:] if limit is None else found[offset:offset + limit]
+        base = path.rstrip("/")
+        entries = []
+        for rel, entry in page:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue  # removed since the directory was read
+            if entry.is_symlink():
+                kind = "symlink"
+            elif stat.S_ISDIR(st.st_mode):
+                kind = "dir"
+            elif stat.S_ISREG(st.st_mode):
+                kind = "file"
+            else:
+                kind = "other"
+            entries.append({
+                "name": rel,
+                "path": f"{base}/{rel}",
+                "type": kind,
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "mode": stat.filemode(st.st_mode),
+            })
+
+        end = offset + len(page)
+        return {
+            "path": path,
+            "entries": entries,
+            "total": len(found),
+            "next_offset": end if end < len(found) else None,
+        }
+
+    def _scan_sorted(self, directory, prefix, depth, depth_limit, found):
+        """Collect (relative name, DirEntry) pairs in sorted depth-first order."""
+        with os.scandir(directory) as it:
+            children = sorted(it, key=lambda e: e.name)
+        for entry in children:
+            rel = prefix + entry.name
+            found.append((rel, entry))
+            if depth < depth_limit and entry.is_dir(follow_symlinks=False):
+                try:
+                    self._scan_sorted(entry.path, rel + "/", depth + 1, depth_limit, found)
+                except OSError:
+                    pass  # unreadable or vanished subdirectory
+
+    def sys_ls_many(self, paths, resolve=True):
         """
-        Read a file.
+        List several directories with one batched path resolution.
+
+        Args:
+            paths (list[str]): The paths to list.
+            resolve (bool, optional): Whether to resolve the paths via rootfs.
+
+        Returns:
+            list[dict]: One dict per path with 'path' and either 'items'
+                        (list[str]) or 'error' (str).
+        """
+        results = []
+        for path, real_path in zip(paths, self._resolve_many(paths, resolve)):
+            try:
+                if isinstance(real_path, Exception):
+                    raise FileNotFoundError(f"Path not found or error accessing: {path} ({real_path})")
+                results.append({"path": path, "items": self._ls_real(path, real_path)})
+            except FileNotFoundError as e:
+                results.append({"path": path, "error": str(e)})
+        return results
+
+    def sys_read(self, path, resolve=True, offset=0, length=None):
+        """
+        Read a file, or a byte range of it.
+
+        Ranged reads of files of at least READ_MMAP_THRESHOLD bytes slice
+        an mmap of the file, so only the requested pages are touched.
 
         Args:
             path (str): File path.
             resolve (bool, optional): Whether to resolve path via rootfs.
+            offset (int, optional): Byte offset to start reading at.
+            length (int, optional): Maximum number of bytes to read
+                                    (None reads to the end of the file).
 
         Returns:
-            str: File content.
+            str: File content (invalid UTF-8 at range edges is replaced).
         """
         if resolve:
             real_path = rootfs.resolve(path)
@@ -211,10 +447,105 @@ class SyscallHandler:
             from pathlib import Path
             real_path = Path(path)
 
-        with open(real_path, "r") as f:
-            return f.read()
+        if offset == 0 and length is None:
+            with open(real_path, "r") as f:
+                return f.read()
+        return self._read_range(real_path, offset, length)
 
-    def sys_write(self, path, data, resolve=True):
+    def _read_range(self, real_path, offset, length):
+        """
+        Read `length` bytes at `offset` from a resolved host path.
+
+        Returns:
+            str: The decoded bytes.
+        """
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("offset and length must be non-negative")
+        with open(real_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if length is None else min(size, offset + length)
+            if offset >= end:
+                return ""
+            if size >= self.READ_MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    data = mm[offset:end]
+            else:
+                f.seek(offset)
+                data = f.read(end - offset)
+        return data.decode("utf-8", errors="replace")
+
+    def sys_read_stream(self, path, resolve=True, offset=0, length=None, chunk_size=64 * 1024):
+        """
+        Read a file as a stream of text chunks.
+
+        The path is resolved immediately; the file is read lazily, one
+        chunk at a time, so memory use is bounded by `chunk_size`
+        regardless of file size.
+
+        Args:
+            path (str): File path.
+            resolve (bool, optional): Whether to resolve path via rootfs.
+            offset (int, optional): Byte offset to start reading at.
+            length (int, optional): Maximum number of bytes to read.
+            chunk_size (int, optional): Bytes read per chunk.
+
+        Returns:
+            generator: Yields str chunks. Multi-byte UTF-8 characters are
+                       never split across chunks.
+        """
+        if resolve:
+            real_path = rootfs.resolve(path)
+        else:
+            from pathlib import Path
+            real_path = Path(path)
+        if offset < 0 or (length is not None and length < 0) or chunk_size <= 0:
+            raise ValueError("offset, length and chunk_size must be non-negative")
+        return self._stream_chunks(real_path, offset, length, chunk_size)
+
+    def _stream_chunks(self, real_path, offset, length, chunk_size):
+        """Generator behind sys_read_stream."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        remaining = length
+        with open(real_path, "rb") as f:
+            f.seek(offset)
+            while remaining is None or remaining > 0:
+                n = chunk_size if remaining is None else min(chunk_size, remaining)
+                data = f.read(n)
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def sys_read_many(self, paths, resolve=True):
+        """
+        Read several files with one batched path resolution.
+
+        Args:
+            paths (list[str]): File paths.
+            resolve (bool, optional): Whether to resolve the paths via rootfs.
+
+        Returns:
+            list[dict]: One dict per path with 'path' and either 'content'
+                        (str) or 'error' (str).
+        """
+        results = []
+        for path, real_path in zip(paths, self._resolve_many(paths, resolve)):
+            try:
+                if isinstance(real_path, Exception):
+                    raise real_path
+                with open(real_path, "r") as f:
+                    results.append({"path": path, "content": f.read()})
+            except Exception as e:
+                results.append({"path": path, "error": str(e)})
+        return results
+
+    def sys_write(self, path, data, resolve=True, atomic=False):
         """
         Write to a file.
 
@@ -222,6 +553,9 @@ class SyscallHandler:
             path (str): File path.
             data (str): Content to write.
             resolve (bool, optional): Whether to resolve path via rootfs.
+            atomic (bool, optional): Write to a temporary file, fsync it and
+                                     rename it over the target, so a crash
+                                     leaves either the old or the new content.
 
         Returns:
             bool: True.
@@ -232,15 +566,115 @@ class SyscallHandler:
             from pathlib import Path
             real_path = Path(path)
 
-        # Ensure parent exists
-        real_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(real_path, "w") as f:
-            f.write(data)
+        self._write_real(real_path, data, atomic)
+        if atomic:
+            self._fsync_dir(real_path.parent)
 
         self.sys_log(f"[fs] write {path} by {self._get_current_uid()}")
         return True
 
+    def sys_writev(self, entries, resolve=True, atomic=False):
+        """
+        Write several files in one call.
+
+        Paths are resolved in one batch, parent directories are created at
+        most once, and a single journal entry is logged for the whole call.
+        With `atomic`, each file is replaced atomically and each distinct
+        parent directory is fsynced once at the end.
+
+        Args:
+            entries (list): (path, data) pairs.
+            resolve (bool, optional): Whether to resolve paths via rootfs.
+            atomic (bool, optional): Atomic replace, as in sys_write.
+
+        Returns:
+            list[dict]: One dict per entry with 'path' and either
+                        'ok' (True) or 'error' (str).
+        """
+        paths = [path for path, _ in entries]
+        results = []
+        synced = set()
+        for (path, data), real_path in zip(entries, self._resolve_many(paths, resolve)):
+            try:
+                if isinstance(real_path, Exception):
+                    raise real_path
+                self._write_real(real_path, data, atomic)
+                synced.add(real_path.parent)
+                results.append({"path": path, "ok": True})
+            except Exception as e:
+                results.append({"path": path, "error": str(e)})
+
+        if atomic:
+            for parent in synced:
+                self._fsync_dir(parent)
+
+        written = sum(1 for r in results if "ok" in r)
+        self.sys_log(f"[fs] writev {written}/{len(entries)} files by {self._get_current_uid()}")
+        return results
+
+    def _ensure_parent(self, real_path, force=False):
+        """
+        Create the parent directory of a host path unless known to exist.
+
+        Args:
+            real_path (Path): The file about to be written.
+            force (bool, optional): Ignore the cache (e.g. after ENOENT).
+        """
+        parent = real_path.parent
+        if not force and parent in self._known_dirs:
+            return
+        parent.mkdir(parents=True, exist_ok=True)
+        if len(self._known_dirs) >= self.KNOWN_DIRS_MAX_ENTRIES:
+            self._known_dirs.clear()
+        self._known_dirs.add(parent)
+
+    def _write_real(self, real_path, data, atomic):
+        """
+        Write data to a resolved host path, creating its parent if needed.
+
+        A cached parent that was removed behind our back is recreated once.
+        """
+        self._ensure_parent(real_path)
+        try:
+            self._write_file(real_path, data, atomic)
+        except FileNotFoundError:
+            self._ensure_parent(real_path, force=True)
+            self._write_file(real_path, data, atomic)
+
+    def _write_file(self, real_path, data, atomic):
+        """Write (or atomically replace) a single file."""
+        if not atomic:
+            with open(real_path, "w") as f:
+                f.write(data)
+            return
+
+        fd, tmp = tempfile.mkstemp(dir=real_path.parent, prefix=f".{real_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, real_path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _fsync_dir(self, directory):
+        """Persist a rename by fsyncing its directory (no-op where unsupported)."""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
     def sys_append(self, path, text, resolve=True):
         """
         Append text to a file.
@@ -260,9 +694,14 @@ class SyscallHandler:
             real_path = Path(path)
 
         # Ensure parent exists
-        real_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_parent(real_path)
 
-        with open(real_path, "a") as f:
+        try:
+            f = open(real_path, "a")
+        except FileNotFoundError:
+            self._ensure_parent(real_path, force=True)
+            f = open(real_path, "a")
+        with f:
             f.write(text + "\n")
         return True
 
@@ -288,11 +727,193 @@ class SyscallHandler:
                 os.rmdir(real_path)  # Only empty
             else:
                 os.remove(real_path)
+            self._known_dirs.discard(real_path)
+            if resolve:
+                rootfs.invalidate(path)
             self.sys_log(f"[fs] delete {path} by {self._get_current_uid()}")
             return True
         except Exception:
             return False
 
+    def sys_copy(self, src, dst, resolve=True, recursive=False, progress=None):
+        """
+        Copy a file or directory without passing its content through Python.
+
+        File data moves in the kernel via os.copy_file_range or os.sendfile
+        where available, falling back to a buffered binary copy. Symlinks
+        inside a copied tree are recreated as symlinks, not followed.
+
+        Args:
+            src (str): Source path.
+            dst (str): Destination path (the new file or directory itself).
+            resolve (bool, optional): Whether to resolve paths via rootfs.
+            recursive (bool, optional): Required to copy a directory.
+            progress (callable, optional): Called as progress(done, total, path)
+                                           after each chunk, in bytes.
+
+        Returns:
+            dict: 'files' and 'bytes' copied.
+
+        Raises:
+            IsADirectoryError: If src is a directory and recursive is False.
+            OSError: EINVAL if dst is inside the src directory.
+        """
+        real_src, real_dst = self._resolve_pair(src, dst, resolve)
+        stats = self._copy_real(real_src, real_dst, recursive, progress)
+        self.sys_log(f"[fs] copy {src} -> {dst} ({stats['files']} files, {stats['bytes']} bytes) by {self._get_current_uid()}")
+        return stats
+
+    def sys_move(self, src, dst, resolve=True, progress=None):
+        """
+        Move a file or directory.
+
+        Within one filesystem this is a single os.replace. Across
+        filesystems the tree is copied as in sys_copy and the source removed.
+
+        Args:
+            src (str): Source path.
+            dst (str): Destination path.
+            resolve (bool, optional): Whether to resolve paths via rootfs.
+            progress (callable, optional): Progress callback for the copy
+                                           fallback, as in sys_copy.
+
+        Returns:
+            dict: 'files' and 'bytes' copied (both 0 for a rename).
+        """
+        real_src, real_dst = self._resolve_pair(src, dst, resolve)
+        self._ensure_parent(real_dst)
+        try:
+            os.replace(real_src, real_dst)
+            stats = {"files": 0, "bytes": 0}
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            stats = self._copy_real(real_src, real_dst, True, progress)
+            if real_src.is_dir() and not real_src.is_symlink():
+                shutil.rmtree(real_src)
+            else:
+                os.remove(real_src)
+
+        self._known_dirs.discard(real_src)
+        if resolve:
+            rootfs.invalidate(src)
+            rootfs.invalidate(dst)
+        self.sys_log(f"[fs] move {src} -> {dst} by {self._get_current_uid()}")
+        return stats
+
+    def _resolve_pair(self, src, dst, resolve):
+        """Resolve a (src, dst) pair in one batch."""
+        if not resolve:
+            from pathlib import Path
+            return Path(src), Path(dst)
+        real_src, real_dst = rootfs.resolve_many([src, dst])
+        for real in (real_src, real_dst):
+            if isinstance(real, Exception):
+                raise real
+        return real_src, real_dst
+
+    def _copy_real(self, real_src, real_dst, recursive, progress):
+        """
+        Copy resolved host paths.
+
+        Returns:
+            dict: 'files' and 'bytes' copied.
+        """
+        if not real_src.exists() and not real_src.is_symlink():
+            raise FileNotFoundError(f"Path not found: {real_src}")
+
+        if not real_src.is_dir():
+            self._ensure_parent(real_dst)
+            total = real_src.stat().st_size
+            copied = self._copy_file(real_src, real_dst, 0, total, progress)
+            return {"files": 1, "bytes": copied}
+
+        if not recursive:
+            raise IsADirectoryError(f"{real_src} is a directory (use recursive)")
+
+        # os.walk would visit the copy as it is made and recurse forever
+        src_path = os.path.realpath(real_src)
+        if os.path.commonpath([src_path, os.path.realpath(real_dst)]) == src_path:
+            raise OSError(errno.EINVAL, "Cannot copy a directory into itself", str(real_dst))
+
+        # Sizing pass so progress can report a total
+        total = 0
+        if progress is not None:
+            for root, _, files in os.walk(real_src):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if not os.path.islink(path):
+                        total += os.path.getsize(path)
+
+        stats = {"files": 0, "bytes": 0}
+        for root, dirs, files in os.walk(real_src):
+            rel = os.path.relpath(root, real_src)
+            target_dir = real_dst if rel == "." else real_dst / rel
+            target_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copymode(root, target_dir)
+            self._known_dirs.add(target_dir)
+
+            for name in dirs + files:
+                source = os.path.join(root, name)
+                target = target_dir / name
+                if os.path.islink(source):
+                    os.symlink(os.readlink(source), target)
+                    if name in dirs:
+                        dirs.remove(name)  # never descend through links
+                elif name in files:
+                    stats["bytes"] = self._copy_file(source, target, stats["bytes"], total, progress)
+                    stats["files"] += 1
+        return stats
+
+    def _copy_file(self, source, target, done, total, progress):
+        """
+        Copy one regular file in the kernel where possible.
+
+        Args:
+            source (Path or str): Source file.
+            target (Path or str): Destination file.
+            done (int): Bytes already copied in this operation.
+            total (int): Total bytes of the operation (for progress).
+            progress (callable or None): Progress callback.
+
+        Returns:
+            int: `done` plus the bytes copied.
+        """
+        with open(source, "rb") as fsrc, open(target, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            copy_range = getattr(os, "copy_file_range", None)
+            # Elsewhere (e.g. macOS) sendfile only writes to sockets
+            sendfile = getattr(os, "sendfile", None) if sys.platform.startswith("linux") else None
+            while offset < size:
+                n = 0
+                count = min(self.COPY_CHUNK_SIZE, size - offset)
+                try:
+                    if copy_range is not None:
+                        n = copy_range(fsrc.fileno(), fdst.fileno(), count, offset, offset)
+                    elif sendfile is not None:
+                        n = sendfile(fdst.fileno(), fsrc.fileno(), offset, count)
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                                       errno.ENOTSUP, errno.ENOTSOCK):
+                        raise
+                    copy_range = sendfile = None
+                    continue
+                if copy_range is None and sendfile is None:
+                    # Buffered fallback for the rest of the file
+                    fsrc.seek(offset)
+                    fdst.seek(offset)
+                    chunk = fsrc.read(count)
+                    fdst.write(chunk)
+                    n = len(chunk)
+                if n == 0:
+                    break  # source shrank underneath us
+                offset += n
+                if progress is not None:
+                    progress(done + offset, total, str(target))
+        shutil.copymode(source, target)
+        return done + offset
+
     def sys_kill(self, pid, sig="SIGTERM"):
         """
         Send a signal to a process.
@@ -309,16 +930,40 @@ class SyscallHandler:
 
         current_uid = self._get_current_uid()
 
-        for p in self.scheduler.processes:
-            if p.pid == pid:
-                if current_uid != "root" and p.uid != current_uid:
-                    self.sys_log(f"kill denied for {current_uid} on {pid}")
-                    return False
+        p = self._find_process(pid)
+        if p is None:
+            return False
+        if current_uid != "root" and p.uid != current_uid:
+            self.sys_log(f"kill denied for {current_uid} on {pid}")
+            return False
 
-                p.deliver_signal(sig)
-                self.sys_log(f"signal {sig} to {pid}")
-                return True
-        return False
+        p.deliver_signal(sig)
+        # A blocked process must run once to act on the signal
+        wake = getattr(self.scheduler, "wake", None)
+        if wake is not None:
+            wake(p)
+        self.sys_log(f"signal {sig} to {pid}")
+        return True
+
+    def _find_process(self, pid):
+        """
+        Look up a live process by PID.
+
+        Uses the scheduler's PID index; schedulers without one are scanned.
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            Process or None: The process, or None if not found.
+        """
+        processes = self.scheduler.processes
+        if isinstance(processes, ProcessTable):
+            return processes.get(pid)
+        for p in processes:
+            if p.pid == pid:
+                return p
+        return None
 
     def sys_send(self, pid, message):
         """
@@ -329,39 +974,66 @@ class SyscallHandler:
             message (any): The message.
 
         Returns:
-            bool: True if sent, False otherwise.
+            bool: True if sent, False if there is no such process or its
+                  inbox is full.
         """
         if not self.scheduler:
             return False
-        for p in self.scheduler.processes:
-            if p.pid == pid:
-                p.send(message)
-                return True
-        return False
+        p = self._find_process(pid)
+        if p is None or not p.send(message):
+            return False
+        if getattr(p, "receiving", False):
+            self.scheduler.wake(p)
+        return True
 
-    def sys_recv(self):
+    def sys_recv(self, block=False, timeout=None):
         """
         Receive an IPC message for the current process.
 
+        A syscall cannot suspend the calling process, so a blocking receive
+        returns a `Receive` request for the process to yield; the process is
+        WAITING until a message arrives (see sys_send) and gets it as the
+        result of the yield:
+
+            msg = yield sys.sys_recv(block=True, timeout=5)
+
+        Args:
+            block (bool, optional): Return a Receive request instead of
+                                    polling the inbox. Defaults to False.
+            timeout (float, optional): Seconds before a blocking receive
+                                       gives up with None.
+
         Returns:
-            any: The message, or None.
+            any: The message, or None if the inbox is empty (block=False);
+                 a Receive request (block=True).
         """
         if not self.scheduler or not self.scheduler.current_process:
             return None
+        if block:
+            return Receive(timeout)
         proc = self.scheduler.current_process
         return proc.receive()
 
-    def sys_proc_list(self):
+    def sys_proc_list(self, uid=None):
         """
         List all running processes (Microkernel).
 
+        Args:
+            uid (str, optional): Only list processes owned by this user.
+
         Returns:
             list[dict]: A list of process details.
         """
         if not self.scheduler:
             return []
+        processes = self.scheduler.processes
+        if uid is not None:
+            if isinstance(processes, ProcessTable):
+                processes = processes.by_uid(uid)
+            else:
+                processes = [p for p in processes if p.uid == uid]
         out = []
-        for p in self.scheduler.processes:
+        for p in processes:
             out.append(
                 {
                     "pid": p.pid,
@@ -821,11 +1493,111 @@ class SyscallHandler:
         }
         return state
 
+    # Tracing
+    def sys_trace(self, enabled, pid=None):
+        """
+        Turn syscall tracing on or off.
+
+        Without a PID this switches statistics collection for everyone
+        (root only). With a PID it attaches or detaches per-call tracing
+        for that process (root or the process owner).
+
+        Args:
+            enabled (bool): True to start tracing, False to stop.
+            pid (int, optional): Process to (un)trace.
+
+        Returns:
+            bool: True if the change was applied, False otherwise.
+        """
+        current_uid = self._get_current_uid()
+        if pid is None:
+            if current_uid != "root":
+                self.sys_log(f"trace denied for {current_uid}")
+                return False
+            self.tracer.configure(enabled=enabled)
+            return True
+
+        p = self._find_process(pid) if self.scheduler else None
+        if p is None:
+            # Root may still detach a PID whose process has exited
+            if enabled or current_uid != "root":
+                return False
+        elif current_uid != "root" and p.uid != current_uid:
+            self.sys_log(f"trace denied for {current_uid} on {pid}")
+            return False
+
+        if enabled:
+            self.tracer.attach(pid)
+        else:
+            self.tracer.detach(pid)
+        return True
+
+    def sys_trace_stats(self, pid=None, uid=None):
+        """
+        Report per-syscall counts, errors and latency percentiles.
+
+        Users other than root only see their own calls.
+
+        Args:
+            pid (int, optional): Only calls made by this process.
+            uid (str, optional): Only calls made by this user.
+
+        Returns:
+            list[dict]: See SyscallTracer.stats(); empty if the caller may
+                        not see the requested process or user.
+        """
+        uid = self._trace_scope(pid, uid)
+        if uid is False:
+            return []
+        return self.tracer.stats(pid=pid, uid=uid)
+
+    def sys_trace_log(self, pid=None, limit=50):
+        """
+        Return recent per-call trace records.
+
+        Users other than root only see records of their own calls.
+
+        Args:
+            pid (int, optional): Only records from this process.
+            limit (int, optional): Maximum number of records.
+
+        Returns:
+            list[dict]: See SyscallTracer.log(); empty if the caller may
+                        not see the requested process.
+        """
+        uid = self._trace_scope(pid)
+        if uid is False:
+            return []
+        return self.tracer.log(pid=pid, limit=limit, uid=uid)
+
+    def _trace_scope(self, pid=None, uid=None):
+        """
+        Work out which user's trace data the caller may read.
+
+        Args:
+            pid (int, optional): Process the caller asked about.
+            uid (str, optional): User the caller asked about.
+
+        Returns:
+            str or None or bool: The UID to filter on (None: everyone, for
+                                 root), or False if the request is denied.
+        """
+        current_uid = self._get_current_uid()
+        if current_uid == "root":
+            return uid
+        p = self._find_process(pid) if pid is not None and self.scheduler else None
+        if (uid is not None and uid != current_uid) or (p is not None and p.uid != current_uid):
+            self.sys_log(f"trace read denied for {current_uid}")
+            return False
+        return current_uid
+
     # Logging
     def sys_log(self, msg):
         """
         Log a message to the system journal.
 
+        The line is buffered and group-committed by `self.journal`.
+
         Args:
             msg (str): Message to log.
 
@@ -835,7 +1607,7 @@ class SyscallHandler:
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         line = f"{timestamp} {msg}"
         try:
-            self.sys_append("/var/logs/kernel.log", line)
+            self.journal.write(line)
         except:
             pass  # Boot time issues
         return True
@@ -0,0 +1,322 @@
+# kernel/syscall_table.py
+"""
+System Call Table.
+
+Every syscall exposed by `SyscallHandler` is registered here with a fixed
+number, an argument schema, the permission it requires and a risk class.
+`dispatch()` is the single entry point used by the shell and the agent
+sandbox: it resolves a name or number with one dict lookup, validates the
+arguments against the schema, checks the permission and calls the
+handler method.
+
+While `TRACER` is enabled, every dispatched call is counted and timed
+(see `loop.kernel.tracing`).
+
+`run_batch()` executes a list of calls in order, running consecutive
+read-only entries concurrently; it backs `sys_batch` and the agent
+sandbox's `batch` action.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from loop.kernel.tracing import SyscallTracer
+
+# Risk classes, matching ConfirmationManager.assess_risk()
+LOW = "LOW"
+MEDIUM = "MEDIUM"
+HIGH = "HIGH"
+
+# Upper bound on worker threads used to run one batch.
+BATCH_MAX_WORKERS = 8
+
+
+class UnknownSyscallError(LookupError):
+    """Raised when dispatching a name or number that is not registered."""
+    pass
+
+
+class Syscall:
+    """
+    A registered syscall.
+
+    Attributes:
+        nr (int): The syscall number.
+        name (str): The handler method name (e.g. 'sys_read').
+        params (tuple[str]): Parameter names, in positional order.
+        required (int): Number of leading parameters that must be given.
+        permission (str or None): Permission checked via
+                                  UserManager.has_permission, if any.
+        risk (str): Risk class (LOW, MEDIUM or HIGH).
+        readonly (bool): True if the syscall does not change any state, so
+                         it may run concurrently with other read-only calls.
+    """
+
+    __slots__ = ("nr", "name", "params", "required", "permission", "risk", "readonly")
+
+    def __init__(self, nr, name, params, permission=None, risk=LOW, readonly=False):
+        """
+        Initialize a Syscall entry.
+
+        Args:
+            nr (int): The syscall number.
+            name (str): The handler method name.
+            params (str): Comma separated parameter names; a trailing '?'
+                          marks an optional parameter (e.g. "path, resolve?").
+            permission (str, optional): Required permission.
+            risk (str, optional): Risk class. Defaults to LOW.
+            readonly (bool, optional): Whether the syscall is read-only.
+        """
+        names = [p.strip() for p in params.split(",") if p.strip()]
+        self.nr = nr
+        self.name = name
+        self.params = tuple(p.rstrip("?") for p in names)
+        self.required = sum(1 for p in names if not p.endswith("?"))
+        self.permission = permission
+        self.risk = risk
+        self.readonly = readonly
+
+    def check_args(self, args, kwargs):
+        """
+        Validate call arguments against the schema.
+
+        Raises:
+            TypeError: If too many, too few or unknown arguments are given.
+        """
+        if len(args) > len(self.params):
+            raise TypeError(f"{self.name}() takes at most {len(self.params)} arguments ({len(args)} given)")
+        for key in kwargs:
+            if key not in self.params:
+                raise TypeError(f"{self.name}() got an unexpected keyword argument '{key}'")
+        if len(args) < self.required:
+            missing = [p for p in self.params[len(args):self.required] if p not in kwargs]
+            if missing:
+                raise TypeError(f"{self.name}() missing required arguments: {', '.join(missing)}")
+
+    def __repr__(self):
+        return f"Syscall({self.nr}, {self.name!r}, risk={self.risk})"
+
+
+# Process-wide syscall tracer; disabled until configured or attached
+TRACER = SyscallTracer()
+
+# name -> Syscall and nr -> Syscall, so dispatch is a single lookup either way
+SYSCALLS = {}
+
+
+def register(nr, name, params="", permission=None, risk=LOW, readonly=False):
+    """
+    Register a syscall in the table.
+
+    Args:
+        nr (int): The syscall number (must be unused).
+        name (str): The handler method name (must be unused).
+        params (str, optional): Argument schema, see `Syscall`.
+        permission (str, optional): Required permission.
+        risk (str, optional): Risk class.
+        readonly (bool, optional): Whether the syscall is read-only.
+
+    Returns:
+        Syscall: The registered entry.
+
+    Raises:
+        ValueError: If the number or name is already registered.
+    """
+    if nr in SYSCALLS or name in SYSCALLS:
+        raise ValueError(f"Syscall {nr}/{name} already registered")
+    entry = Syscall(nr, name, params, permission, risk, readonly)
+    SYSCALLS[nr] = entry
+    SYSCALLS[name] = entry
+    return entry
+
+
+def lookup(name_or_nr):
+    """
+    Return the table entry for a syscall name or number.
+
+    Raises:
+        UnknownSyscallError: If it is not registered.
+    """
+    entry = SYSCALLS.get(name_or_nr)
+    if entry is None:
+        raise UnknownSyscallError(f"Unknown syscall: {name_or_nr}")
+    return entry
+
+
+def dispatch(handler, name_or_nr, args=(), kwargs=None):
+    """
+    Dispatch a syscall to a handler.
+
+    Args:
+        handler (SyscallHandler): The handler implementing the syscall.
+        name_or_nr (str or int): Syscall name (e.g. 'sys_read') or number.
+        args (list or tuple, optional): Positional arguments.
+        kwargs (dict, optional): Keyword arguments.
+
+    Returns:
+        Any: The syscall's return value.
+
+    Raises:
+        UnknownSyscallError: If the syscall is not registered.
+        TypeError: If the arguments do not match the schema.
+        PermissionError: If the caller lacks the required permission.
+    """
+    entry = SYSCALLS.get(name_or_nr)
+    if entry is None:
+        raise UnknownSyscallError(f"Unknown syscall: {name_or_nr}")
+    kwargs = kwargs or {}
+    entry.check_args(args, kwargs)
+
+    if entry.permission is not None:
+        uid = handler._get_current_uid()
+        if uid != "root" and not handler.user_manager.has_permission(uid, entry.permission):
+            raise PermissionError(f"Permission Denied: {entry.permission} required for {entry.name}")
+
+    if TRACER.active:
+        return TRACER.call(handler, entry.name, getattr(handler, entry.name), args, kwargs, entry.params)
+    return getattr(handler, entry.name)(*args, **kwargs)
+
+
+def run_batch(calls, max_workers=BATCH_MAX_WORKERS):
+    """
+    Run a list of calls in order, overlapping consecutive read-only ones.
+
+    Each run of consecutive read-only calls is executed on a thread pool;
+    any other call is a barrier and runs alone once everything before it
+    has completed. A failing call does not stop the batch.
+
+    Args:
+        calls (list[tuple]): (func, readonly) pairs; func takes no arguments.
+        max_workers (int, optional): Thread pool size.
+
+    Returns:
+        list[tuple]: One (ok, value) pair per call, in submission order:
+                     (True, result) or (False, exception).
+    """
+    results = [None] * len(calls)
+    pool = None
+
+    def run(i):
+        try:
+            results[i] = (True, calls[i][0]())
+        except Exception as e:
+            results[i] = (False, e)
+
+    def flush(group):
+        nonlocal pool
+        if len(group) == 1:
+            run(group[0])
+        elif group:
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="syscall-batch")
+            list(pool.map(run, group))
+        group.clear()
+
+    try:
+        group = []
+        for i, (_, readonly) in enumerate(calls):
+            if readonly:
+                group.append(i)
+                continue
+            flush(group)
+            run(i)
+        flush(group)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return results
+
+
+def table():
+    """
+    List registered syscalls in number order.
+
+    Returns:
+        list[Syscall]: One entry per syscall.
+    """
+    return sorted((e for k, e in SYSCALLS.items() if isinstance(k, int)), key=lambda e: e.nr)
+
+
+# Authentication and users
+register(0, "sys_login", "user, password")
+register(1, "sys_user_list", risk=HIGH, readonly=True)
+register(2, "sys_user_add", "user, password", risk=HIGH)
+register(3, "sys_user_delete", "user", risk=HIGH)
+
+# Filesystem
+register(10, "sys_ls", "path?, resolve?", readonly=True)
+register(11, "sys_ls_many", "paths, resolve?", readonly=True)
+register(12, "sys_read", "path, resolve?, offset?, length?", readonly=True)
+register(13, "sys_read_many", "paths, resolve?", readonly=True)
+register(14, "sys_write", "path, data, resolve?, atomic?", risk=MEDIUM)
+register(15, "sys_append", "path, text, resolve?", risk=MEDIUM)
+register(16, "sys_delete", "path, resolve?", risk=HIGH)
+register(17, "sys_read_stream", "path, resolve?, offset?, length?, chunk_size?", readonly=True)
+register(18, "sys_writev", "entries, resolve?, atomic?", risk=MEDIUM)
+register(19, "sys_ls_detailed", "path?, resolve?, offset?, limit?, recursive?, max_depth?", readonly=True)
+
+# Processes and IPC
+register(20, "sys_kill", "pid, sig?", risk=HIGH)
+register(21, "sys_send", "pid, message")
+register(22, "sys_recv", "block?, timeout?")
+register(23, "sys_proc_list", "uid?", readonly=True)
+
+# Host shell
+register(30, "sys_host_proc_list", readonly=True)
+register(31, "sys_host_proc_kill", "pid", risk=HIGH)
+register(32, "sys_host_app_launch", "app_name", risk=MEDIUM)
+register(33, "sys_app_launch", "app_name", risk=MEDIUM)
+register(34, "sys_host_win_focus", "query")
+
+# Network
+register(40, "sys_net_status", readonly=True)
+register(41, "sys_net_set_status", "status", permission="manage_network", risk=HIGH)
+register(42, "sys_net_check_access", readonly=True)
+
+# Code execution
+register(50, "sys_exec_nasm", "source_code", permission="execute_code", risk=HIGH)
+
+# Docker
+register(60, "sys_docker_login", "username, password, registry?", permission="manage_docker", risk=MEDIUM)
+register(61, "sys_docker_logout", "registry?", permission="manage_docker", risk=MEDIUM)
+register(62, "sys_docker_build", "path, tag, dockerfile?", permission="manage_docker", risk=MEDIUM)
+register(63, "sys_docker_run", "image, name?, ports?, env?", permission="manage_docker", risk=MEDIUM)
+register(64, "sys_docker_ps", "all?", permission="manage_docker", risk=MEDIUM, readonly=True)
+register(65, "sys_docker_stop", "container_id", permission="manage_docker", risk=HIGH)
+register(66, "sys_docker_logs", "container_id, tail?", permission="manage_docker", risk=MEDIUM, readonly=True)
+
+# Kubernetes
+register(70, "sys_k8s_deploy", "name, image, replicas?, namespace?", permission="manage_k8s", risk=MEDIUM)
+register(71, "sys_k8s_scale", "name, replicas, namespace?", permission="manage_k8s", risk=MEDIUM)
+register(72, "sys_k8s_delete", "name, namespace?", permission="manage_k8s", risk=HIGH)
+register(73, "sys_k8s_get_pods", "namespace?", permission="manage_k8s", risk=MEDIUM, readonly=True)
+register(74, "sys_k8s_logs", "pod_name, namespace?", permission="manage_k8s", risk=MEDIUM, readonly=True)
+
+# Plugins
+register(80, "sys_plugin_list", readonly=True)
+register(81, "sys_plugin_install", "name_or_url", risk=HIGH)
+register(82, "sys_plugin_uninstall", "name", risk=HIGH)
+
+# System
+register(90, "sys_shutdown", risk=HIGH)
+register(91, "sys_reboot", risk=HIGH)
+register(92, "sys_get_state", readonly=True)
+register(93, "sys_log", "msg")
+# A batch may hold HIGH-risk entries; the sandbox rates its batches per entry
+register(94, "sys_batch", "entries, max_workers?", risk=HIGH)
+register(95, "sys_trace", "enabled, pid?", risk=MEDIUM)
+register(96, "sys_trace_stats", "pid?, uid?", readonly=True)
+register(97, "sys_trace_log", "pid?, limit?", readonly=True)
+
+# Memory
+register(100, "sys_memory_store", "content, metadata?", risk=MEDIUM)
+register(101, "sys_memory_search", "query, limit?", readonly=True)
+register(102, "sys_memory_recall", "query, limit?", readonly=True)
+register(103, "sys_memory_delete", "key_id?, query?", risk=HIGH)
+
+# UI senses
+register(110, "sys_ui_scan")
+register(111, "sys_ui_act", "uid, action, payload?", risk=MEDIUM)
+
+# Filesystem (server-side transfers)
+register(120, "sys_copy", "src, dst, resolve?, recursive?, progress?", risk=MEDIUM)
+register(121, "sys_move", "src, dst, resolve?, progress?", risk=MEDIUM)
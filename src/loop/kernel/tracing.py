@@ -0,0 +1,397 @@
+# kernel/tracing.py
+"""
+Syscall Tracing.
+
+`SyscallTracer` is hooked into `syscall_table.dispatch()`. While enabled it
+keeps, per (syscall, caller UID, caller PID), a call count, an error count
+and a latency histogram. Per-call records (the `strace` view) are kept in a
+ring buffer only for processes that are explicitly traced, or for every
+caller when `trace_all` is set.
+
+Histograms are log-linear in the style of HdrHistogram: each power of two
+is split into 32 linear sub-buckets, so any recorded latency is reported
+within ~3% of its true value while storing only the buckets that are used.
+"""
+
+import reprlib
+import threading
+import time
+from collections import deque
+
+# Linear sub-buckets per power of two (2**SUB_BUCKET_BITS)
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Characters of argument/result repr kept in a trace record.
+TRACE_REPR_LIMIT = 80
+
+# Parameters whose values are never written to trace records.
+REDACTED_PARAMS = frozenset({"password"})
+REDACTED = "<redacted>"
+
+_repr = reprlib.Repr()
+_repr.maxstring = TRACE_REPR_LIMIT
+_repr.maxother = TRACE_REPR_LIMIT
+
+
+class LatencyHistogram:
+    """
+    Sparse log-linear latency histogram.
+
+    Attributes:
+        count (int): Number of recorded values.
+        total (int): Sum of recorded values (nanoseconds).
+        max (int): Largest recorded value (nanoseconds).
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        """
+        Return the bucket index for a value.
+
+        Args:
+            value (int): Latency in nanoseconds.
+
+        Returns:
+            int: Bucket index; values below 32 have exact buckets.
+        """
+        if value < _SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - _SUB_BUCKETS
+
+    @staticmethod
+    def bucket_high(index):
+        """
+        Return the largest value that falls in a bucket.
+
+        Args:
+            index (int): Bucket index.
+
+        Returns:
+            int: Upper bound of the bucket (nanoseconds).
+        """
+        if index < _SUB_BUCKETS:
+            return index
+        shift = (index >> SUB_BUCKET_BITS) - 1
+        mantissa = (index & (_SUB_BUCKETS - 1)) + _SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        """
+        Record a latency.
+
+        Args:
+            value (int): Latency in nanoseconds.
+        """
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Add another histogram's values to this one.
+
+        Args:
+            other (LatencyHistogram): The histogram to merge.
+        """
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """
+        Return the value at a percentile.
+
+        Args:
+            p (float): Percentile, 0-100.
+
+        Returns:
+            int: Upper bound of the bucket holding the percentile
+                 (nanoseconds), capped at the maximum; 0 if empty.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucket_high(index), self.max)
+        return self.max
+
+    def summary(self):
+        """
+        Summarize the histogram in microseconds.
+
+        Returns:
+            dict: 'mean_us', 'p50_us', 'p90_us', 'p99_us' and 'max_us'.
+        """
+        mean = self.total / self.count if self.count else 0
+        return {
+            "mean_us": round(mean / 1000, 3),
+            "p50_us": round(self.percentile(50) / 1000, 3),
+            "p90_us": round(self.percentile(90) / 1000, 3),
+            "p99_us": round(self.percentile(99) / 1000, 3),
+            "max_us": round(self.max / 1000, 3),
+        }
+
+
+class _CallStats:
+    """Counters for one (syscall, uid, pid) key."""
+
+    __slots__ = ("count", "errors", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+
+
+class SyscallTracer:
+    """
+    Collects syscall statistics and, on request, per-call trace records.
+
+    Attributes:
+        enabled (bool): Collect statistics for every caller.
+        trace_all (bool): While enabled, record every call in the ring
+                          buffer, not only calls from traced PIDs.
+        traced_pids (set): PIDs whose calls are counted and recorded in the
+                           ring buffer, whether or not `enabled` is set.
+        active (bool): Whether dispatch() needs to call the tracer at all
+                       (enabled, or some PID traced).
+        records (deque): Ring buffer of recent trace records.
+    """
+
+    def __init__(self, enabled=False, capacity=4096):
+        """
+        Initialize the SyscallTracer.
+
+        Args:
+            enabled (bool, optional): Start collecting immediately.
+            capacity (int, optional): Size of the trace ring buffer.
+        """
+        self.enabled = enabled
+        self.trace_all = False
+        self.traced_pids = set()
+        self.active = enabled
+        self.records = deque(maxlen=capacity)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def configure(self, enabled=None, capacity=None, trace_all=None):
+        """
+        Change tracer settings.
+
+        Args:
+            enabled (bool, optional): Enable or disable statistics.
+            capacity (int, optional): New ring buffer size (keeps the newest records).
+            trace_all (bool, optional): Record every call in the ring buffer.
+        """
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if trace_all is not None:
+                self.trace_all = trace_all
+            if capacity is not None and capacity != self.records.maxlen:
+                self.records = deque(self.records, maxlen=capacity)
+            self._update_active()
+
+    def attach(self, pid):
+        """Count and record every call made by `pid` (and only that PID's, unless enabled)."""
+        with self._lock:
+            self.traced_pids.add(pid)
+            self._update_active()
+
+    def detach(self, pid):
+        """Stop recording calls made by `pid`."""
+        with self._lock:
+            self.traced_pids.discard(pid)
+            self._update_active()
+
+    def _update_active(self):
+        """Recompute `active`; called with the lock held."""
+        self.active = self.enabled or bool(self.traced_pids)
+
+    def reset(self):
+        """Drop all statistics and trace records."""
+        with self._lock:
+            self._stats = {}
+            self.records.clear()
+
+    def call(self, handler, name, func, args, kwargs, params=()):
+        """
+        Run a syscall and account for it.
+
+        Args:
+            handler (SyscallHandler): The handler (used to find the caller).
+            name (str): The syscall name.
+            func (callable): The bound handler method.
+            args (tuple): Positional arguments.
+            kwargs (dict): Keyword arguments.
+            params (tuple[str], optional): Parameter names, in positional
+                                           order; values of REDACTED_PARAMS
+                                           are not recorded.
+
+        Returns:
+            Any: The syscall's return value.
+        """
+        proc = handler.scheduler.current_process if handler.scheduler else None
+        if proc is not None:
+            uid, pid = proc.uid, proc.pid
+        else:
+            uid, pid = "root", 0
+
+        attached = pid in self.traced_pids
+        if not self.enabled and not attached:
+            return func(*args, **kwargs)
+
+        error = None
+        start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            key = (name, uid, pid)
+            with self._lock:
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = _CallStats()
+                stats.count += 1
+                if error is not None:
+                    stats.errors += 1
+                stats.latency.record(elapsed)
+                traced = attached or (self.enabled and self.trace_all)
+            if traced:
+                # Large values are rendered now so the ring does not keep them alive
+                outcome = _brief(error) if error is not None else _brief(result)
+                self.records.append((time.time(), pid, uid, name, _brief_args(args, params),
+                                     kwargs and {k: _Rendered(REDACTED) if k in REDACTED_PARAMS else _brief(v)
+                                                 for k, v in kwargs.items()},
+                                     outcome, error is not None, elapsed))
+
+    def stats(self, pid=None, uid=None):
+        """
+        Summarize collected statistics per syscall.
+
+        Args:
+            pid (int, optional): Only count calls from this PID.
+            uid (str, optional): Only count calls from this user.
+
+        Returns:
+            list[dict]: One entry per syscall, most called first, with
+                        'syscall', 'calls', 'errors', 'total_ms' and the
+                        latency summary (see LatencyHistogram.summary).
+        """
+        merged = {}
+        with self._lock:
+            for (name, key_uid, key_pid), stats in self._stats.items():
+                if (pid is not None and key_pid != pid) or (uid is not None and key_uid != uid):
+                    continue
+                entry = merged.get(name)
+                if entry is None:
+                    entry = merged[name] = _CallStats()
+                entry.count += stats.count
+                entry.errors += stats.errors
+                entry.latency.merge(stats.latency)
+
+        out = []
+        for name, entry in merged.items():
+            row = {
+                "syscall": name,
+                "calls": entry.count,
+                "errors": entry.errors,
+                "total_ms": round(entry.latency.total / 1e6, 3),
+            }
+            row.update(entry.latency.summary())
+            out.append(row)
+        out.sort(key=lambda r: r["calls"], reverse=True)
+        return out
+
+    def log(self, pid=None, limit=50, uid=None):
+        """
+        Return recent trace records, oldest first.
+
+        Args:
+            pid (int, optional): Only records from this PID.
+            limit (int, optional): Maximum number of records.
+            uid (str, optional): Only records from this user.
+
+        Returns:
+            list[dict]: Records with 'time', 'pid', 'uid', 'syscall',
+                        'args', 'result', 'error' and 'duration_us'.
+        """
+        with self._lock:
+            records = list(self.records)
+        if pid is not None:
+            records = [r for r in records if r[1] == pid]
+        if uid is not None:
+            records = [r for r in records if r[2] == uid]
+        return [
+            {
+                "time": ts,
+                "pid": rpid,
+                "uid": ruid,
+                "syscall": name,
+                "args": _render_args(args, kwargs),
+                "result": _repr.repr(result),
+                "error": failed,
+                "duration_us": round(elapsed / 1000, 3),
+            }
+            for ts, rpid, ruid, name, args, kwargs, result, failed, elapsed in records[-limit:]
+        ]
+
+
+class _Rendered(str):
+    """A value already rendered by `_brief`; repr() returns it unquoted."""
+
+    def __repr__(self):
+        return str(self)
+
+
+_CHEAP = (int, float, bool, type(None))
+
+
+def _brief(value):
+    """Keep small values as they are; render anything else to a short string."""
+    t = type(value)
+    if t in _CHEAP:
+        return value
+    if t is str or t is bytes:
+        if len(value) <= TRACE_REPR_LIMIT:
+            return value
+        return _Rendered(repr(value[:TRACE_REPR_LIMIT]) + "...")
+    return _Rendered(_repr.repr(value))
+
+
+def _brief_args(args, params):
+    """Apply `_brief` to positional arguments, redacting REDACTED_PARAMS."""
+    return tuple(
+        _Rendered(REDACTED) if i < len(params) and params[i] in REDACTED_PARAMS else _brief(a)
+        for i, a in enumerate(args)
+    )
+
+
+def _render_args(args, kwargs):
+    """Render call arguments the way strace does, shortened."""
+    parts = [_repr.repr(a) for a in args]
+    parts.extend(f"{k}={_repr.repr(v)}" for k, v in (kwargs or {}).items())
+    return ", ".join(parts)
@@ -1,11 +1,11 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import threading
 import time
 import asyncio
 import json
 from loop.kernel.kernel import LoopKernel
+from loop.kernel.async_scheduler import AsyncScheduler
 from loop.kernel.io import APIAdapter
 from loop.kernel.agent import ReActAgent
 
@@ -14,31 +14,32 @@ app = FastAPI()
 # Global State
 kernel = None
 io_adapter = None
-kernel_thread = None
+kernel_task = None
 
 class CommandRequest(BaseModel):
     command: str
 
-def run_kernel_loop(k):
+async def run_kernel_loop(k):
     """
-    Background thread to drive the Kernel/Shell loop.
+    Drive the Kernel/Shell loop on the server's event loop.
     """
     print("[Server] Starting Kernel Loop...")
     try:
-        k.start() # This blocks in the shell loop
+        await k.start_async()
     except Exception as e:
         print(f"[Server] Kernel crashed: {e}")
 
 @app.on_event("startup")
-def startup_event():
-    global kernel, io_adapter, kernel_thread
+async def startup_event():
+    global kernel, io_adapter, kernel_task
 
     # 1. Initialize API Adapter
     io_adapter = APIAdapter()
 
     # 2. Initialize LoopKernel with this adapter
     print("[Server] Booting LoopKernel...")
-    kernel = LoopKernel(io_adapter=io_adapter)
+    # The asyncio scheduler shares this server's event loop
+    kernel = LoopKernel(io_adapter=io_adapter, scheduler=AsyncScheduler())
 
     # 3. Initialize Persistent Agent
     # We attach an agent to the kernel so we can inject context.
@@ -48,13 +49,18 @@ def startup_event():
     # Ideally, the Shell should use kernel.agent if available.
     kernel.agent = ReActAgent(kernel.sys)
 
-    # 4. Start Kernel in background thread
-    kernel_thread = threading.Thread(target=run_kernel_loop, args=(kernel,), daemon=True)
-    kernel_thread.start()
+    # 4. Start Kernel as a task on the server's event loop
+    kernel_task = asyncio.get_running_loop().create_task(run_kernel_loop(kernel))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if kernel and kernel_task and not kernel_task.done():
+        kernel.scheduler.stop()
+        await kernel_task
 
 @app.get("/health")
 def health_check():
-    if kernel and kernel_thread.is_alive():
+    if kernel and kernel_task and not kernel_task.done():
         return {"status": "running", "uptime": "ok"}
     return {"status": "starting"}
 
@@ -7,6 +7,8 @@ A simple background service that logs a heartbeat to the system journal.
 
 import time
 
+from loop.kernel.process import Sleep
+
 
 def journal_daemon(syscall):
     """
@@ -18,9 +20,8 @@ def journal_daemon(syscall):
         syscall (SyscallHandler): System call interface.
 
     Yields:
-        None: Yields control back to the scheduler.
+        Sleep: Parks the daemon for three seconds between heartbeats.
     """
     while True:
         syscall.sys_append("/var/log/journal/journal.status", f"beat {time.time()}")
-        time.sleep(3)
-        yield
+        yield Sleep(3)
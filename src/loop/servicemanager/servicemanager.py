@@ -246,9 +246,8 @@ class ServiceManager:
             print(f"[servicemanager] Timeout killing {name}")
             # If force was already True, we can't do much more but scrub state.
 
-        # Cleanup State
-        if proc in self.scheduler.processes:
-            self.scheduler.processes.remove(proc)
+        # Cleanup State (also frees the PID)
+        self.scheduler.remove(proc)
 
     def shutdown(self, timeout: float = 30.0, grace_period: float = 5.0, force: bool = False) -> ShutdownReport:
         """
@@ -304,7 +303,7 @@ class ServiceManager:
         # Scrub any remaining
         remaining = [p for p in self.services.values() if p in self.scheduler.processes]
         for proc in remaining:
-            self.scheduler.processes.remove(proc)
+            self.scheduler.remove(proc)
 
         self.services.clear()
         self.all_processes.clear()
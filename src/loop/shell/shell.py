@@ -9,6 +9,7 @@ and dispatches tasks to the AI Agent.
 
 import time
 from rich.prompt import Prompt
+from loop.kernel.async_scheduler import to_thread
 from loop.kernel.process import Process
 from loop.servicemanager.servicemanager import ServiceManager
 from importlib import import_module
@@ -124,10 +125,28 @@ class Shell:
                 self.io.write(output + "\n")
             yield  # yield back to scheduler
 
+    async def run_async(self):
+        """
+        Main execution loop coroutine, for the asyncio scheduler.
+
+        Waits for input without holding the event loop. Commands are
+        blocking (agent and LLM calls included), so each one runs in a
+        worker thread.
+        """
+        while self.running:
+            prompt = f"{self.current_user}@loop:{self.cwd}> "
+            cmd = (await self.io.read_async(prompt, password=False)).strip()
+            output = await to_thread(self.execute, cmd)
+            if output:
+                self.io.write(output + "\n")
+
     def execute(self, cmd):
         """
         Execute a single command string.
 
+        Built-in commands are looked up in `COMMANDS`; kernel work goes
+        through the syscall table via `SyscallHandler.dispatch`.
+
         Args:
             cmd (str): The command line string.
 
@@ -142,139 +161,202 @@ class Shell:
         args = parts[1:]
 
         try:
-            if op == "ls":
-                path = args[0] if args else self.cwd
-                return "\n".join(self.sys.sys_ls(path))
-
-            elif op == "cat":
-                if len(args) < 1: return "Usage: cat <file>"
-                return self.sys.sys_read(args[0])
-
-            elif op == "write":
-                if len(args) < 2: return "Usage: write <file> <text>"
-                path, text = args[0], " ".join(args[1:])
-                self.sys.sys_write(path, text)
-                return f"Written to {path}"
-
-            elif op == "append":
-                if len(args) < 2: return "Usage: append <file> <text>"
-                path, text = args[0], " ".join(args[1:])
-                self.sys.sys_append(path, text)
-                return f"Appended to {path}"
-
-            elif op == "run":
-                if len(args) < 1: return "Usage: run <program> [args]"
-                return self._run_program(args)
-
-            elif op == "ps":
-                # Use syscall instead of supervisor direct access if possible
-                procs = self.sys.sys_proc_list()
-                out = ["PID    NAME    STATE    UID"]
-                for p in procs:
-                    out.append(f"{p['pid']:<6} {p['name']:<7} {p['state']:<8} {p['uid']}")
-                return "\n".join(out)
-
-            elif op == "run-service":
-                if len(args) < 1:
-                    return "Usage: run-service <service>"
-                return self.service_manager.run_service(args[0])
-
-            elif op == "journal":
-                try:
-                    return self.sys.sys_read("/var/log/journal/kernel.log")
-                except:
-                    return "(no logs yet)"
-
-            elif op == "kill":
-                if len(args) < 1:
-                    return "Usage: kill <pid>"
-                ok = self.sys.sys_kill(int(args[0]))
-                return "Killed" if ok else "Failed (perm?)"
-
-            elif op == "send":
-                if len(args) < 2:
-                    return "Usage: send <pid> <message>"
-                ok = self.sys.sys_send(int(args[0]), " ".join(args[1:]))
-                return "Sent" if ok else "Failed"
-
-            elif op == "recv":
-                return self.sys.sys_recv()
-
-            elif op == "shutdown":
-                return self.sys.sys_shutdown()
-
-            elif op == "reboot":
-                return self.sys.sys_reboot()
-
-            elif op == "dom":
-                state = self.sys.sys_get_state()
-                return str(state)
-
-            elif op == "create":
-                if len(args) < 1: return "Usage: create <filename>"
-                filename = args[0]
-                if "." not in filename:
-                    filename += ".txt"
-                content = " ".join(args[1:]) if len(args) > 1 else ""
-                self.sys.sys_write(filename, content)
-                return f"Created {filename}"
-
-            elif op == "navigate":
-                if len(args) < 1 or args[0] in ["--help", "help", "list"]:
-                    return "Available apps: browser, calc, explorer, system, user\nUsage: navigate <app> [args]"
-
-                app_name = args[0]
-                # Allow 'navigate browser' to map to 'run browser' logic
-                # We reuse _run_program but need to adjust args to match 'run <prog> args' signature expected by _run_program
-                # _run_program expects [prog, arg1, arg2...]
-                return self._run_program(args)
-
-            elif op == "agent":
-                if len(args) < 1:
-                    return "Usage: agent <task description>"
-                task = " ".join(args)
-
-                # Lazy Init Agent
-                if not self.agent:
-                    self.io.write("[Shell] Initializing Agent Layer...\n")
-                    self.agent = ReActAgent(self.sys)
-
-                self.io.write(f"[Shell] Dispatching task to Agent: '{task}'\n")
-                return self.agent.run(task)
-
-            elif op == "help":
-                return (
-                    "Commands:\n"
-                    "  ls                - list directory\n"
-                    "  cat <file>        - read file\n"
-                    "  write <f> <text>  - write file\n"
-                    "  append <f> <text> - append file\n"
-                    "  run <prog> args   - run program in /bin\n"
-                    "  ps                - list processes\n"
-                    "  reboot            - restart OS\n"
-                    "  shutdown          - shutdown OS\n"
-                    "  help              - show this\n"
-                    "  journal           - show system logs\n"
-                    "  run-service <svc> - start background service\n"
-                    "  dom               - show system state (Agent)\n"
-                    "  agent <task>      - give a task to the AI Agent\n"
-                    "  create <file>     - create a file (default .txt)\n"
-                    "  navigate <app>    - run a user app (browser, etc)\n"
-                )
-
-            elif op in self.plugin_commands:
+            handler = self.COMMANDS.get(op)
+            if handler is not None:
+                return handler(self, args)
+
+            if op in self.plugin_commands:
                 # Execute plugin command
                 try:
                     return self.plugin_commands[op](*args)
                 except Exception as e:
                     return f"Plugin command failed: {e}"
 
-            else:
-                return f"Unknown command: {op}"
+            return f"Unknown command: {op}"
 
         except Exception as e:
             return f"[error] {e}"
 
+    # ========== BUILT-IN COMMANDS ==========
+    def _cmd_ls(self, args):
+        path = args[0] if args else self.cwd
+        return "\n".join(self.sys.dispatch("sys_ls", [path]))
+
+    def _cmd_cat(self, args):
+        if len(args) < 1: return "Usage: cat <file>"
+        return self.sys.dispatch("sys_read", [args[0]])
+
+    def _cmd_write(self, args):
+        if len(args) < 2: return "Usage: write <file> <text>"
+        path, text = args[0], " ".join(args[1:])
+        self.sys.dispatch("sys_write", [path, text])
+        return f"Written to {path}"
+
+    def _cmd_append(self, args):
+        if len(args) < 2: return "Usage: append <file> <text>"
+        path, text = args[0], " ".join(args[1:])
+        self.sys.dispatch("sys_append", [path, text])
+        return f"Appended to {path}"
+
+    def _cmd_run(self, args):
+        if len(args) < 1: return "Usage: run <program> [args]"
+        return self._run_program(args)
+
+    def _cmd_ps(self, args):
+        # Use syscall instead of supervisor direct access if possible
+        # `ps -u <user>` lists one user's processes via the UID index
+        if len(args) >= 2 and args[0] == "-u":
+            procs = self.sys.dispatch("sys_proc_list", [args[1]])
+        else:
+            procs = self.sys.dispatch("sys_proc_list")
+        out = ["PID    NAME    STATE    UID"]
+        for p in procs:
+            out.append(f"{p['pid']:<6} {p['name']:<7} {p['state']:<8} {p['uid']}")
+        return "\n".join(out)
+
+    def _cmd_run_service(self, args):
+        if len(args) < 1:
+            return "Usage: run-service <service>"
+        return self.service_manager.run_service(args[0])
+
+    def _cmd_journal(self, args):
+        try:
+            return self.sys.dispatch("sys_read", ["/var/log/journal/kernel.log"])
+        except:
+            return "(no logs yet)"
+
+    def _cmd_kill(self, args):
+        if len(args) < 1:
+            return "Usage: kill <pid>"
+        ok = self.sys.dispatch("sys_kill", [int(args[0])])
+        return "Killed" if ok else "Failed (perm?)"
+
+    def _cmd_send(self, args):
+        if len(args) < 2:
+            return "Usage: send <pid> <message>"
+        ok = self.sys.dispatch("sys_send", [int(args[0]), " ".join(args[1:])])
+        return "Sent" if ok else "Failed"
+
+    def _cmd_recv(self, args):
+        return self.sys.dispatch("sys_recv")
+
+    def _cmd_strace(self, args):
+        usage = "Usage: strace <pid> | strace -c [pid] | strace -d <pid> | strace on|off"
+        if len(args) < 1:
+            return usage
+        if args[0] in ("on", "off"):
+            ok = self.sys.dispatch("sys_trace", [args[0] == "on"])
+            return f"Tracing {args[0]}" if ok else "Failed (perm?)"
+        if args[0] == "-d" and len(args) > 1:
+            self.sys.dispatch("sys_trace", [False, int(args[1])])
+            return f"Detached from {args[1]}"
+        if args[0] == "-c":
+            pid = int(args[1]) if len(args) > 1 else None
+            rows = self.sys.dispatch("sys_trace_stats", [pid])
+            out = ["SYSCALL              CALLS  ERRORS   P50(us)   P99(us)   MAX(us)"]
+            for r in rows:
+                out.append(f"{r['syscall']:<20} {r['calls']:>5} {r['errors']:>7} "
+                           f"{r['p50_us']:>9} {r['p99_us']:>9} {r['max_us']:>9}")
+            return "\n".join(out)
+
+        try:
+            pid = int(args[0])
+        except ValueError:
+            return usage
+        if not self.sys.dispatch("sys_trace", [True, pid]):
+            return "Failed (no such process or perm?)"
+        out = [f"Tracing {pid} (strace -d {pid} to detach)"]
+        for r in self.sys.dispatch("sys_trace_log", [pid]):
+            status = "ERR " + r["result"] if r["error"] else "= " + r["result"]
+            out.append(f"{r['syscall']}({r['args']}) {status} <{r['duration_us']}us>")
+        return "\n".join(out)
+
+    def _cmd_shutdown(self, args):
+        return self.sys.dispatch("sys_shutdown")
+
+    def _cmd_reboot(self, args):
+        return self.sys.dispatch("sys_reboot")
+
+    def _cmd_dom(self, args):
+        state = self.sys.dispatch("sys_get_state")
+        return str(state)
+
+    def _cmd_create(self, args):
+        if len(args) < 1: return "Usage: create <filename>"
+        filename = args[0]
+        if "." not in filename:
+            filename += ".txt"
+        content = " ".join(args[1:]) if len(args) > 1 else ""
+        self.sys.dispatch("sys_write", [filename, content])
+        return f"Created {filename}"
+
+    def _cmd_navigate(self, args):
+        if len(args) < 1 or args[0] in ["--help", "help", "list"]:
+            return "Available apps: browser, calc, explorer, system, user\nUsage: navigate <app> [args]"
+
+        app_name = args[0]
+        # Allow 'navigate browser' to map to 'run browser' logic
+        # We reuse _run_program but need to adjust args to match 'run <prog> args' signature expected by _run_program
+        # _run_program expects [prog, arg1, arg2...]
+        return self._run_program(args)
+
+    def _cmd_agent(self, args):
+        if len(args) < 1:
+            return "Usage: agent <task description>"
+        task = " ".join(args)
+
+        # Lazy Init Agent
+        if not self.agent:
+            self.io.write("[Shell] Initializing Agent Layer...\n")
+            self.agent = ReActAgent(self.sys)
+
+        self.io.write(f"[Shell] Dispatching task to Agent: '{task}'\n")
+        return self.agent.run(task)
+
+    def _cmd_help(self, args):
+        return (
+            "Commands:\n"
+            "  ls                - list directory\n"
+            "  cat <file>        - read file\n"
+            "  write <f> <text>  - write file\n"
+            "  append <f> <text> - append file\n"
+            "  run <prog> args   - run program in /bin\n"
+            "  ps                - list processes\n"
+            "  strace <pid>      - trace a process's syscalls (-c: summary)\n"
+            "  reboot            - restart OS\n"
+            "  shutdown          - shutdown OS\n"
+            "  help              - show this\n"
+            "  journal           - show system logs\n"
+            "  run-service <svc> - start background service\n"
+            "  dom               - show system state (Agent)\n"
+            "  agent <task>      - give a task to the AI Agent\n"
+            "  create <file>     - create a file (default .txt)\n"
+            "  navigate <app>    - run a user app (browser, etc)\n"
+        )
+
+    # Command name -> handler; one dict lookup per command
+    COMMANDS = {
+        "ls": _cmd_ls,
+        "cat": _cmd_cat,
+        "write": _cmd_write,
+        "append": _cmd_append,
+        "run": _cmd_run,
+        "ps": _cmd_ps,
+        "run-service": _cmd_run_service,
+        "journal": _cmd_journal,
+        "kill": _cmd_kill,
+        "send": _cmd_send,
+        "recv": _cmd_recv,
+        "strace": _cmd_strace,
+        "shutdown": _cmd_shutdown,
+        "reboot": _cmd_reboot,
+        "dom": _cmd_dom,
+        "create": _cmd_create,
+        "navigate": _cmd_navigate,
+        "agent": _cmd_agent,
+        "help": _cmd_help,
+    }
+
     # ========== PROGRAM EXECUTION ==========
     def _run_program(self, args):
         """
@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+
+from loop.kernel.filesystem import FileSystem
+
+
+class _GlobalLockFileSystem(FileSystem):
+    """A single stripe: every operation serializes on one lock."""
+    LOCK_STRIPES = 1
+
+
+def _run(fs_class, threads, ops):
+    fs = fs_class()
+    fs.mkdir("/var/shared")
+    for t in range(threads):
+        fs.mkdir(f"/home/guest/t{t}", uid="guest")
+
+    def worker(t):
+        base = f"/home/guest/t{t}"
+        for i in range(ops):
+            fs.append_file(f"{base}/log", str(i), uid="guest")
+            fs.write_file(f"{base}/f{i % 16}", "x" * (i % 32), uid="guest")
+            fs.read_file(f"{base}/log", uid="guest", offset=0, length=16)
+            fs.list_dir(base, uid="guest")
+            if i % 64 == 0:
+                fs.append_file("/var/shared/log", f"{t}:{i}")
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.time()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.time() - start
+
+    # Correctness: nothing lost, aggregates agree with the content
+    for t in range(threads):
+        assert len(fs.read_file(f"/home/guest/t{t}/log").splitlines()) == ops
+    assert len(fs.read_file("/var/shared/log").splitlines()) == threads * ((ops + 63) // 64)
+    usage = fs.du("/home/guest")
+    expected = sum(
+        len(fs.read_file(f"/home/guest/t{t}/{name}"))
+        for t in range(threads)
+        for name in fs.list_dir(f"/home/guest/t{t}")
+    )
+    assert usage["size"] == expected, (usage, expected)
+    return threads * ops * 4 / elapsed
+
+
+def benchmark_stress(ops=20_000, thread_counts=(1, 2, 4, 8)):
+    """Threads working in separate directories, striped vs one global lock."""
+    switch = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for threads in thread_counts:
+            striped = _run(FileSystem, threads, ops)
+            single = _run(_GlobalLockFileSystem, threads, ops)
+            print(f"{threads} threads: {striped:10.0f} ops/s striped, "
+                  f"{single:10.0f} ops/s global lock ({striped / single:.2f}x)")
+    finally:
+        sys.setswitchinterval(switch)
+
+    if getattr(sys, "_is_gil_enabled", lambda: True)():
+        print("(GIL enabled: threads interleave, so expect flat scaling; "
+              "run on a free-threaded build to see parallel speedup)")
+
+
+if __name__ == "__main__":
+    benchmark_stress(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
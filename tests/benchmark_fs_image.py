@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import time
+
+from loop.kernel.filesystem import FileSystem
+
+
+def _build(files, file_size):
+    fs = FileSystem()
+    payload = "x" * file_size
+    for d in range(files // 100 + 1):
+        fs.mkdir(f"/usr/d{d}")
+    for i in range(files):
+        fs.write_file(f"/usr/d{i // 100}/f{i}", payload)
+    return fs
+
+
+def benchmark_image_load(files=10_000, sizes=(16, 4096, 65536)):
+    """Boot (load) time should track node count, not content size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        image = os.path.join(tmp, "vfs.img")
+        for size in sizes:
+            _build(files, size).save_image(image)
+            mib = os.path.getsize(image) / 1024 / 1024
+
+            fs = FileSystem()
+            start = time.time()
+            fs.load_image(image)
+            load = time.time() - start
+
+            start = time.time()
+            fs.read_file(f"/usr/d0/f{files // 2 % 100}")
+            first_read = time.time() - start
+
+            print(f"{files} files x {size:>6} B ({mib:8.1f} MiB image): "
+                  f"load {load * 1000:7.1f} ms, first read {first_read * 1e6:7.1f} us")
+
+
+if __name__ == "__main__":
+    benchmark_image_load(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
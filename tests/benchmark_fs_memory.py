@@ -0,0 +1,66 @@
+import sys
+import time
+import tracemalloc
+
+from loop.kernel.filesystem import FileNode, DirectoryNode
+
+
+class LegacyPermissions:
+    """Pre-slots layout: a __dict__ holding five strings."""
+    def __init__(self, owner="root", mode="rw", group="root", group_mode="", world_mode=""):
+        self.owner = owner
+        self.group = group
+        self.mode = mode
+        self.group_mode = group_mode
+        self.world_mode = world_mode
+
+
+class LegacyFileNode:
+    def __init__(self, name, data="", owner="root", mode="rw", group="root", group_mode="", world_mode=""):
+        self.name = name
+        self.data = data
+        self.permissions = LegacyPermissions(owner, mode, group, group_mode, world_mode)
+
+
+class LegacyDirectoryNode:
+    def __init__(self, name, owner="root", mode="rw", group="root", group_mode="", world_mode=""):
+        self.name = name
+        self.children = {}
+        self.permissions = LegacyPermissions(owner, mode, group, group_mode, world_mode)
+
+
+def _build(file_cls, dir_cls, count):
+    """Build a two-level tree of `count` nodes (1 dir per 100 files)."""
+    root = dir_cls("/")
+    current = None
+    for i in range(count):
+        if i % 100 == 0:
+            current = dir_cls(f"d{i}", owner="guest", group="guest")
+            root.children[current.name] = current
+        else:
+            node = file_cls(f"f{i}", "", owner="guest", group="guest", world_mode="r")
+            current.children[node.name] = node
+    return root
+
+
+def _measure(label, file_cls, dir_cls, count):
+    tracemalloc.start()
+    start = time.time()
+    tree = _build(file_cls, dir_cls, count)
+    elapsed = time.time() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} {count} nodes: {current / 1024 / 1024:8.1f} MiB  "
+          f"({current / count:6.1f} B/node, build {elapsed:.2f}s)")
+    del tree
+    return current
+
+
+def benchmark_node_memory(count=1_000_000):
+    legacy = _measure("legacy", LegacyFileNode, LegacyDirectoryNode, count)
+    slotted = _measure("slotted", FileNode, DirectoryNode, count)
+    print(f"Reduction: {100 * (1 - slotted / legacy):.1f}%")
+
+
+if __name__ == "__main__":
+    benchmark_node_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
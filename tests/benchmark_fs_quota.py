@@ -0,0 +1,71 @@
+import sys
+import time
+
+from loop.kernel.filesystem import FileSystem
+
+
+def _build(depth):
+    fs = FileSystem()
+    path = ""
+    for d in range(depth):
+        path += f"/d{d}"
+        fs.mkdir(path)
+    return fs, path
+
+
+def _writes(fs, base, n):
+    start = time.time()
+    for i in range(n):
+        fs.write_file(f"{base}/f{i % 1000}", "x" * (i % 64))
+        fs.append_file(f"{base}/log", "entry")
+    return time.time() - start
+
+
+def benchmark_write_throughput(n=100_000, depths=(1, 2, 4, 8)):
+    """Per-write accounting is O(depth); compare against writes with it disabled."""
+    account = FileSystem._account
+    for depth in depths:
+        fs, base = _build(depth)
+        with_acct = _writes(fs, base, n)
+
+        FileSystem._account = lambda self, key, size, inodes: None
+        try:
+            fs, base = _build(depth)
+            without = _writes(fs, base, n)
+        finally:
+            FileSystem._account = account
+
+        print(f"depth {depth:>2}: {2 * n / with_acct:10.0f} ops/s with accounting, "
+              f"{2 * n / without:10.0f} ops/s without ({with_acct / without - 1:+.1%})")
+
+
+def benchmark_du(files=100_000):
+    """du() reads the aggregates instead of walking the tree."""
+    fs = FileSystem()
+    for d in range(files // 100):
+        fs.mkdir(f"/usr/d{d}")
+        for i in range(100):
+            fs.write_file(f"/usr/d{d}/f{i}", "x" * 32)
+
+    start = time.time()
+    usage = fs.du("/usr")
+    fast = time.time() - start
+
+    start = time.time()
+    stack, size = [fs.root.children["usr"]], 0
+    while stack:
+        node = stack.pop()
+        if hasattr(node, "children"):
+            stack.extend(node.children.values())
+        else:
+            size += len(node.data)
+    walk = time.time() - start
+
+    assert size == usage["size"]
+    print(f"du over {files} files: {fast * 1e6:.1f} us (aggregates) vs {walk * 1000:.1f} ms (walk)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    benchmark_write_throughput(n)
+    benchmark_du()
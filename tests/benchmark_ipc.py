@@ -0,0 +1,60 @@
+import sys
+import time
+from unittest.mock import Mock
+
+from loop.kernel.process import Process, Sleep
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+
+
+def _polling_consumer(handler, n, steps):
+    """Consumer before blocking receive: poll the inbox every tick."""
+    got = 0
+    while got < n:
+        steps[0] += 1
+        if handler.sys_recv() is not None:
+            got += 1
+        yield
+
+
+def _blocking_consumer(handler, n, steps):
+    got = 0
+    while got < n:
+        steps[0] += 1
+        yield handler.sys_recv(block=True)
+        got += 1
+
+
+def _producer(handler, pid, n, gap):
+    for i in range(n):
+        yield Sleep(gap)
+        handler.sys_send(pid, i)
+
+
+def _run(consumer, n, gap):
+    scheduler = Scheduler()
+    handler = SyscallHandler(scheduler=scheduler, user_manager=Mock(), network_manager=Mock())
+    steps = [0]
+    c = Process("consumer", consumer(handler, n, steps))
+    scheduler.add(c)
+    scheduler.add(Process("producer", _producer(handler, c.pid, n, gap)))
+
+    start = time.perf_counter()
+    while c in scheduler.processes:
+        scheduler.run(max_steps=1)
+    elapsed = time.perf_counter() - start
+    handler.journal.close()
+    return steps[0], elapsed
+
+
+def benchmark_receive(n=200, gap=0.002):
+    """Consumer steps and wall time to receive n messages sent every `gap` seconds."""
+    print(f"{'consumer':<10} {'steps':>8} {'seconds':>8}")
+    for name, consumer in (("polling", _polling_consumer), ("blocking", _blocking_consumer)):
+        steps, elapsed = _run(consumer, n, gap)
+        print(f"{name:<10} {steps:>8} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    benchmark_receive(n)
@@ -0,0 +1,61 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from loop.kernel import rootfs
+from loop.kernel.journal import Journal
+from loop.kernel.syscall import SyscallHandler
+
+
+def _handler(root):
+    scheduler = Mock()
+    scheduler.current_process.uid = "root"
+    handler = SyscallHandler(scheduler=scheduler, user_manager=Mock(), network_manager=Mock())
+    handler.journal = Journal(root / "var" / "logs" / "kernel.log")
+    return handler
+
+
+def _legacy_sys_log(self, msg):
+    """sys_log before the journal: one resolve + mkdir + open per line."""
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        self.sys_append("/var/logs/kernel.log", f"{timestamp} {msg}")
+    except Exception:
+        pass
+    return True
+
+
+def _writes(handler, n):
+    start = time.time()
+    for i in range(n):
+        handler.sys_write(f"/home/f{i % 100}.txt", "data")
+    return time.time() - start
+
+
+def benchmark_write_syscalls(n=20_000):
+    """sys_write throughput with the old per-line sys_log and with each journal durability."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        with patch.object(rootfs, "_RESOLVED_ROOT", root):
+            rootfs.invalidate()
+
+            handler = _handler(root)
+            with patch.object(SyscallHandler, "sys_log", _legacy_sys_log):
+                legacy = _writes(handler, n)
+            print(f"legacy sys_log   : {n / legacy:10.0f} writes/s")
+
+            for durability, count in (("buffered", n), ("fsync", n), ("sync", n // 10)):
+                handler = _handler(root)
+                handler.journal.configure(durability=durability)
+                elapsed = _writes(handler, count)
+                handler.journal.close()
+                print(f"journal {durability:<9}: {count / elapsed:10.0f} writes/s "
+                      f"({handler.journal.commits} commits for {count} records)")
+            rootfs.invalidate()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    benchmark_write_syscalls(n)
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+from loop.kernel.process import Offload, Process
+from loop.kernel.scheduler import Scheduler
+
+
+def crunch(n):
+    """CPU-bound work: sum of squares."""
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def _inline(chunks, n):
+    for _ in range(chunks):
+        crunch(n)
+        yield
+
+
+def _offloaded(chunks, n):
+    for _ in range(chunks):
+        yield Offload(crunch, n)
+
+
+def _run(target, procs, chunks, n, workers):
+    scheduler = Scheduler()
+    scheduler.offload_pool.configure(max_workers=workers)
+    # Start the workers outside the timed region
+    warm = Process("warm", _offloaded(1, 1))
+    scheduler.add(warm)
+    scheduler.run()
+
+    for i in range(procs):
+        scheduler.add(Process(f"p{i}", target(chunks, n)))
+    start = time.perf_counter()
+    scheduler.run()
+    elapsed = time.perf_counter() - start
+    scheduler.offload_pool.shutdown()
+    return elapsed
+
+
+def benchmark_offload(procs=8, chunks=4, n=500_000):
+    """Throughput of CPU-bound processes stepping inline vs. offloaded to worker processes."""
+    cores = os.cpu_count() or 1
+    total = procs * chunks
+    inline = _run(_inline, procs, chunks, n, 1)
+    print(f"inline (1 thread)   : {total / inline:8.1f} chunks/s")
+    for workers in sorted({1, 2, cores}):
+        elapsed = _run(_offloaded, procs, chunks, n, workers)
+        print(f"offload x{workers:<2} workers : {total / elapsed:8.1f} chunks/s ({inline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    procs = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    benchmark_offload(procs)
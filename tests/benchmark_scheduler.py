@@ -0,0 +1,67 @@
+import sys
+import threading
+import time
+
+from loop.kernel.process import Process, Wait
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.sched_policy import create_policy
+
+
+def _background(step_us):
+    """CPU-bound generator: busy for step_us per step."""
+    while True:
+        end = time.perf_counter() + step_us / 1e6
+        while time.perf_counter() < end:
+            pass
+        yield
+
+
+def _shell(latencies, woken_at):
+    """Interactive process: blocks until a 'command' arrives, then handles it."""
+    while True:
+        yield Wait()
+        latencies.append(time.perf_counter() - woken_at[0])
+
+
+def _run(policy, background, duration, step_us=50, interval=0.01):
+    scheduler = Scheduler(create_policy(policy))
+    for i in range(background):
+        scheduler.add(Process(f"bg{i}", _background(step_us), uid="svc", priority=5))
+
+    latencies, woken_at = [], [0.0]
+    shell = Process("shell", _shell(latencies, woken_at), uid="alice", priority=-10)
+    scheduler.add(shell)
+
+    def feeder():
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            time.sleep(interval)
+            woken_at[0] = time.perf_counter()
+            scheduler.wake(shell)
+        scheduler.stop()
+
+    t = threading.Thread(target=feeder, daemon=True)
+    t.start()
+    scheduler.run()
+    t.join()
+
+    latencies.sort()
+    if not latencies:
+        return float("nan"), float("nan"), 0
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return p50, p99, len(latencies)
+
+
+def benchmark_shell_latency(background=500, duration=2.0):
+    """Shell wake-to-run latency with and without CPU-heavy background processes."""
+    print(f"{'policy':<12} {'bg':>4} {'p50 ms':>8} {'p99 ms':>8} {'cmds':>5}")
+    for policy in ("round_robin", "priority", "fair_share", "mlfq"):
+        for n in (0, background):
+            p50, p99, count = _run(policy, n, duration)
+            print(f"{policy:<12} {n:>4} {p50:>8.3f} {p99:>8.3f} {count:>5}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    benchmark_shell_latency(n)
@@ -0,0 +1,51 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from loop.kernel import rootfs, syscall_table
+from loop.kernel.syscall import SyscallHandler
+
+
+def _dispatch_reads(handler, n):
+    start = time.perf_counter()
+    for i in range(n):
+        handler.dispatch("sys_read", [f"/home/f{i % 100}.txt"])
+    return time.perf_counter() - start
+
+
+def benchmark_tracing_overhead(n=50_000):
+    """sys_read throughput through dispatch with tracing off, on, and with per-call records."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        with patch.object(rootfs, "_RESOLVED_ROOT", root):
+            rootfs.invalidate()
+            scheduler = Mock()
+            scheduler.current_process = None
+            handler = SyscallHandler(scheduler=scheduler, user_manager=Mock(), network_manager=Mock())
+            for i in range(100):
+                handler.sys_write(f"/home/f{i}.txt", "data" * 64)
+
+            tracer = syscall_table.TRACER
+            _dispatch_reads(handler, n // 10)  # warm caches
+            base = _dispatch_reads(handler, n)
+            print(f"tracing off : {n / base:10.0f} calls/s")
+
+            tracer.configure(enabled=True)
+            on = _dispatch_reads(handler, n)
+            print(f"stats only  : {n / on:10.0f} calls/s ({(on / base - 1) * 100:+.1f}%)")
+
+            tracer.configure(trace_all=True)
+            traced = _dispatch_reads(handler, n)
+            print(f"stats+trace : {n / traced:10.0f} calls/s ({(traced / base - 1) * 100:+.1f}%)")
+
+            tracer.configure(enabled=False, trace_all=False)
+            tracer.reset()
+            handler.journal.close()
+            rootfs.invalidate()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    benchmark_tracing_overhead(n)
@@ -81,3 +81,18 @@ class TestServiceManagerShutdown:
         # State remains clean
         assert len(scheduler.processes) == 0
         assert len(service_manager.services) == 0
+
+    def test_stopped_service_pid_is_reused(self, service_manager, scheduler, monkeypatch):
+        from loop.kernel import process
+        pids = process.PidAllocator(pid_max=1)
+        monkeypatch.setattr(process, "PIDS", pids)
+
+        service_manager.start_service("svc1", mock_service_gen())
+        first = service_manager.services["svc1"]
+        service_manager._stop_service_single("svc1", force=True)
+        assert first not in scheduler.processes
+        assert pids.stats()["live"] == 0
+
+        # pid_max=1: this only succeeds if the stopped service's PID was released
+        service_manager.start_service("svc2", mock_service_gen())
+        assert service_manager.services["svc2"].pid == first.pid
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from loop.kernel.async_scheduler import AsyncScheduler, to_thread
+from loop.kernel.io import APIAdapter
+from loop.kernel.process import Process, ProcessState, Sleep, Wait
+from loop.kernel.scheduler import Scheduler
+
+
+@pytest.fixture
+def scheduler():
+    return AsyncScheduler()
+
+
+def test_coroutine_process_runs_and_is_reaped(scheduler):
+    events = []
+
+    async def worker():
+        events.append("start")
+        await asyncio.sleep(0.01)
+        events.append("end")
+
+    p = Process("co", worker())
+    scheduler.add(p)
+    scheduler.run()
+
+    assert events == ["start", "end"]
+    assert p.state == ProcessState.TERMINATED
+    assert p.exit_code == 0
+    assert p not in scheduler.processes
+
+
+def test_coroutine_error_exits_with_1(scheduler):
+    async def broken():
+        raise ValueError("boom")
+
+    p = Process("broken", broken())
+    scheduler.add(p)
+    scheduler.run()
+
+    assert p.exit_code == 1
+    assert not scheduler.processes
+
+
+def test_awaiting_coroutine_does_not_block_generators(scheduler):
+    steps = []
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        steps.append("slow done")
+
+    def fast():
+        for i in range(3):
+            steps.append(f"fast {i}")
+            yield
+
+    scheduler.add(Process("slow", slow()))
+    scheduler.add(Process("fast", fast()))
+    scheduler.run()
+
+    assert steps == ["fast 0", "fast 1", "fast 2", "slow done"]
+
+
+def test_generator_yielding_awaitable_gets_result(scheduler):
+    seen = []
+
+    async def fetch(x):
+        await asyncio.sleep(0.01)
+        return x * 2
+
+    async def fail():
+        raise KeyError("missing")
+
+    def proc():
+        seen.append((yield fetch(21)))
+        try:
+            yield fail()
+        except KeyError as e:
+            seen.append(e)
+
+    p = Process("gen", proc())
+    scheduler.add(p)
+    scheduler.run()
+
+    assert seen[0] == 42
+    assert isinstance(seen[1], KeyError)
+    assert p.exit_code == 0
+
+
+def test_generator_sleep_uses_timers(scheduler):
+    def sleeper():
+        yield Sleep(0.05)
+
+    p = Process("sleeper", sleeper())
+    scheduler.add(p)
+    start = time.monotonic()
+    scheduler.run()
+
+    assert time.monotonic() - start >= 0.05
+    assert p.state == ProcessState.TERMINATED
+
+
+def test_sigkill_cancels_coroutine(scheduler):
+    async def forever():
+        await asyncio.sleep(60)
+
+    p = Process("forever", forever())
+    scheduler.add(p)
+
+    async def main():
+        runner = asyncio.ensure_future(scheduler.run_async())
+        await asyncio.sleep(0.01)
+        assert p.state == ProcessState.WAITING
+        p.deliver_signal("SIGKILL")
+        assert scheduler.wake(p)
+        await asyncio.wait_for(runner, 1)
+
+    asyncio.run(main())
+    assert p.exit_code == 1
+    assert not scheduler.processes
+
+
+def test_wake_from_another_thread(scheduler):
+    def waiter():
+        yield Wait()
+
+    p = Process("waiter", waiter())
+    scheduler.add(p)
+    threading.Timer(0.05, scheduler.wake, args=(p,)).start()
+    start = time.monotonic()
+    scheduler.run()
+
+    assert time.monotonic() - start < 0.9
+    assert p.state == ProcessState.TERMINATED
+
+
+def test_current_process_is_per_coroutine(scheduler):
+    seen = {}
+
+    async def who(name):
+        await asyncio.sleep(0)
+        seen[name] = scheduler.current_process
+        seen[name + " thread"] = await to_thread(lambda: scheduler.current_process)
+
+    a = Process("a", who("a"))
+    b = Process("b", who("b"))
+    scheduler.add(a)
+    scheduler.add(b)
+    scheduler.run()
+
+    assert seen == {"a": a, "a thread": a, "b": b, "b thread": b}
+    assert scheduler.current_process is None
+
+
+def test_sync_scheduler_rejects_coroutines_and_awaitables():
+    scheduler = Scheduler()
+    errors = []
+
+    async def co():
+        pass
+
+    def gen():
+        try:
+            yield asyncio.sleep(0)
+        except RuntimeError as e:
+            errors.append(e)
+
+    c = Process("co", co())
+    g = Process("gen", gen())
+    scheduler.add(c)
+    scheduler.add(g)
+    scheduler.run(max_steps=10)
+
+    assert c.exit_code == 1
+    assert g.exit_code == 0
+    assert len(errors) == 1
+
+
+def test_api_adapter_read_async():
+    io = APIAdapter()
+
+    async def main():
+        threading.Timer(0.02, io.input, args=("ls",)).start()
+        return await asyncio.wait_for(io.read_async("> "), 1)
+
+    assert asyncio.run(main()) == "ls"
+    assert io.get_output() == "> "
@@ -1,5 +1,5 @@
 import pytest
-from loop.kernel.filesystem import FileSystem, FileNode, DirectoryNode
+from loop.kernel.filesystem import FileSystem, FileNode, DirectoryNode, QuotaExceededError
 
 @pytest.fixture
 def fs():
@@ -128,3 +128,358 @@ def test_invalid_paths(fs):
 
     with pytest.raises(ValueError, match="Path is a directory"):
         fs.write_file("/home", "data", uid="root")
+
+def test_dentry_cache_hits(fs):
+    fs.mkdir("/home/guest/a", uid="guest")
+    fs.mkdir("/home/guest/a/b", uid="guest")
+    fs.write_file("/home/guest/a/b/c.txt", "deep", uid="guest")
+
+    hits = fs.dcache_stats()["hits"]
+    for _ in range(10):
+        assert fs.read_file("/home/guest/a/b/c.txt", uid="guest") == "deep"
+    assert fs.dcache_stats()["hits"] >= hits + 10
+
+    # Non-canonical spellings resolve to the same dentry
+    assert fs.read_file("home//guest/a/b/c.txt/", uid="guest") == "deep"
+
+def test_dentry_cache_invalidation(fs):
+    fs.write_file("/home/guest/temp", "data", uid="guest")
+    assert fs.get_node_type("/home/guest/temp") == "file"
+
+    fs.delete_file("/home/guest/temp", uid="guest")
+    assert fs.get_node_type("/home/guest/temp") is None
+
+    fs.mkdir("/home/guest/temp", uid="guest")
+    assert fs.get_node_type("/home/guest/temp") == "dir"
+
+def test_rename(fs):
+    fs.mkdir("/home/guest/src", uid="guest")
+    fs.write_file("/home/guest/src/f", "x", uid="guest")
+    assert fs.read_file("/home/guest/src/f", uid="guest") == "x"
+
+    fs.rename("/home/guest/src", "/home/guest/dst", uid="guest")
+    assert fs.get_node_type("/home/guest/src") is None
+    assert fs.get_node_type("/home/guest/src/f") is None
+    assert fs.read_file("/home/guest/dst/f", uid="guest") == "x"
+
+    with pytest.raises(FileNotFoundError):
+        fs.rename("/home/guest/src", "/home/guest/other", uid="guest")
+
+    with pytest.raises(PermissionError):
+        fs.rename("/home/guest/dst", "/etc/dst", uid="guest")
+
+def test_permission_bits_roundtrip():
+    from loop.kernel.filesystem import Permissions
+
+    perm = Permissions(owner="guest", mode="rw", group="staff", group_mode="r", world_mode="")
+    assert (perm.mode, perm.group_mode, perm.world_mode) == ("rw", "r", "")
+    assert perm.bits == 0o640
+
+    perm.world_mode = "r"
+    perm.mode = "r"
+    assert perm.bits == 0o444
+    assert perm.owner == "guest" and perm.group == "staff"
+
+def test_nodes_are_slotted(fs):
+    fs.write_file("/home/guest/slim", "x", uid="guest")
+    node = fs._resolve("/home/guest/slim")
+    assert not hasattr(node, "__dict__")
+    assert node.permissions.owner == "guest"
+
+def test_group_permissions(fs):
+    fs.write_file("/home/guest/shared", "team data", uid="guest", groups=["staff"])
+    fs.chmod("/home/guest/shared", group_mode="r", uid="guest")
+
+    assert fs.read_file("/home/guest/shared", uid="bob", groups=["staff"]) == "team data"
+    with pytest.raises(PermissionError):
+        fs.write_file("/home/guest/shared", "x", uid="bob", groups=["staff"])
+    with pytest.raises(PermissionError):
+        fs.read_file("/home/guest/shared", uid="eve", groups=["other"])
+
+def test_append_is_chunked(fs):
+    for i in range(100):
+        fs.append_file("/var/log/journal/app.log", f"line {i}")
+
+    node = fs._resolve("/var/log/journal/app.log")
+    expected = "".join(f"line {i}\n" for i in range(100))
+    assert node.size == len(expected)
+    assert fs.read_file("/var/log/journal/app.log") == expected
+
+    # Reading collapses chunks; further appends still work
+    fs.append_file("/var/log/journal/app.log", "tail")
+    assert fs.read_file("/var/log/journal/app.log") == expected + "tail\n"
+
+def test_read_file_range(fs):
+    fs.write_file("/etc/motd", "hello")
+    for word in ["alpha", "beta", "gamma"]:
+        fs.append_file("/etc/motd", word)
+    full = "helloalpha\nbeta\ngamma\n"
+
+    for offset in range(len(full) + 2):
+        for length in (0, 1, 4, 7, 100):
+            assert fs.read_file("/etc/motd", offset=offset, length=length) == full[offset:offset + length]
+    assert fs.read_file("/etc/motd", offset=5) == full[5:]
+
+    with pytest.raises(ValueError):
+        fs.read_file("/etc/motd", offset=-1)
+
+def test_snapshot_restore(fs):
+    fs.write_file("/home/guest/a.txt", "v1", uid="guest")
+    fs.append_file("/var/log/journal/j", "one")
+    snap = fs.snapshot()
+
+    fs.write_file("/home/guest/a.txt", "v2", uid="guest")
+    fs.write_file("/home/guest/b.txt", "new", uid="guest")
+    fs.append_file("/var/log/journal/j", "two")
+    fs.chmod("/home/guest/a.txt", world_mode="r", uid="guest")
+    fs.delete_file("/home/root", uid="root")
+    fs.rename("/etc", "/etc2")
+
+    assert fs.read_file("/home/guest/a.txt", uid="guest") == "v2"
+    assert fs.get_node_type("/etc2") == "dir"
+
+    fs.restore(snap)
+    assert fs.read_file("/home/guest/a.txt", uid="guest") == "v1"
+    assert fs.get_node_type("/home/guest/b.txt") is None
+    assert fs.read_file("/var/log/journal/j") == "one\n"
+    assert fs.get_node_type("/home/root") == "dir"
+    assert fs.get_node_type("/etc") == "dir"
+    assert fs.get_node_type("/etc2") is None
+    with pytest.raises(PermissionError):
+        fs.read_file("/home/guest/a.txt", uid="bob")
+
+    # The snapshot survives restore and can be reused
+    fs.write_file("/home/guest/a.txt", "v3", uid="guest")
+    fs.restore(snap)
+    assert fs.read_file("/home/guest/a.txt", uid="guest") == "v1"
+
+    with pytest.raises(ValueError):
+        fs.restore(9999)
+
+def test_snapshot_structural_sharing(fs):
+    fs.write_file("/usr/big", "x" * 1000)
+    usr = fs._resolve("/usr")
+    snap = fs.snapshot()
+    assert fs.list_snapshots()[0]["overhead_bytes"] == 0
+
+    fs.write_file("/home/guest/n", "y", uid="guest")
+
+    # Untouched subtree is shared, only the modified path was copied
+    assert fs._resolve("/usr") is usr
+    assert fs.root is not fs._snapshots[snap]["root"]
+    overhead = fs.list_snapshots()[0]["overhead_bytes"]
+    assert 0 < overhead < 5000
+
+    fs.drop_snapshot(snap)
+    assert fs.list_snapshots() == []
+
+def test_image_roundtrip(fs, tmp_path):
+    from loop.kernel.fsimage import MappedBlob
+
+    fs.write_file("/home/guest/notes.txt", "héllo wörld", uid="guest")
+    fs.chmod("/home/guest/notes.txt", world_mode="r", uid="guest")
+    fs.write_file("/etc/empty", "")
+    for i in range(5):
+        fs.append_file("/var/log/journal/j", f"entry {i}")
+
+    image = tmp_path / "vfs.img"
+    info = fs.save_image(image)
+    assert info["nodes"] > 10
+
+    loaded = FileSystem()
+    loaded.load_image(image)
+
+    # Content stays mapped until first read
+    node = loaded._resolve("/home/guest/notes.txt")
+    assert isinstance(node._chunks, MappedBlob)
+    assert node.size == len("héllo wörld")
+    assert loaded.read_file("/home/guest/notes.txt", uid="bob") == "héllo wörld"
+    assert loaded.read_file("/var/log/journal/j", offset=8, length=7) == "entry 1"
+    assert loaded.read_file("/etc/empty") == ""
+    assert loaded.get_node_type("/home/guest") == "dir"
+    with pytest.raises(PermissionError):
+        loaded.write_file("/home/guest/notes.txt", "x", uid="bob")
+
+    # Re-saving over the mapped image keeps unread blobs intact
+    loaded.append_file("/var/log/journal/j", "entry 5")
+    loaded.save_image(image)
+    again = FileSystem()
+    again.load_image(image)
+    assert again.read_file("/home/guest/notes.txt") == "héllo wörld"
+    assert again.read_file("/var/log/journal/j").endswith("entry 4\nentry 5\n")
+
+def test_image_rejects_garbage(fs, tmp_path):
+    from loop.kernel.fsimage import ImageFormatError
+
+    bad = tmp_path / "bad.img"
+    bad.write_bytes(b"not an image at all" * 4)
+    with pytest.raises(ImageFormatError):
+        fs.load_image(bad)
+    assert fs.get_node_type("/home/guest") == "dir"
+
+def test_find_by_name_and_owner(fs):
+    fs.mkdir("/home/guest/logs", uid="guest")
+    fs.write_file("/home/guest/logs/app.log", "a", uid="guest")
+    fs.write_file("/home/guest/logs/db.log", "b", uid="guest")
+    fs.write_file("/home/guest/logs/app.txt", "c", uid="guest")
+    fs.write_file("/var/log/kernel.log", "k")
+
+    assert fs.find("*.log") == [
+        "/home/guest/logs/app.log",
+        "/home/guest/logs/db.log",
+        "/var/log/kernel.log",
+    ]
+    assert fs.find("app*") == ["/home/guest/logs/app.log", "/home/guest/logs/app.txt"]
+    assert fs.find("*.log", owner="guest") == ["/home/guest/logs/app.log", "/home/guest/logs/db.log"]
+    assert fs.find("d?.log") == ["/home/guest/logs/db.log"]
+    assert fs.find("[ad]*.log", owner="guest") == ["/home/guest/logs/app.log", "/home/guest/logs/db.log"]
+
+    # Index follows deletes and renames
+    fs.delete_file("/home/guest/logs/db.log", uid="guest")
+    fs.rename("/home/guest/logs", "/home/guest/archive", uid="guest")
+    assert fs.find("*.log", owner="guest") == ["/home/guest/archive/app.log"]
+
+    # Entries under directories the user cannot list are hidden
+    assert fs.find("kernel.log", uid="guest") == []
+
+def test_glob(fs):
+    fs.mkdir("/home/guest/a", uid="guest")
+    fs.mkdir("/home/guest/a/b", uid="guest")
+    fs.write_file("/home/guest/a/notes1.txt", "", uid="guest")
+    fs.write_file("/home/guest/a/b/notes2.txt", "", uid="guest")
+    fs.write_file("/home/guest/a/b/other.md", "", uid="guest")
+
+    assert fs.glob("/home/*/a/notes*.txt") == ["/home/guest/a/notes1.txt"]
+    assert fs.glob("/home/**/*.txt") == ["/home/guest/a/b/notes2.txt", "/home/guest/a/notes1.txt"]
+    assert fs.glob("/home/guest/a/**") == [
+        "/home/guest/a",
+        "/home/guest/a/b",
+        "/home/guest/a/b/notes2.txt",
+        "/home/guest/a/b/other.md",
+        "/home/guest/a/notes1.txt",
+    ]
+
+def test_index_rebuilt_after_restore(fs):
+    snap = fs.snapshot()
+    fs.write_file("/home/guest/temp.log", "", uid="guest")
+    assert fs.find("*.log") == ["/home/guest/temp.log"]
+
+    fs.restore(snap)
+    assert fs.find("*.log") == []
+    fs.write_file("/etc/after.log", "")
+    assert fs.find("*.log") == ["/etc/after.log"]
+
+def _walk_usage(node):
+    if isinstance(node, FileNode):
+        return len(node.data), 1
+    size, inodes = 0, 1
+    for child in node.children.values():
+        s, i = _walk_usage(child)
+        size += s
+        inodes += i
+    return size, inodes
+
+def test_subtree_accounting(fs):
+    base = fs.du("/")
+    fs.mkdir("/home/guest/docs", uid="guest")
+    fs.write_file("/home/guest/docs/a.txt", "12345", uid="guest")
+    fs.append_file("/home/guest/docs/a.txt", "678", uid="guest")
+    fs.write_file("/home/guest/b.txt", "xy", uid="guest")
+
+    assert fs.du("/home/guest/docs") == {"size": 9, "inodes": 2}
+    assert fs.du("/home/guest") == {"size": 11, "inodes": 4}
+    assert fs.du("/") == {"size": base["size"] + 11, "inodes": base["inodes"] + 3}
+
+    fs.write_file("/home/guest/docs/a.txt", "1", uid="guest")
+    fs.rename("/home/guest/docs", "/var/docs")
+    assert fs.du("/home/guest") == {"size": 2, "inodes": 2}
+    assert fs.du("/var") == {"size": 1, "inodes": 5}
+
+    fs.delete_file("/var/docs/a.txt")
+    assert fs.du("/var/docs") == {"size": 0, "inodes": 1}
+    assert fs.get_usage("guest")["size"] == 2
+    assert fs.get_usage("guest")["inodes"] == 3  # home dir, b.txt, docs
+
+    # Aggregates match a full walk, also after restoring a snapshot
+    snap = fs.snapshot()
+    fs.write_file("/var/docs/big", "z" * 100)
+    fs.restore(snap)
+    assert (fs.du("/")["size"], fs.du("/")["inodes"]) == _walk_usage(fs.root)
+    assert fs.get_usage("root")["size"] == 0
+
+def test_quota_enforced(fs):
+    fs.set_quota("guest", max_size=10, max_inodes=3)
+    with pytest.raises(PermissionError):
+        fs.set_quota("guest", max_size=1, uid="guest")
+
+    fs.write_file("/home/guest/a", "12345", uid="guest")
+    with pytest.raises(QuotaExceededError):
+        fs.write_file("/home/guest/b", "123456", uid="guest")
+    with pytest.raises(QuotaExceededError):
+        fs.append_file("/home/guest/a", "12345", uid="guest")
+    assert fs.read_file("/home/guest/a") == "12345"
+
+    # Shrinking is always allowed and frees space
+    fs.write_file("/home/guest/a", "1", uid="guest")
+    fs.write_file("/home/guest/b", "123456789", uid="guest")
+    with pytest.raises(QuotaExceededError):
+        fs.mkdir("/home/guest/dir", uid="guest")  # home dir + a + b = 3 inodes
+
+    fs.set_quota("guest")
+    fs.mkdir("/home/guest/dir", uid="guest")
+    assert fs.get_usage("guest") == {"size": 10, "inodes": 4, "max_size": None, "max_inodes": None}
+
+def test_image_restores_accounting(fs, tmp_path):
+    fs.write_file("/home/guest/a", "hello", uid="guest")
+    fs.mkdir("/home/guest/d", uid="guest")
+    fs.write_file("/home/guest/d/b", "world!", uid="guest")
+    image = tmp_path / "vfs.img"
+    fs.save_image(image)
+
+    loaded = FileSystem()
+    loaded.load_image(image)
+    assert loaded.du("/home/guest") == fs.du("/home/guest")
+    assert loaded.du("/") == fs.du("/")
+    assert loaded.get_usage("guest") == fs.get_usage("guest")
+
+def test_concurrent_appends_and_snapshots(fs):
+    import sys
+    import threading
+
+    fs.mkdir("/var/shared")
+    threads_n, lines = 8, 300
+    errors = []
+
+    def worker(t):
+        try:
+            fs.mkdir(f"/var/t{t}")
+            for i in range(lines):
+                fs.append_file("/var/shared/log", f"{t}:{i}")
+                fs.write_file(f"/var/t{t}/f{i % 10}", "x" * i)
+                fs.read_file("/var/shared/log")
+                if i % 50 == 0:
+                    fs.snapshot()
+                    fs.find("f1")
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    # Switch threads as often as possible to provoke interleavings
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads_n)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not errors
+    content = fs.read_file("/var/shared/log").splitlines()
+    assert len(content) == threads_n * lines
+    for t in range(threads_n):
+        mine = [int(line.split(":")[1]) for line in content if line.startswith(f"{t}:")]
+        assert mine == list(range(lines))
+    assert (fs.du("/")["size"], fs.du("/")["inodes"]) == _walk_usage(fs.root)
+    assert sorted(fs.find("f1")) == [f"/var/t{t}/f1" for t in range(threads_n)]
@@ -0,0 +1,46 @@
+import time
+import pytest
+from loop.kernel.journal import Journal
+
+
+def test_group_commit_on_size(tmp_path):
+    path = tmp_path / "logs" / "kernel.log"
+    journal = Journal(path, flush_bytes=20, flush_interval=60)
+    journal.write("one")
+    assert journal.commits == 0
+    assert journal.tail() == ["one"]
+
+    journal.write("a much longer record")
+    assert journal.commits == 1
+    assert path.read_text() == "one\na much longer record\n"
+    journal.close()
+
+
+def test_time_threshold_flushes(tmp_path):
+    path = tmp_path / "kernel.log"
+    journal = Journal(path, flush_interval=0.05)
+    journal.write("tick")
+    deadline = time.time() + 5
+    while journal.commits == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert path.read_text() == "tick\n"
+    journal.close()
+
+
+def test_close_flushes_and_sync_commits_each_record(tmp_path):
+    path = tmp_path / "kernel.log"
+    journal = Journal(path, flush_interval=60)
+    journal.write("pending")
+    journal.close()
+    assert path.read_text() == "pending\n"
+    journal.write("after close")
+    assert journal.stats()["pending"] == 0
+
+    journal = Journal(path, durability="sync")
+    journal.write("a")
+    journal.write("b")
+    assert journal.commits == 2
+    journal.close()
+
+    with pytest.raises(ValueError):
+        Journal(path, durability="eventually")
@@ -0,0 +1,91 @@
+import pytest
+from loop.kernel.process import Offload, Process, ProcessState
+from loop.kernel.scheduler import Scheduler
+
+
+def burn(n):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def fail(msg):
+    raise ValueError(msg)
+
+
+@pytest.fixture
+def scheduler():
+    s = Scheduler()
+    s.offload_pool.configure(max_workers=2)
+    yield s
+    s.offload_pool.shutdown()
+
+
+def test_offload_result_is_sent_into_generator(scheduler):
+    results = []
+    def worker():
+        results.append((yield Offload(burn, 200_000)))
+        results.append((yield Offload(burn, 10)))
+
+    p = Process("cpu", worker())
+    scheduler.add(p)
+    scheduler.run()
+
+    assert results == [burn(200_000), burn(10)]
+    assert p.state == ProcessState.TERMINATED
+    assert p.exit_code == 0
+    assert p.cpu_time > 0
+    assert scheduler.offload_pool.stats()["completed"] == 2
+
+
+def test_offload_exception_is_raised_at_yield(scheduler):
+    caught = []
+    def worker():
+        try:
+            yield Offload(fail, "boom")
+        except ValueError as e:
+            caught.append(str(e))
+
+    scheduler.add(Process("cpu", worker()))
+    scheduler.run()
+    assert caught == ["boom"]
+
+
+def test_unpicklable_offload_fails_the_process(scheduler):
+    def worker():
+        yield Offload(lambda: 1)
+
+    p = Process("cpu", worker())
+    scheduler.add(p)
+    scheduler.run()
+    assert p.exit_code == 1
+
+
+def test_other_processes_run_while_offloaded(scheduler):
+    ticks = []
+    def cpu():
+        yield Offload(burn, 2_000_000)
+    def ticker():
+        for _ in range(5):
+            ticks.append(1)
+            yield
+
+    scheduler.add(Process("cpu", cpu()))
+    scheduler.add(Process("ticker", ticker()))
+    scheduler.run(max_steps=5)
+    assert len(ticks) == 5
+    scheduler.run()
+
+
+def test_shutdown_cancels_pending_calls():
+    from loop.kernel.offload import OffloadPool
+    pool = OffloadPool(max_workers=1)
+    outcomes = []
+    for _ in range(4):
+        pool.submit(Offload(burn, 5_000_000), lambda ok, value, cpu: outcomes.append(ok))
+    pool.shutdown(wait=True)
+
+    assert len(outcomes) == 4
+    assert outcomes.count(False) >= 2  # queued behind the running call
+    assert not pool.stats()["running"]
@@ -0,0 +1,54 @@
+import gc
+import pytest
+from loop.kernel.process import PidAllocator, Process, PIDS
+
+
+def idle():
+    while True:
+        yield
+
+
+def test_pids_unique_under_burst():
+    procs = [Process(f"p{i}", idle()) for i in range(1000)]
+    assert len({p.pid for p in procs}) == 1000
+
+
+def test_allocator_wraps_and_reuses_freed_pids():
+    pids = PidAllocator(pid_max=3)
+    assert [pids.allocate() for _ in range(3)] == [1, 2, 3]
+    with pytest.raises(RuntimeError):
+        pids.allocate()
+
+    pids.release(2)
+    pids.release(1)
+    assert pids.allocate() == 2
+    assert pids.allocate() == 1
+    assert pids.stats() == {"live": 3, "free": 0, "next": 4, "pid_max": 3}
+
+
+def test_pid_released_once():
+    live = PIDS.stats()["live"]
+    p = Process("short", idle())
+    assert PIDS.stats()["live"] == live + 1
+
+    p.release_pid()
+    p.release_pid()
+    del p
+    gc.collect()
+    assert PIDS.stats()["live"] == live
+
+
+def test_pid_released_on_garbage_collection():
+    live = PIDS.stats()["live"]
+    Process("dropped", idle())
+    gc.collect()
+    assert PIDS.stats()["live"] == live
+
+
+def test_inbox_fifo_and_bounded():
+    p = Process("mailbox", idle(), inbox_limit=2)
+    assert p.send("a") and p.send("b")
+    assert not p.send("c")
+    assert p.receive() == "a"
+    assert p.send("c")
+    assert [p.receive(), p.receive(), p.receive()] == ["b", "c", None]
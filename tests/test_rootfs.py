@@ -0,0 +1,67 @@
+import os
+import shutil
+import pytest
+from loop.kernel import rootfs
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    base = tmp_path.resolve()
+    (base / "home" / "a" / "b").mkdir(parents=True)
+    (base / "home" / "a" / "notes.txt").write_text("x")
+    monkeypatch.setattr(rootfs, "_RESOLVED_ROOT", base)
+    rootfs.invalidate()
+    yield base
+    rootfs.invalidate()
+
+
+def test_resolve_matches_path_resolve(root):
+    for vpath in ["/", "/home/a/b/new.txt", "home/a/notes.txt",
+                  "/home/missing/../a", "/home/a/b/../../a/./b"]:
+        assert rootfs.resolve(vpath) == (root / vpath.lstrip("/")).resolve()
+
+
+def test_resolve_blocks_escapes(root):
+    os.symlink("/etc", root / "home" / "evil")
+    for vpath in ["/../etc/passwd", "/home/../../x", "/home/evil/passwd"]:
+        with pytest.raises(rootfs.SecurityError):
+            rootfs.resolve(vpath)
+
+
+def test_resolve_follows_symlinks_inside_root(root):
+    os.symlink("a/b", root / "home" / "rel")
+    os.symlink(str(root / "home" / "a"), root / "home" / "abs")
+    assert rootfs.resolve("/home/rel/x") == root / "home" / "a" / "b" / "x"
+    assert rootfs.resolve("/home/abs/b") == root / "home" / "a" / "b"
+
+
+def test_prefix_cache_hits_and_invalidation(root):
+    rootfs.resolve("/home/a/b/one.txt")
+    rootfs.resolve("/home/a/b/two.txt")
+    stats = rootfs.resolve_cache_stats()
+    assert stats["hits"] >= 1
+    assert stats["entries"] == 3
+
+    rootfs.invalidate("/home/a")
+    stats = rootfs.resolve_cache_stats()
+    assert stats["entries"] == 1
+    assert stats["invalidations"] >= 1
+
+
+def test_swapped_directory_is_not_served_from_cache(root):
+    rootfs.resolve("/home/a/b/x")
+    shutil.rmtree(root / "home" / "a")
+    os.symlink("/etc", root / "home" / "a")
+    with pytest.raises(rootfs.SecurityError):
+        rootfs.resolve("/home/a/b/x")
+
+
+def test_resolve_many_matches_resolve_and_reports_errors(root):
+    paths = ["/home/a/notes.txt", "/home/a/b", "/home/a/missing.txt", "/../etc/passwd", "/"]
+    results = rootfs.resolve_many(paths)
+
+    assert results[0] == root / "home" / "a" / "notes.txt"
+    assert results[1] == root / "home" / "a" / "b"
+    assert results[2] == root / "home" / "a" / "missing.txt"
+    assert isinstance(results[3], rootfs.SecurityError)
+    assert results[4] == root
@@ -0,0 +1,112 @@
+import pytest
+from loop.kernel.process import Process
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.sched_policy import (
+    FairSharePolicy, MLFQPolicy, PriorityPolicy, RoundRobinPolicy,
+    create_policy, policy_from_config,
+)
+
+
+class proc:
+    def __init__(self, name, uid="root", priority=0):
+        self.name, self.uid, self.priority = name, uid, priority
+
+
+def test_round_robin_is_fifo():
+    policy = RoundRobinPolicy()
+    a, b = proc("a"), proc("b")
+    policy.push(a)
+    policy.push(b)
+    assert len(policy) == 2
+    assert [policy.pop(), policy.pop(), policy.pop()] == [a, b, None]
+
+
+def test_priority_runs_lowest_value_first():
+    policy = PriorityPolicy()
+    bg1, bg2, shell = proc("bg1", priority=5), proc("bg2", priority=5), proc("shell", priority=-10)
+    for p in (bg1, bg2, shell):
+        policy.push(p)
+    assert policy.pop() is shell
+    policy.push(shell)
+    assert policy.pop() is shell
+    assert [policy.pop(), policy.pop(), policy.pop()] == [bg1, bg2, None]
+
+
+def test_fair_share_splits_cpu_by_weight():
+    policy = FairSharePolicy(weights={"alice": 3})
+    procs = [proc(f"a{i}", "alice") for i in range(5)] + [proc(f"b{i}", "bob") for i in range(5)]
+    for p in procs:
+        policy.push(p)
+
+    runs = {"alice": 0, "bob": 0}
+    for _ in range(400):
+        p = policy.pop()
+        runs[p.uid] += 1
+        policy.charge(p, 0.001)
+        policy.push(p)
+    assert runs["alice"] == pytest.approx(300, abs=5)
+    assert runs["bob"] == pytest.approx(100, abs=5)
+
+
+def test_mlfq_demotes_cpu_heavy_and_boosts():
+    policy = MLFQPolicy(levels=3, quantum=0.01, boost_interval=0)
+    hog, light = proc("hog"), proc("light")
+    policy.push(hog)
+    assert policy.pop() is hog
+    policy.charge(hog, 0.02)
+    assert policy.level_of(hog) == 1
+
+    policy.push(hog)
+    policy.push(light)
+    assert policy.pop() is light
+    policy.charge(light, 0.0001)
+    assert policy.level_of(light) == 0
+
+    policy.boost_interval = 1e-9
+    assert policy.pop() is hog
+    assert policy.level_of(hog) == 0
+
+
+def test_policy_from_config():
+    assert isinstance(policy_from_config({}), RoundRobinPolicy)
+    fair = policy_from_config({"policy": "fair_share", "fair_share_weights": "root:2, alice:0.5"})
+    assert fair.weights == {"root": 2.0, "alice": 0.5}
+    mlfq = policy_from_config({"policy": "mlfq", "mlfq_levels": "4", "mlfq_quantum_ms": "5"})
+    assert (mlfq.levels, mlfq.quantum) == (4, 0.005)
+    with pytest.raises(ValueError):
+        create_policy("lottery")
+
+
+def test_fair_share_rejects_non_positive_weights():
+    for weights in ("root:2, alice:0", "bob:-1"):
+        with pytest.raises(ValueError, match="alice:0|bob:-1"):
+            policy_from_config({"policy": "fair_share", "fair_share_weights": weights})
+    with pytest.raises(ValueError):
+        FairSharePolicy(weights={"alice": 0})
+
+
+def test_scheduler_switches_policy_with_queued_processes():
+    def gen(out, name):
+        while True:
+            out.append(name)
+            yield
+
+    order = []
+    scheduler = Scheduler()
+    scheduler.add(Process("bg", gen(order, "bg"), priority=5))
+    scheduler.add(Process("shell", gen(order, "shell"), priority=-10))
+    scheduler.run(max_steps=1)
+    assert order == ["bg", "shell"]
+
+    scheduler.set_policy(PriorityPolicy())
+    order.clear()
+    scheduler.run(max_steps=1)
+    assert order == ["shell", "shell"]
+
+
+def test_mlfq_rejects_bad_levels_and_quantum():
+    for section in ({"mlfq_levels": "0"}, {"mlfq_quantum_ms": "0"}, {"mlfq_quantum_ms": "-1"}):
+        with pytest.raises(ValueError):
+            policy_from_config({"policy": "mlfq", **section})
+    with pytest.raises(ValueError):
+        MLFQPolicy(levels=0)
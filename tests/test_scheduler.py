@@ -1,7 +1,9 @@
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
 from loop.kernel.scheduler import Scheduler
-from loop.kernel.process import Process, ProcessState
+from loop.kernel.process import Process, ProcessState, Sleep, Wait
 
 # Helper generator for processes
 def dummy_process_target():
@@ -67,3 +69,191 @@ def test_scheduler_signals_kill(scheduler):
     scheduler.run(max_steps=1)
 
     assert p not in scheduler.processes
+
+def test_process_table_indexes(scheduler):
+    procs = [Process(f"p{i}", dummy_process_target(), "alice" if i % 2 else "root") for i in range(6)]
+    for i, p in enumerate(procs):
+        p.pid = 100 + i
+        scheduler.add(p)
+
+    assert scheduler.get_process(103) is procs[3]
+    assert scheduler.get_process(999) is None
+    assert scheduler.processes_for("alice") == [procs[1], procs[3], procs[5]]
+
+    procs[2].state = ProcessState.WAITING
+    assert scheduler.processes.by_state(ProcessState.WAITING) == [procs[2]]
+    assert len(scheduler.processes.by_state(ProcessState.READY)) == 5
+
+    scheduler.processes.remove(procs[1])
+    assert procs[1] not in scheduler.processes
+    assert scheduler.get_process(101) is None
+    assert scheduler.processes_for("alice") == [procs[3], procs[5]]
+    assert len(scheduler.processes) == 5
+    assert set(scheduler.processes) == set(procs) - {procs[1]}
+
+    # Removed processes no longer update the table
+    procs[1].state = ProcessState.WAITING
+    assert scheduler.processes.by_state(ProcessState.WAITING) == [procs[2]]
+
+def test_terminated_process_leaves_indexes(scheduler):
+    p = Process("term_me", dummy_process_target(), "bob")
+    p.pid = 42
+    scheduler.add(p)
+    p.deliver_signal("SIGKILL")
+    scheduler.run(max_steps=1)
+
+    assert scheduler.get_process(42) is None
+    assert scheduler.processes_for("bob") == []
+    assert scheduler.processes.count_by_state() == {}
+
+def test_reaped_process_frees_pid(scheduler):
+    p = Process("reap_me", dummy_process_target(), "root")
+    scheduler.add(p)
+    p.deliver_signal("SIGTERM")
+    scheduler.run(max_steps=1)
+
+    assert p._pid_cell == [None]
+
+def test_sleeping_process_does_not_block_others(scheduler):
+    ticks = []
+    def sleeper():
+        yield Sleep(0.2)
+        ticks.append("woke")
+    def worker():
+        for _ in range(3):
+            ticks.append("work")
+            yield
+
+    scheduler.add(Process("sleeper", sleeper(), "root"))
+    scheduler.add(Process("worker", worker(), "root"))
+    start = time.monotonic()
+    scheduler.run()
+
+    assert time.monotonic() - start >= 0.2
+    assert ticks == ["work", "work", "work", "woke"]
+    assert len(scheduler.processes) == 0
+
+def test_idle_scheduler_sleeps_until_deadline(scheduler):
+    steps = []
+    def sleeper():
+        yield Sleep(0.3)
+        steps.append("done")
+
+    scheduler.add(Process("sleeper", sleeper(), "root"))
+    with patch.object(scheduler, "_idle", wraps=scheduler._idle) as idle:
+        scheduler.run()
+
+    assert steps == ["done"]
+    # Parked until the deadline instead of spinning
+    assert idle.call_count <= 3
+
+def test_wait_until_woken_from_another_thread(scheduler):
+    got = []
+    def waiter():
+        yield Wait()
+        got.append("woken")
+
+    p = Process("waiter", waiter(), "root")
+    scheduler.add(p)
+    threading.Timer(0.1, scheduler.wake, args=(p,)).start()
+    scheduler.run(max_steps=20)
+
+    assert got == ["woken"]
+    assert p not in scheduler.processes
+
+def test_wait_timeout_wakes_process(scheduler):
+    def waiter():
+        yield Wait(timeout=0.05)
+        yield
+
+    p = Process("waiter", waiter(), "root")
+    scheduler.add(p)
+    scheduler.run(max_steps=1)
+    assert p.state == ProcessState.WAITING
+    assert len(scheduler.run_queue) == 0
+
+    scheduler.run()
+    assert p.state == ProcessState.TERMINATED
+
+def test_external_state_change_requeues(scheduler):
+    p = Process("blocked", dummy_process_target(), "root")
+    p.state = ProcessState.WAITING
+    scheduler.add(p)
+    scheduler.run(max_steps=1)
+    assert p.state == ProcessState.WAITING
+    assert p not in scheduler.run_queue
+
+    p.state = ProcessState.READY
+    scheduler.run(max_steps=1)
+    assert p.state == ProcessState.READY
+    assert p in scheduler.run_queue
+
+def test_signal_reaches_sleeping_process(scheduler):
+    from loop.kernel.syscall import SyscallHandler
+    def sleeper():
+        yield Sleep(60)
+
+    p = Process("sleeper", sleeper(), "root")
+    scheduler.add(p)
+    scheduler.run(max_steps=1)
+    assert p.state == ProcessState.WAITING
+
+    handler = SyscallHandler(scheduler=scheduler, user_manager=Mock(), network_manager=Mock())
+    assert handler.sys_kill(p.pid, "SIGKILL")
+    start = time.monotonic()
+    scheduler.run()
+    handler.journal.close()
+
+    assert time.monotonic() - start < 1
+    assert p not in scheduler.processes
+
+def test_blocking_receive_woken_by_send(scheduler):
+    from loop.kernel.syscall import SyscallHandler
+    handler = SyscallHandler(scheduler=scheduler, user_manager=Mock(), network_manager=Mock())
+    received = []
+    steps = 0
+
+    def consumer():
+        nonlocal steps
+        while len(received) < 3:
+            steps += 1
+            received.append((yield handler.sys_recv(block=True)))
+
+    def producer(pid):
+        for i in range(3):
+            yield Sleep(0.01)
+            handler.sys_send(pid, i)
+
+    c = Process("consumer", consumer(), "root")
+    scheduler.add(c)
+    scheduler.add(Process("producer", producer(c.pid), "root"))
+    scheduler.run(max_steps=2)
+    assert c.state == ProcessState.WAITING
+    assert c not in scheduler.run_queue
+
+    scheduler.run()
+    handler.journal.close()
+
+    assert received == [0, 1, 2]
+    assert steps == 3  # one step per message, no polling
+
+
+def test_receive_timeout_and_queued_message(scheduler):
+    from loop.kernel.process import Receive
+    got = []
+
+    def consumer():
+        got.append((yield Receive(timeout=0.02)))
+        c.send("queued")
+        got.append((yield Receive(timeout=5)))
+
+    c = Process("consumer", consumer(), "root")
+    scheduler.add(c)
+    scheduler.run(max_steps=1)
+    assert c.receiving
+
+    start = time.monotonic()
+    scheduler.run()
+
+    assert got == [None, "queued"]
+    assert time.monotonic() - start < 1
@@ -0,0 +1,104 @@
+import inspect
+import pytest
+from unittest.mock import Mock, patch
+from loop.kernel import syscall_table
+from loop.kernel.syscall import SyscallHandler
+from loop.kernel.users import UserManager
+
+
+@pytest.fixture
+def syscall_handler():
+    mock_scheduler = Mock()
+    mock_scheduler.current_process.uid = "root"
+    user_manager = Mock(spec=UserManager)
+    user_manager.has_permission.return_value = True
+    return SyscallHandler(scheduler=mock_scheduler, user_manager=user_manager, network_manager=Mock())
+
+
+def test_table_matches_handler_signatures():
+    public = {n for n in dir(SyscallHandler) if n.startswith("sys_")}
+    registered = {e.name for e in syscall_table.table()}
+    assert public == registered
+
+    for entry in syscall_table.table():
+        params = list(inspect.signature(getattr(SyscallHandler, entry.name)).parameters.values())[1:]
+        assert entry.params == tuple(p.name for p in params)
+        assert entry.required == sum(1 for p in params if p.default is inspect.Parameter.empty)
+
+
+def test_dispatch_by_name_and_number(syscall_handler):
+    with patch.object(syscall_handler, "sys_read", return_value="data") as mock_read:
+        assert syscall_handler.dispatch("sys_read", ["/a.txt"]) == "data"
+        nr = syscall_table.lookup("sys_read").nr
+        assert syscall_handler.dispatch(nr, ["/b.txt"], {"resolve": False}) == "data"
+        mock_read.assert_called_with("/b.txt", resolve=False)
+
+
+def test_dispatch_validates_arguments(syscall_handler):
+    with pytest.raises(syscall_table.UnknownSyscallError):
+        syscall_handler.dispatch("sys_nope")
+    with pytest.raises(TypeError):
+        syscall_handler.dispatch("sys_read")
+    with pytest.raises(TypeError):
+        syscall_handler.dispatch("sys_read", ["/a", True, "extra"])
+    with pytest.raises(TypeError):
+        syscall_handler.dispatch("sys_read", ["/a"], {"mode": "r"})
+
+
+def test_dispatch_checks_permission(syscall_handler):
+    syscall_handler.scheduler.current_process.uid = "alice"
+    syscall_handler.user_manager.has_permission.return_value = False
+    with pytest.raises(PermissionError):
+        syscall_handler.dispatch("sys_docker_ps")
+    syscall_handler.user_manager.has_permission.assert_called_with("alice", "manage_docker")
+
+
+def test_risk_comes_from_table():
+    from loop.kernel.confirmation import ConfirmationManager
+    cm = ConfirmationManager()
+    assert cm.assess_risk("sys_delete") == syscall_table.HIGH
+    assert cm.assess_risk("sys_read") == syscall_table.LOW
+    # Read-only container and user queries keep the level the old name rules gave them
+    for name in ("sys_docker_ps", "sys_docker_logs", "sys_k8s_get_pods", "sys_k8s_logs"):
+        assert cm.assess_risk(name) == syscall_table.MEDIUM
+    assert cm.assess_risk("sys_user_list") == syscall_table.HIGH
+    # Entries are not known from the name alone, so a batch is rated as its worst case
+    assert cm.assess_risk("sys_batch") == syscall_table.HIGH
+
+
+def test_run_batch_overlaps_readonly_and_orders_barriers():
+    import threading
+    started = threading.Barrier(3, timeout=5)
+    order = []
+
+    def reader(i):
+        def call():
+            started.wait()  # only passes if all three readers run at once
+            return i
+        return call
+
+    def writer():
+        order.append("write")
+        raise OSError("disk full")
+
+    calls = [(reader(0), True), (reader(1), True), (reader(2), True), (writer, False)]
+    results = syscall_table.run_batch(calls)
+
+    assert [r[1] for r in results[:3]] == [0, 1, 2]
+    assert results[3][0] is False and isinstance(results[3][1], OSError)
+    assert order == ["write"]
+
+
+def test_sys_batch_returns_ordered_completions(syscall_handler):
+    with patch.object(syscall_handler, "sys_read", side_effect=lambda p, resolve=True: p.upper()):
+        completions = syscall_handler.sys_batch([
+            ["sys_read", "/a"],
+            {"syscall": "sys_read", "args": ["/b"]},
+            ["sys_nope"],
+            ["sys_batch", []],
+        ])
+
+    assert completions[0] == {"index": 0, "syscall": "sys_read", "result": "/A"}
+    assert completions[1]["result"] == "/B"
+    assert "Unknown syscall" in completions[2]["error"]
+    assert "nested" in completions[3]["error"]
@@ -1,3 +1,4 @@
+import errno
 import pytest
 import os
 from unittest.mock import Mock, patch, mock_open
@@ -83,6 +84,142 @@ def test_sys_write_read(syscall_handler):
         mock_file.assert_any_call(mock_path, "r")
 
 
+def test_sys_read_many(syscall_handler, tmp_path):
+    (tmp_path / "a.txt").write_text("alpha")
+    with patch("loop.kernel.rootfs.resolve_many") as mock_resolve_many:
+        mock_resolve_many.return_value = [tmp_path / "a.txt", PermissionError("escape")]
+
+        results = syscall_handler.sys_read_many(["/a.txt", "/../x"])
+
+        mock_resolve_many.assert_called_once_with(["/a.txt", "/../x"])
+        assert results[0] == {"path": "/a.txt", "content": "alpha"}
+        assert results[1]["path"] == "/../x"
+        assert "escape" in results[1]["error"]
+
+
+def test_sys_read_ranges(syscall_handler, tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("0123456789")
+
+    assert syscall_handler.sys_read(str(path), resolve=False, offset=3, length=4) == "3456"
+    assert syscall_handler.sys_read(str(path), resolve=False, offset=8) == "89"
+    assert syscall_handler.sys_read(str(path), resolve=False, offset=20, length=5) == ""
+
+    # Same range through the mmap path
+    syscall_handler.READ_MMAP_THRESHOLD = 1
+    assert syscall_handler.sys_read(str(path), resolve=False, offset=3, length=4) == "3456"
+
+
+def test_sys_read_stream_keeps_characters_whole(syscall_handler, tmp_path):
+    path = tmp_path / "utf8.txt"
+    text = "h\u00e9llo w\u00f6rld " * 100
+    path.write_text(text, encoding="utf-8")
+
+    chunks = list(syscall_handler.sys_read_stream(str(path), resolve=False, chunk_size=3))
+    assert "".join(chunks) == text
+    assert all(len(c.encode("utf-8")) <= 4 for c in chunks)
+
+    ranged = syscall_handler.sys_read_stream(str(path), resolve=False, offset=1, length=2, chunk_size=1)
+    assert "".join(ranged) == "\u00e9"
+
+
+def test_sys_write_atomic_and_parent_cache(syscall_handler, tmp_path):
+    target = tmp_path / "sub" / "out.txt"
+    syscall_handler.sys_write(str(target), "old", resolve=False)
+    syscall_handler.sys_write(str(target), "new", resolve=False, atomic=True)
+
+    assert target.read_text() == "new"
+    assert sorted(p.name for p in target.parent.iterdir()) == ["out.txt"]
+    assert target.parent in syscall_handler._known_dirs
+
+    # A cached parent removed behind our back is recreated
+    target.unlink()
+    target.parent.rmdir()
+    syscall_handler.sys_write(str(target), "again", resolve=False)
+    assert target.read_text() == "again"
+
+
+def test_sys_writev(syscall_handler, tmp_path):
+    with patch("loop.kernel.rootfs.resolve_many") as mock_resolve_many, \
+         patch.object(syscall_handler, "sys_log") as mock_log:
+        mock_resolve_many.return_value = [tmp_path / "a.txt", tmp_path / "d" / "b.txt",
+                                          PermissionError("escape")]
+
+        results = syscall_handler.sys_writev([("/a.txt", "A"), ("/d/b.txt", "B"), ("/../x", "X")],
+                                             atomic=True)
+
+        assert results[0] == {"path": "/a.txt", "ok": True}
+        assert results[1] == {"path": "/d/b.txt", "ok": True}
+        assert "escape" in results[2]["error"]
+        assert (tmp_path / "d" / "b.txt").read_text() == "B"
+        mock_log.assert_called_once()
+
+
+def test_sys_copy_and_move(syscall_handler, tmp_path):
+    src = tmp_path / "src"
+    (src / "nested").mkdir(parents=True)
+    (src / "a.txt").write_text("alpha")
+    (src / "nested" / "b.bin").write_bytes(b"\x00\xff" * 1000)
+    os.symlink("a.txt", src / "link")
+
+    seen = []
+    stats = syscall_handler.sys_copy(str(src), str(tmp_path / "copy"), resolve=False,
+                                     recursive=True, progress=lambda d, t, p: seen.append((d, t)))
+    assert stats == {"files": 2, "bytes": 2005}
+    assert (tmp_path / "copy" / "nested" / "b.bin").read_bytes() == b"\x00\xff" * 1000
+    assert os.readlink(tmp_path / "copy" / "link") == "a.txt"
+    assert seen[-1] == (2005, 2005)
+
+    with pytest.raises(IsADirectoryError):
+        syscall_handler.sys_copy(str(src), str(tmp_path / "x"), resolve=False)
+
+    syscall_handler.sys_move(str(tmp_path / "copy"), str(tmp_path / "moved"), resolve=False)
+    assert not (tmp_path / "copy").exists()
+    assert (tmp_path / "moved" / "a.txt").read_text() == "alpha"
+
+
+def test_sys_copy_into_own_subtree_rejected(syscall_handler, tmp_path):
+    src = tmp_path / "a"
+    (src / "sub").mkdir(parents=True)
+    (src / "f.txt").write_text("data")
+
+    with pytest.raises(OSError) as exc:
+        syscall_handler.sys_copy(str(src), str(src / "sub" / "a"), resolve=False, recursive=True)
+    assert exc.value.errno == errno.EINVAL
+    assert not (src / "sub" / "a").exists()
+
+    # Cross-filesystem move falls back to copy-then-delete
+    def cross_device(a, b):
+        raise OSError(errno.EXDEV, "cross-device link")
+    with patch("os.replace", cross_device), pytest.raises(OSError):
+        syscall_handler.sys_move(str(src), str(src / "sub" / "a"), resolve=False)
+    assert (src / "f.txt").read_text() == "data"
+    assert not (src / "sub" / "a").exists()
+
+
+def test_sys_ls_detailed(syscall_handler, tmp_path):
+    (tmp_path / "b_dir" / "deep").mkdir(parents=True)
+    (tmp_path / "b_dir" / "deep" / "x.txt").write_text("x")
+    (tmp_path / "a.txt").write_text("hello")
+    (tmp_path / "c.txt").write_text("")
+
+    listing = syscall_handler.sys_ls_detailed(str(tmp_path), resolve=False)
+    assert [e["name"] for e in listing["entries"]] == ["a.txt", "b_dir", "c.txt"]
+    assert listing["entries"][0]["type"] == "file"
+    assert listing["entries"][0]["size"] == 5
+    assert listing["entries"][1]["type"] == "dir"
+    assert listing["entries"][1]["mode"].startswith("d")
+
+    page = syscall_handler.sys_ls_detailed(str(tmp_path), resolve=False, offset=1, limit=1)
+    assert [e["name"] for e in page["entries"]] == ["b_dir"]
+    assert page["total"] == 3 and page["next_offset"] == 2
+
+    deep = syscall_handler.sys_ls_detailed(str(tmp_path), resolve=False, recursive=True)
+    assert "b_dir/deep/x.txt" in [e["name"] for e in deep["entries"]]
+    shallow = syscall_handler.sys_ls_detailed(str(tmp_path), resolve=False, recursive=True, max_depth=2)
+    assert [e["name"] for e in shallow["entries"]] == ["a.txt", "b_dir", "b_dir/deep", "c.txt"]
+
+
 def test_sys_docker_calls(syscall_handler):
     # Setup docker interface mock
     syscall_handler.docker_interface = Mock()
@@ -0,0 +1,183 @@
+import pytest
+from unittest.mock import Mock, patch
+from loop.kernel import syscall_table
+from loop.kernel.process import Process
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+from loop.kernel.tracing import LatencyHistogram, SyscallTracer
+from loop.kernel.users import UserManager
+
+
+def idle():
+    while True:
+        yield
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    t = SyscallTracer()
+    monkeypatch.setattr(syscall_table, "TRACER", t)
+    return t
+
+
+@pytest.fixture
+def handler(tracer):
+    user_manager = Mock(spec=UserManager)
+    user_manager.has_permission.return_value = True
+    h = SyscallHandler(scheduler=Scheduler(), user_manager=user_manager, network_manager=Mock())
+    h.tracer = tracer
+    return h
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = LatencyHistogram()
+    for v in range(1, 100_001):
+        h.record(v)
+    assert h.count == 100_000
+    assert h.max == 100_000
+    for p in (50, 90, 99):
+        exact = p * 1000
+        assert exact <= h.percentile(p) <= exact * 1.035
+    assert h.percentile(100) == 100_000
+
+
+def test_histogram_buckets_are_contiguous():
+    for v in range(0, 5000):
+        index = LatencyHistogram.bucket(v)
+        assert v <= LatencyHistogram.bucket_high(index)
+        if index:
+            assert v > LatencyHistogram.bucket_high(index - 1)
+
+
+def test_disabled_tracer_records_nothing(handler, tracer):
+    with patch.object(handler, "sys_read", return_value="x"):
+        handler.dispatch("sys_read", ["/a"])
+    assert tracer.stats() == []
+
+
+def test_stats_per_syscall_uid_and_pid(handler, tracer):
+    tracer.configure(enabled=True)
+    alice = Process("a", idle(), uid="alice")
+    handler.scheduler.add(alice)
+
+    with patch.object(handler, "sys_read", return_value="x"), \
+         patch.object(handler, "sys_delete", side_effect=FileNotFoundError("gone")):
+        handler.dispatch("sys_read", ["/a"])
+        handler.scheduler.current_process = alice
+        handler.dispatch("sys_read", ["/b"])
+        with pytest.raises(FileNotFoundError):
+            handler.dispatch("sys_delete", ["/c"])
+
+    handler.scheduler.current_process = None
+    rows = {r["syscall"]: r for r in handler.sys_trace_stats()}
+    assert rows["sys_read"]["calls"] == 2
+    assert rows["sys_delete"]["errors"] == 1
+    assert rows["sys_read"]["p99_us"] >= rows["sys_read"]["p50_us"]
+
+    by_alice = handler.sys_trace_stats(pid=alice.pid)
+    assert {r["syscall"]: r["calls"] for r in by_alice} == {"sys_read": 1, "sys_delete": 1}
+    assert [r["calls"] for r in handler.sys_trace_stats(uid="root")] == [1]
+
+
+def test_trace_log_only_for_attached_pids(handler, tracer):
+    alice = Process("a", idle(), uid="alice")
+    bob = Process("b", idle(), uid="bob")
+    handler.scheduler.add(alice)
+    handler.scheduler.add(bob)
+    assert handler.sys_trace(True, alice.pid)
+
+    with patch.object(handler, "sys_read", return_value="y" * 1000):
+        for proc in (alice, bob):
+            handler.scheduler.current_process = proc
+            handler.dispatch("sys_read", ["/data.txt"])
+
+    handler.scheduler.current_process = None
+    log = handler.sys_trace_log()
+    assert [r["pid"] for r in log] == [alice.pid]
+    assert log[0]["args"] == "'/data.txt'"
+    assert len(log[0]["result"]) <= 90
+
+    handler.sys_trace(False, alice.pid)
+    handler.scheduler.current_process = alice
+    with patch.object(handler, "sys_read", return_value="z"):
+        handler.dispatch("sys_read", ["/data.txt"])
+    handler.scheduler.current_process = None
+    assert len(handler.sys_trace_log()) == 1
+
+
+def test_trace_permissions(handler, tracer):
+    alice = Process("a", idle(), uid="alice")
+    bob = Process("b", idle(), uid="bob")
+    handler.scheduler.add(alice)
+    handler.scheduler.add(bob)
+    handler.scheduler.current_process = alice
+
+    assert handler.sys_trace(True) is False
+    assert handler.sys_trace(True, bob.pid) is False
+    assert handler.sys_trace(True, alice.pid) is True
+    assert handler.sys_trace(True, 123456789) is False
+
+    handler.scheduler.current_process = None
+    assert handler.sys_trace(True, bob.pid)
+    handler.scheduler.current_process = alice
+    assert handler.sys_trace(False, bob.pid) is False
+    assert bob.pid in tracer.traced_pids
+    assert handler.sys_trace(False, 123456789) is False
+
+
+def test_trace_reads_limited_to_own_calls(handler, tracer):
+    alice = Process("a", idle(), uid="alice")
+    bob = Process("b", idle(), uid="bob")
+    handler.scheduler.add(alice)
+    handler.scheduler.add(bob)
+    tracer.configure(enabled=True, trace_all=True)
+
+    with patch.object(handler, "sys_read", return_value="secret"):
+        for proc in (alice, bob):
+            handler.scheduler.current_process = proc
+            handler.dispatch("sys_read", [f"/home/{proc.uid}/notes"])
+
+    handler.scheduler.current_process = bob
+    assert [r["pid"] for r in handler.sys_trace_log()] == [bob.pid]
+    assert handler.sys_trace_log(pid=alice.pid) == []
+    assert [r["calls"] for r in handler.sys_trace_stats()] == [1]
+    assert handler.sys_trace_stats(pid=alice.pid) == []
+    assert handler.sys_trace_stats(uid="alice") == []
+
+    handler.scheduler.current_process = None
+    assert len(handler.sys_trace_log()) == 2
+    assert [r["calls"] for r in handler.sys_trace_stats()] == [2]
+
+
+def test_passwords_are_redacted(handler, tracer):
+    tracer.configure(enabled=True, trace_all=True)
+    with patch.object(handler, "sys_login", return_value=True), \
+         patch.object(handler, "sys_docker_login", return_value=True):
+        handler.dispatch("sys_login", ["alice", "hunter2"])
+        handler.dispatch("sys_docker_login", ["alice"], {"password": "hunter2"})
+
+    log = handler.sys_trace_log()
+    assert [r["args"] for r in log] == ["'alice', <redacted>", "'alice', password=<redacted>"]
+    assert all("hunter2" not in r["args"] for r in log)
+
+
+def test_attach_only_counts_that_pid(handler, tracer):
+    alice = Process("a", idle(), uid="alice")
+    bob = Process("b", idle(), uid="bob")
+    handler.scheduler.add(alice)
+    handler.scheduler.add(bob)
+    handler.scheduler.current_process = alice
+    assert handler.sys_trace(True, alice.pid)
+    assert not tracer.enabled
+
+    with patch.object(handler, "sys_read", return_value="x"):
+        for proc in (alice, bob):
+            handler.scheduler.current_process = proc
+            handler.dispatch("sys_read", ["/f"])
+
+    handler.scheduler.current_process = None
+    assert [r["pid"] for r in handler.sys_trace_log()] == [alice.pid]
+    assert [r["calls"] for r in handler.sys_trace_stats()] == [1]
+
+    handler.sys_trace(False, alice.pid)
+    assert not tracer.active
@@ -40,3 +40,35 @@ def test_run_process_allowed_app(sandbox):
     # For 'browser', it should try to run (import error expected in mock env, but not permission denied)
     result = sandbox.execute("run_process", ["browser"])
     assert "Permission Denied" not in result
+
+def test_resolve_many_reports_per_path_errors(sandbox, tmp_path):
+    sandbox.root_path = str(tmp_path)
+    results = sandbox.resolve_many(["notes.txt", "../../etc/passwd"])
+    assert results[0] == str(tmp_path.resolve() / "notes.txt")
+    assert isinstance(results[1], PermissionError)
+
+def test_resolve_many_uses_single_core_call(sandbox):
+    sandbox.core = MagicMock()
+    sandbox.core.resolve_many.return_value = [(True, "/sbx/a"), (False, "escapes")]
+    results = sandbox.resolve_many(["a", "../b"])
+    sandbox.core.resolve_many.assert_called_once_with(["a", "../b"])
+    assert results[0] == "/sbx/a"
+    assert isinstance(results[1], PermissionError)
+
+def test_batch_is_approved_once(sandbox):
+    sandbox.confirmation = MagicMock()
+    sandbox.confirmation.request_approval.return_value = True
+    sandbox.confirmation.assess_batch_risk.return_value = "LOW"
+    sandbox._resolve = lambda p: "/sbx/" + p
+    sandbox.sys.sys_read.side_effect = lambda p, resolve=True: f"data:{p}"
+
+    results = sandbox.execute("batch", [{"name": "read_file", "args": ["a"]}, ["read_file", "b"]])
+
+    sandbox.confirmation.request_approval.assert_called_once()
+    assert results == [{"action": "read_file", "result": "data:/sbx/a"},
+                       {"action": "read_file", "result": "data:/sbx/b"}]
+
+def test_batch_rejects_unknown_actions(sandbox):
+    sandbox.confirmation = MagicMock()
+    assert "disallowed" in sandbox.execute("batch", [["format_disk"]])
+    sandbox.confirmation.request_approval.assert_not_called()